@@ -0,0 +1,7 @@
+"""
+INSPIRAFIRMA AETHERIUM GENESIS
+แพ็กเกจหลักของระบบ: core (R.A.M., Job Queue, Registry), governance (GEP), agents, protocols, interface (Gateway)
+การ Import แพ็กเกจนี้เบาเสมอ: Gateway ถูกสร้างผ่าน interface.api_gateway.create_app() เมื่อต้องการเท่านั้น
+"""
+
+__version__ = "1.1.0-AGENTS"
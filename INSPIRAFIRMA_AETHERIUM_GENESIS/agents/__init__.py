@@ -0,0 +1 @@
+"""Agents: Taxonomy และ Agent เฉพาะทาง (เช่น Pangenes RSI)"""
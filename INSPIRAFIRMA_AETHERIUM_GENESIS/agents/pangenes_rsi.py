@@ -1,35 +1,46 @@
-import json
+import asyncio
+import os
 import time
 import logging
-from typing import Dict, Any
-from agents.taxonomy import BaseAgent
+from typing import Dict, Any, Optional
+from .taxonomy import BaseAgent
+from ..core.insight_sink import InsightSink, get_insight_sink
+from ..core.insight_index import InsightIndex
 
-# ตั้งค่า Logging ตามมาตรฐานสากล
-logging.basicConfig(level=logging.INFO)
+# Logger ของ Agent (การตั้งค่า Handler/Format เป็นหน้าที่ของ Entry Point เช่น Gateway หรือ genesis_node)
 logger = logging.getLogger("PangenesAgent")
 
+# ผูกกับตำแหน่งของ Package (ไม่ขึ้นกับ cwd ของ Process ที่รัน)
+DEFAULT_KNOWLEDGE_BASE_PATH = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "core", "system_insights.jsonl"))
+
 class PangenesAgent(BaseAgent):
     """
     PangenesAgent: Responsible for Recursive Self-Improvement (RSI) logic.
     Analyzes system errors and records insights for autonomous optimization.
     """
-    def __init__(self):
+    def __init__(self, insight_sink: Optional[InsightSink] = None, knowledge_base_path: Optional[str] = None):
         # ปรับการเรียก super() ให้ตรงกับโครงสร้าง BaseAgent
         super().__init__("Pangenes", "Architect")
-        self.knowledge_base_path = "core/system_insights.jsonl"
+        self.knowledge_base_path = knowledge_base_path or DEFAULT_KNOWLEDGE_BASE_PATH
         self.optimization_level = 1.0 
+        # เขียน Insight ผ่าน Sink แบบ Batched (Background Thread) แทนการเปิดไฟล์ทุกครั้ง
+        self.insight_sink = insight_sink or get_insight_sink(self.knowledge_base_path)
+        # อ่านย้อนหลังผ่าน Sidecar Offset Index (ทำดัชนีเพิ่มเฉพาะส่วนที่ Log งอกขึ้น)
+        self.insight_index = InsightIndex(self.insight_sink.path)
 
     def trigger_self_correction(self, error_report: Dict[str, Any]):
         """
         Processes system error reports and generates optimization insights.
         """
-        logger.info(f"Processing error report: {error_report.get('error_type')}")
+        logger.info("Processing error report: %s", error_report.get('error_type'))
         
         # 1. Error Analysis and Insight Generation
         insight_data = {
             "timestamp": time.time(),
             "agent_id": self.identity.id, # อ้างอิงจาก ZoIdentity
             "source": error_report.get("source"),
+            "task_name": error_report.get("task_name"),
             "resolution_hint": f"Optimization logic for {error_report.get('task_name')}",
             "improvement_increment": 0.01 
         }
@@ -39,18 +50,27 @@ class PangenesAgent(BaseAgent):
         
     def _store_insight(self, data: Dict[str, Any]):
         """
-        Appends analysis results to the system knowledge base (JSONL format).
+        Queues analysis results for the system knowledge base (JSONL format).
+        The insight sink batches, rotates and flushes them off the caller's path.
+        """
+        if not self.insight_sink.submit(data):
+            logger.warning("Insight sink saturated: optimization insight dropped.")
+
+    def recent_error_counts(self, window: float = 3600.0, source: Optional[str] = None) -> Dict[str, int]:
+        """
+        Aggregates recorded insights per task over the last `window` seconds.
         """
-        try:
-            with open(self.knowledge_base_path, "a", encoding="utf-8") as f:
-                f.write(json.dumps(data) + "\n")
-            logger.info("Successfully recorded optimization insight.")
-        except IOError as e:
-            logger.error(f"File system error: Failed to record insight. Details: {e}")
+        since = time.time() - window
+        return dict(self.insight_index.count_by("task_name", source=source, since=since))
 
-    def run_cycle(self):
+    async def run_cycle(self):
         """
         Main operational loop for proactive system health scanning.
+        The insight index refresh reads the JSONL log, so it runs in a worker thread, not on the event loop.
         """
         logger.info("Scanning system components for potential optimizations...")
+        counts = await asyncio.to_thread(self.recent_error_counts)
+        hotspots = sorted(counts.items(), key=lambda item: item[1], reverse=True)[:5]
+        for task_name, count in hotspots:
+            logger.info(f"Recurring errors in {task_name}: {count} in the last hour")
         # Future Logic: Implement automated health checks here.
\ No newline at end of file
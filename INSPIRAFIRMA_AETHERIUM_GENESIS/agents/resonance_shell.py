@@ -1,2 +1,171 @@
 # AETHERIUM GENESIS MODULE: resonance_shell.py
-# Status: Awaiting Inspira Injection
+# ResonanceShell: ActuatorAgent ผู้ลงมือทำงานสื่อ (เช่น Video / Audio Composer)
+# รับ MediaIntent + Stream ของ Chunk แล้วคืน Stream ผลลัพธ์ผ่าน MediaPipeline (หน่วยความจำคงที่)
+
+import logging
+import math
+import zlib
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Dict, List, Optional, Union
+
+import numpy as np
+
+from .taxonomy import BaseAgent
+from ..data_structures.media_intent import (
+    DEFAULT_CHUNK_SIZE, DEFAULT_QUEUE_SIZE, MediaIntent, MediaPipeline, MediaStage, aiter_chunks, rechunk,
+)
+
+logger = logging.getLogger("ActuatorAgent")
+
+# --- Operations (Stage Factory: พารามิเตอร์ของ Operation -> MediaStage) ---
+# Factory ตรวจและแปลงพารามิเตอร์ทันที (ValueError) เพื่อให้ build_stages ปฏิเสธก่อนตอบ 200 และเริ่ม Stream
+def _int_param(name: str, value: Any, low: int, high: Optional[int] = None) -> int:
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError(f"{name} must be an integer, got {value!r}")
+    if value < low or (high is not None and value > high):
+        bounds = f"between {low} and {high}" if high is not None else f">= {low}"
+        raise ValueError(f"{name} must be {bounds}, got {value}")
+    return value
+
+def _float_param(name: str, value: Any) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise ValueError(f"{name} must be a finite number, got {value!r}")
+    return float(value)
+
+def _rechunk_stage(size: int) -> MediaStage:
+    size = _int_param("rechunk.size", size, 1)
+
+    async def rechunk_stage(stream):
+        async for chunk in rechunk(stream, size):
+            yield chunk
+    return rechunk_stage
+
+def _gain_stage(factor: float) -> MediaStage:
+    """ปรับความดังของเสียง PCM 16-bit (little-endian) ด้วย NumPy ทีละ Chunk (ตัดค่าที่ล้นช่วง int16)"""
+    factor = _float_param("gain.factor", factor)
+
+    async def gain(stream):
+        carry = b""  # ไบต์ที่เหลือเมื่อ Chunk ตัดกลาง Sample
+        async for chunk in stream:
+            data = carry + bytes(chunk) if carry else chunk
+            usable = len(data) - len(data) % 2
+            carry = bytes(data[usable:])
+            if not usable:
+                continue
+            samples = np.frombuffer(data, dtype="<i2", count=usable // 2).astype(np.float32)
+            samples *= factor
+            np.clip(samples, -32768, 32767, out=samples)
+            yield samples.astype("<i2").tobytes()
+        if carry:
+            yield carry
+    return gain
+
+def _compress_stage(level: int = 6) -> MediaStage:
+    level = _int_param("compress.level", level, -1, 9)
+
+    async def compress(stream):
+        compressor = zlib.compressobj(level)
+        async for chunk in stream:
+            output = compressor.compress(chunk)
+            if output:
+                yield output
+        yield compressor.flush()
+    return compress
+
+def _decompress_stage(max_chunk: int = DEFAULT_CHUNK_SIZE) -> MediaStage:
+    """คลายการบีบอัดโดยจำกัดขนาดผลลัพธ์ต่อ Chunk (กัน Decompression Bomb ใช้หน่วยความจำเกิน)"""
+    max_chunk = _int_param("decompress.max_chunk", max_chunk, 1)  # 0 ใน zlib = ไม่จำกัด
+
+    async def decompress(stream):
+        decompressor = zlib.decompressobj()
+        async for chunk in stream:
+            data = chunk
+            while data:
+                output = decompressor.decompress(data, max_chunk)
+                if output:
+                    yield output
+                data = decompressor.unconsumed_tail
+        tail = decompressor.flush()
+        if tail:
+            yield tail
+    return decompress
+
+OPERATIONS: Dict[str, Callable[..., MediaStage]] = {
+    "rechunk": _rechunk_stage,
+    "gain": _gain_stage,
+    "compress": _compress_stage,
+    "decompress": _decompress_stage,
+}
+
+# --- II-15: ActuatorAgent (The Doer) ---
+class ActuatorAgent(BaseAgent):
+    """
+    ResonanceShell: ผู้ลงมือทำ (เช่น Video Composer)
+    ทำงานกับสื่อแบบ Streaming: อ่าน / แปลง / ส่งต่อทีละ Chunk ผ่านคิวขนาดจำกัด
+    ผู้บริโภคที่ช้า (เช่น Client ของ StreamingResponse) จะชะลอทั้งสายย้อนกลับไปถึงแหล่งข้อมูล
+    """
+    def __init__(self, specialty: str, queue_size: int = DEFAULT_QUEUE_SIZE):
+        super().__init__(f"Actuator-{specialty}", "Maker")
+        self.specialty = specialty
+        self.queue_size = queue_size
+        self.jobs_started = 0
+        self.jobs_completed = 0
+        self.bytes_out = 0
+        self.last_pipeline: Optional[List[Dict[str, Any]]] = None
+
+    @staticmethod
+    def build_stages(operations: List[Dict[str, Any]]) -> List[MediaStage]:
+        """แปลง operations ของ MediaIntent เป็น Stage (ตรวจชื่อ / พารามิเตอร์ก่อนเริ่ม Stream)"""
+        if not isinstance(operations, list):
+            raise ValueError("Media operations must be a list of {\"op\": ...} objects")
+        stages = []
+        for operation in operations:
+            if not isinstance(operation, dict):
+                raise ValueError(f"Invalid media operation: {operation!r}")
+            params = dict(operation)
+            name = params.pop("op", None)
+            factory = OPERATIONS.get(name)
+            if factory is None:
+                raise ValueError(f"Unknown media operation: {name!r} (available: {sorted(OPERATIONS)})")
+            try:
+                stages.append(factory(**params))
+            except TypeError as e:
+                raise ValueError(f"Invalid parameters for media operation {name!r}: {e}") from None
+        return stages
+
+    def execute_task(self, media_intent: Union[MediaIntent, Dict[str, Any]],
+                     source: Optional[AsyncIterable[bytes]] = None) -> AsyncIterator[bytes]:
+        """
+        เริ่มงานสื่อและคืน Async Iterator ของผลลัพธ์ (ยังไม่มีการประมวลผลจนกว่าจะเริ่มอ่าน)
+        source: Stream ของ Chunk ขาเข้า; ถ้าไม่ระบุ ใช้ bytes จาก media_intent.metadata["data"]
+        """
+        if not isinstance(media_intent, MediaIntent):
+            media_intent = MediaIntent.from_dict(media_intent)
+        if source is None:
+            source = aiter_chunks(media_intent.metadata.get("data", b""), media_intent.chunk_size)
+        pipeline = MediaPipeline(self.build_stages(media_intent.operations), self.queue_size)
+        logger.info("[%s] Materializing intent %s (%s)", self.identity.name, media_intent.intent_id,
+                    " -> ".join(op.get("op", "?") for op in media_intent.operations) or "passthrough")
+        return self._track(pipeline, pipeline.run(source))
+
+    async def _track(self, pipeline: MediaPipeline, stream: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        self.jobs_started += 1
+        try:
+            async for chunk in stream:
+                self.bytes_out += len(chunk)
+                yield chunk
+            self.jobs_completed += 1
+        finally:
+            self.last_pipeline = pipeline.describe()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "agent_id": self.identity.id,
+            "name": self.identity.name,
+            "jobs_started": self.jobs_started,
+            "jobs_completed": self.jobs_completed,
+            "bytes_out": self.bytes_out,
+            "last_pipeline": self.last_pipeline,
+        }
+
+    def run_cycle(self):
+        pass
@@ -1,2 +1,189 @@
 # AETHERIUM GENESIS MODULE: sensorium_eye.py
-# Status: Awaiting Inspira Injection
+# Sensorium Eye: SensorAgent ผู้รับรู้สัญญาณเชิงตัวเลขความถี่สูง (เช่น IMU / เสียง / Telemetry)
+# รับ Frame เป็น Batch หรือ Stream เข้าสู่ Ring Buffer ที่จองไว้ล่วงหน้า
+# แล้วคำนวณ Feature ราย Window (Mean / Variance / FFT Band Energy) แบบ Vectorized ทีละหลาย Window
+
+import logging
+from typing import Any, AsyncIterable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .taxonomy import BaseAgent
+
+logger = logging.getLogger("SensorAgent")
+
+class RingBuffer:
+    """
+    Ring Buffer ขนาดคงที่ของ Frame (capacity, channels) ที่จองหน่วยความจำครั้งเดียว
+    เขียนทั้ง Batch ด้วยการคัดลอกแบบ Slice (ไม่เกิน 2 ครั้งต่อ Batch) ไม่มี Loop ต่อ Sample
+    ตำแหน่งของข้อมูลอ้างอิงด้วย Index สะสม (written) เพื่อให้ผู้อ่านรู้ว่าข้อมูลใดถูกเขียนทับไปแล้ว
+    """
+    def __init__(self, capacity: int, channels: int = 1, dtype: Any = np.float32):
+        self.capacity = capacity
+        self.channels = channels
+        self.data = np.zeros((capacity, channels), dtype=dtype)
+        self.written = 0  # จำนวน Frame ทั้งหมดที่เคยเขียน
+
+    def __len__(self) -> int:
+        return min(self.written, self.capacity)
+
+    def extend(self, frames: np.ndarray):
+        """เพิ่ม Frame (n, channels); ถ้า n > capacity จะเก็บเฉพาะ capacity Frame ล่าสุด"""
+        count = len(frames)
+        if count > self.capacity:
+            frames = frames[-self.capacity:]
+            self.written += count - self.capacity
+            count = self.capacity
+        start = self.written % self.capacity
+        first = min(count, self.capacity - start)
+        self.data[start:start + first] = frames[:first]
+        if first < count:
+            self.data[:count - first] = frames[first:]
+        self.written += count
+
+    def span(self, begin: int, end: int) -> np.ndarray:
+        """
+        Frame ช่วง [begin, end) ตาม Index สะสม: คืน View เมื่อช่วงไม่ข้ามรอยต่อของ Ring มิฉะนั้นคัดลอก
+        """
+        if begin < self.written - self.capacity or end > self.written or begin > end:
+            raise IndexError(f"Frames [{begin}, {end}) are not in the buffer "
+                             f"(available [{max(0, self.written - self.capacity)}, {self.written}))")
+        start, stop = begin % self.capacity, begin % self.capacity + (end - begin)
+        if stop <= self.capacity:
+            return self.data[start:stop]
+        return np.concatenate((self.data[start:], self.data[:stop - self.capacity]))
+
+    def latest(self, count: int) -> np.ndarray:
+        count = min(count, len(self))
+        return self.span(self.written - count, self.written)
+
+class WindowFeatures:
+    """
+    ตัวคำนวณ Feature ของหลาย Window พร้อมกัน: input (k, channels, window) -> output (k, channels, 2 + bands)
+    [mean, variance, energy ของแต่ละ Band]; Hann Window และ Matrix ของ Band คำนวณไว้ครั้งเดียว
+    """
+    def __init__(self, window: int, sample_rate: float, bands: Sequence[Tuple[float, float]]):
+        self.window = window
+        self.sample_rate = sample_rate
+        self.bands = [tuple(band) for band in bands]
+        self.taper = np.hanning(window).astype(np.float32)
+        frequencies = np.fft.rfftfreq(window, d=1.0 / sample_rate)
+        # (bins, bands): 1 เมื่อ bin อยู่ในช่วง [low, high) ของ Band -> Energy ต่อ Band = power @ matrix
+        self.band_matrix = np.stack(
+            [(frequencies >= low) & (frequencies < high) for low, high in self.bands], axis=1
+        ).astype(np.float32) if self.bands else np.zeros((len(frequencies), 0), dtype=np.float32)
+        self.names = ["mean", "variance"] + [f"band_{low:g}_{high:g}hz" for low, high in self.bands]
+
+    def compute(self, windows: np.ndarray) -> np.ndarray:
+        mean = windows.mean(axis=-1)
+        variance = windows.var(axis=-1)
+        spectrum = np.fft.rfft((windows - mean[..., None]) * self.taper, axis=-1)
+        power = (spectrum.real ** 2 + spectrum.imag ** 2) / self.window
+        energy = power @ self.band_matrix
+        return np.concatenate((mean[..., None], variance[..., None], energy), axis=-1).astype(np.float32)
+
+# --- II-16: SensorAgent (The Perceiver) ---
+class SensorAgent(BaseAgent):
+    """
+    SilentVessel: ผู้รับรู้เชิง Qualia (Input Analysis)
+    - ingest(): รับ Frame เป็น Batch (n,) หรือ (n, channels) เข้าสู่ Ring Buffer
+    - ทุก hop Frame จะได้ Feature ของ Window ล่าสุดขนาด window (คำนวณรวดเดียวทุก Window ที่ครบใน Batch)
+    - Feature เก็บใน Ring Buffer ของตัวเอง (history Window ล่าสุด) และอ่านได้ผ่าน latest_features()
+    """
+    def __init__(self, sensor_type: str, channels: int = 1, sample_rate: float = 1000.0,
+                 window: int = 256, hop: int = 128, capacity: int = 65536, history: int = 1024,
+                 bands: Optional[Sequence[Tuple[float, float]]] = None):
+        super().__init__(f"Sensor-{sensor_type}", "Observer")
+        if not 0 < hop <= window <= capacity:
+            raise ValueError("SensorAgent requires 0 < hop <= window <= capacity")
+        self.sensor_type = sensor_type
+        self.channels = channels
+        self.sample_rate = sample_rate
+        self.window = window
+        self.hop = hop
+        if bands is None:
+            nyquist = sample_rate / 2
+            bands = [(0.0, nyquist / 8), (nyquist / 8, nyquist / 2), (nyquist / 2, nyquist + 1e-9)]
+        self.extractor = WindowFeatures(window, sample_rate, bands)
+        self.frames = RingBuffer(capacity, channels)
+        self.features = RingBuffer(history, channels * len(self.extractor.names))
+        self.feature_names = self.extractor.names
+        self._next_window_end = window  # Index สะสมของ Frame ที่ Window ถัดไปจะจบ
+        self.batches = 0
+
+    def _as_frames(self, raw_data: Any) -> np.ndarray:
+        frames = np.asarray(raw_data, dtype=np.float32)
+        if frames.ndim == 1:
+            frames = frames.reshape(-1, 1) if self.channels == 1 else frames.reshape(1, -1)
+        if frames.ndim != 2 or frames.shape[1] != self.channels:
+            raise ValueError(f"Expected frames shaped (n, {self.channels}), got {np.shape(raw_data)}")
+        return frames
+
+    def ingest(self, raw_data: Any) -> int:
+        """รับ Frame 1 Batch; คืนจำนวน Window ใหม่ที่คำนวณ Feature แล้ว"""
+        frames = self._as_frames(raw_data)
+        self.batches += 1
+        produced = 0
+        # แบ่ง Batch ใหญ่ให้ไม่เกินพื้นที่ว่างของ Ring (Window ที่ยังไม่ได้คำนวณต้องไม่ถูกเขียนทับ)
+        step = self.frames.capacity - self.window + 1
+        for offset in range(0, len(frames), step):
+            self.frames.extend(frames[offset:offset + step])
+            produced += self._extract()
+        return produced
+
+    def _extract(self) -> int:
+        written = self.frames.written
+        oldest_end = written - self.frames.capacity + self.window
+        if self._next_window_end < oldest_end:  # ข้าม Window ที่ถูกเขียนทับไปแล้ว (Batch เดียวใหญ่กว่า Ring)
+            skipped = -(-(oldest_end - self._next_window_end) // self.hop)
+            self._next_window_end += skipped * self.hop
+        if self._next_window_end > written:
+            return 0
+        count = (written - self._next_window_end) // self.hop + 1
+        last_end = self._next_window_end + (count - 1) * self.hop
+        span = self.frames.span(self._next_window_end - self.window, last_end)
+        # (k, channels, window): View แบบ Stride ไม่คัดลอก แล้วคำนวณทุก Window ด้วย NumPy ครั้งเดียว
+        windows = sliding_window_view(span, self.window, axis=0)[::self.hop]
+        features = self.extractor.compute(windows)
+        self.features.extend(features.reshape(count, -1))
+        self._next_window_end = last_end + self.hop
+        return count
+
+    async def ingest_stream(self, stream: AsyncIterable[Any]) -> int:
+        """รับ Batch ต่อเนื่องจาก Async Iterator (เช่น Socket / Queue ของ Sensor) จนกว่า Stream จะจบ"""
+        produced = 0
+        async for batch in stream:
+            produced += self.ingest(batch)
+        return produced
+
+    def latest_features(self, count: int = 1) -> np.ndarray:
+        """Feature ของ count Window ล่าสุด: (count, channels, len(feature_names))"""
+        rows = self.features.latest(count)
+        return rows.reshape(len(rows), self.channels, len(self.feature_names))
+
+    def perceive(self, raw_data: Any) -> Dict[str, Any]:
+        """รับ Batch แล้วสรุป Qualia จาก Window ล่าสุด (ต่อ Channel)"""
+        produced = self.ingest(raw_data)
+        qualia: Optional[List[Dict[str, float]]] = None
+        if len(self.features):
+            latest = self.latest_features(1)[0]
+            qualia = [dict(zip(self.feature_names, map(float, channel))) for channel in latest]
+        return {"qualia": qualia, "windows": produced, "frames": self.frames.written}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "agent_id": self.identity.id,
+            "name": self.identity.name,
+            "channels": self.channels,
+            "sample_rate": self.sample_rate,
+            "window": self.window,
+            "hop": self.hop,
+            "batches": self.batches,
+            "frames": self.frames.written,
+            "windows": self.features.written,
+            "features": self.feature_names,
+        }
+
+    def run_cycle(self):
+        pass
@@ -1,2 +1,73 @@
 # AETHERIUM GENESIS MODULE: validator_sage.py
-# Status: Awaiting Inspira Injection
+# Validator Sage: ValidatorAgent ผู้ตรวจสอบความถูกต้องของคำสั่ง (Audit Gate / Inspira Check)
+# ตรวจโครงสร้างของ intent_data ก่อนถึงขั้นลงมือทำ (Governance ตรวจ "เจตนา", Validator ตรวจ "รูปแบบ")
+
+import json
+import logging
+import unicodedata
+from typing import Any, Dict, Optional, Tuple
+
+from .taxonomy import BaseAgent
+
+logger = logging.getLogger("ValidatorAgent")
+
+MAX_INTENT_LENGTH = 4096
+MAX_PAYLOAD_BYTES = 1024 * 1024
+
+# --- II-14: ValidatorAgent (The Guardian) ---
+class ValidatorAgent(BaseAgent):
+    """
+    PulseCradle: ผู้ตรวจสอบความถูกต้อง (Audit Gate / Inspira Check)
+    perform_audit() เป็น Pure Function ของ intent_data (ไม่มี I/O) จึงเรียกพร้อมกันจากหลาย Worker ได้
+    """
+    def __init__(self, max_intent_length: int = MAX_INTENT_LENGTH, max_payload_bytes: int = MAX_PAYLOAD_BYTES):
+        super().__init__("Validator", "Guardian")
+        self.max_intent_length = max_intent_length
+        self.max_payload_bytes = max_payload_bytes
+        self.audited = 0
+        self.rejected = 0
+
+    def audit(self, intent_data: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
+        """ตรวจ intent_data ({"intent": str, "payload": dict}) คืน (ผ่าน, เหตุผลเมื่อไม่ผ่าน)"""
+        self.audited += 1
+        reason = self._check(intent_data)
+        if reason is not None:
+            self.rejected += 1
+            logger.warning("🔍 [%s] Audit rejected: %s", self.identity.name, reason)
+        return reason is None, reason
+
+    def perform_audit(self, intent_data: Dict) -> bool:
+        # ตรวจสอบกับ Patimokkha Code
+        return self.audit(intent_data)[0]
+
+    def _check(self, intent_data: Dict[str, Any]) -> Optional[str]:
+        intent = intent_data.get("intent")
+        if not isinstance(intent, str) or not intent.strip():
+            return "Intent must be a non-empty string"
+        if len(intent) > self.max_intent_length:
+            return f"Intent exceeds {self.max_intent_length} characters"
+        if any(unicodedata.category(char) == "Cc" and char not in "\t\n\r" for char in intent):
+            return "Intent contains control characters"
+        payload = intent_data.get("payload")
+        if payload is None:
+            return None
+        if not isinstance(payload, dict):
+            return "Payload must be an object"
+        try:
+            size = len(json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+        except (TypeError, ValueError) as e:
+            return f"Payload is not serializable: {e}"
+        if size > self.max_payload_bytes:
+            return f"Payload exceeds {self.max_payload_bytes} bytes"
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "agent_id": self.identity.id,
+            "name": self.identity.name,
+            "audited": self.audited,
+            "rejected": self.rejected,
+        }
+
+    def run_cycle(self):
+        pass
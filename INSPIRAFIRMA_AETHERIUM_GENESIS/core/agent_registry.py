@@ -0,0 +1,172 @@
+import time
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+class AgentRecord:
+    """ข้อมูล Agent แบบกะทัดรัด (__slots__) แทน dict ต่อ Agent"""
+    __slots__ = ("id", "name", "role", "key", "capabilities", "status", "registered_at", "seq")
+
+    def __init__(self, id: str, name: str, role: str, key: str, capabilities: Iterable[str],
+                 status: str = "IDLE", registered_at: Optional[float] = None, seq: int = 0):
+        self.id = id
+        self.name = name
+        self.role = role
+        self.key = key
+        self.capabilities = tuple(capabilities)
+        self.status = status
+        self.registered_at = time.time() if registered_at is None else registered_at
+        self.seq = seq
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "role": self.role,
+            "key": self.key,
+            "capabilities": list(self.capabilities),
+            "status": self.status,
+            "registered_at": self.registered_at,
+        }
+
+class _SeqIndex:
+    """Secondary Index: key -> รายการ seq ที่เรียงจากน้อยไปมาก (รองรับ cursor ด้วย bisect)"""
+    __slots__ = ("_buckets",)
+
+    def __init__(self):
+        self._buckets: Dict[str, List[int]] = {}
+
+    def add(self, key: str, seq: int):
+        bucket = self._buckets.setdefault(key, [])
+        if not bucket or bucket[-1] < seq:
+            bucket.append(seq)  # กรณีปกติ: Agent ใหม่มี seq มากที่สุดเสมอ
+        else:
+            bucket.insert(bisect_left(bucket, seq), seq)
+
+    def remove(self, key: str, seq: int):
+        bucket = self._buckets.get(key)
+        if not bucket:
+            return
+        pos = bisect_left(bucket, seq)
+        if pos < len(bucket) and bucket[pos] == seq:
+            del bucket[pos]
+            if not bucket:
+                del self._buckets[key]
+
+    def get(self, key: str) -> List[int]:
+        return self._buckets.get(key, [])
+
+    def counts(self) -> Dict[str, int]:
+        return {key: len(bucket) for key, bucket in self._buckets.items()}
+
+class AgentRegistry:
+    """
+    Agent Registry พร้อม Secondary Index (role / capability / status)
+    และการแบ่งหน้าแบบ Cursor (อิงลำดับการลงทะเบียน) เพื่อไม่ต้อง Serialize ทุก Agent ต่อ Request
+    """
+    def __init__(self):
+        self._by_id: Dict[str, AgentRecord] = {}
+        self._by_seq: Dict[int, AgentRecord] = {}
+        self._seqs: List[int] = []  # seq ทั้งหมดเรียงจากน้อยไปมาก (อาจมี seq ที่ถูกลบแล้วค้างอยู่)
+        self._last_seq = 0
+        self.by_role = _SeqIndex()
+        self.by_capability = _SeqIndex()
+        self.by_status = _SeqIndex()
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __contains__(self, agent_id: str) -> bool:
+        return agent_id in self._by_id
+
+    def get(self, agent_id: str) -> Optional[AgentRecord]:
+        return self._by_id.get(agent_id)
+
+    def register(self, agent_id: str, name: str, role: str, key: str,
+                 capabilities: Iterable[str] = (), status: str = "IDLE",
+                 registered_at: Optional[float] = None, seq: Optional[int] = None) -> AgentRecord:
+        """
+        ลงทะเบียน Agent (seq=None คือกำหนดลำดับถัดไปเอง; Replica ส่ง seq ของต้นฉบับมาเพื่อให้ Cursor ตรงกันทุก Process)
+        """
+        if agent_id in self._by_id:
+            self.remove(agent_id)
+        if seq is None:
+            seq = self._last_seq + 1
+        self._last_seq = max(self._last_seq, seq)
+        record = AgentRecord(agent_id, name, role, key, capabilities, status, registered_at, seq)
+        self._by_id[agent_id] = record
+        self._by_seq[record.seq] = record
+        if not self._seqs or self._seqs[-1] < seq:
+            self._seqs.append(seq)
+        else:
+            insort(self._seqs, seq)
+        self.by_role.add(record.role, record.seq)
+        self.by_status.add(record.status, record.seq)
+        for capability in set(record.capabilities):
+            self.by_capability.add(capability, record.seq)
+        return record
+
+    def update_status(self, agent_id: str, status: str) -> Optional[AgentRecord]:
+        record = self._by_id.get(agent_id)
+        if record is None or record.status == status:
+            return record
+        self.by_status.remove(record.status, record.seq)
+        record.status = status
+        self.by_status.add(status, record.seq)
+        return record
+
+    def remove(self, agent_id: str) -> Optional[AgentRecord]:
+        record = self._by_id.pop(agent_id, None)
+        if record is None:
+            return None
+        del self._by_seq[record.seq]
+        self.by_role.remove(record.role, record.seq)
+        self.by_status.remove(record.status, record.seq)
+        for capability in set(record.capabilities):
+            self.by_capability.remove(capability, record.seq)
+        # เก็บกวาด seq ที่ถูกลบเมื่อมีค้างเกินครึ่ง
+        if len(self._seqs) > 2 * len(self._by_seq) + 64:
+            self._seqs = [seq for seq in self._seqs if seq in self._by_seq]
+        return record
+
+    def query(self, role: Optional[str] = None, capability: Optional[str] = None,
+              status: Optional[str] = None, cursor: Optional[str] = None,
+              limit: int = 100) -> Tuple[List[AgentRecord], Optional[str]]:
+        """
+        คืน Agent ตามเงื่อนไข (ตามลำดับการลงทะเบียน) สูงสุด limit รายการ พร้อม next_cursor
+        (next_cursor เป็น None เมื่อไม่มีหน้าถัดไป)
+        """
+        after = int(cursor) if cursor else 0
+
+        # เลือก Index ที่เล็กที่สุดเป็นตัวขับ แล้วกรองเงื่อนไขที่เหลือทีละ Record
+        candidates = [self._seqs]
+        if role is not None:
+            candidates.append(self.by_role.get(role))
+        if capability is not None:
+            candidates.append(self.by_capability.get(capability))
+        if status is not None:
+            candidates.append(self.by_status.get(status))
+        driver = min(candidates, key=len)
+
+        page: List[AgentRecord] = []
+        by_seq = self._by_seq
+        for pos in range(bisect_right(driver, after), len(driver)):
+            record = by_seq.get(driver[pos])
+            if record is None:
+                continue
+            if role is not None and record.role != role:
+                continue
+            if status is not None and record.status != status:
+                continue
+            if capability is not None and capability not in record.capabilities:
+                continue
+            if len(page) == limit:
+                return page, str(page[-1].seq)
+            page.append(record)
+        return page, None
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": len(self),
+            "by_role": self.by_role.counts(),
+            "by_status": self.by_status.counts(),
+        }
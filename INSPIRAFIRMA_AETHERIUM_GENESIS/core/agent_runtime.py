@@ -0,0 +1,244 @@
+import asyncio
+import inspect
+import logging
+import math
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger("GENESIS_RUNTIME")
+
+class AgentSlot:
+    """สถานะการจัดตารางของ Agent 1 ตัวบน Timer Wheel พร้อมสถิติ Latency ของแต่ละ Cycle"""
+    __slots__ = ("agent", "agent_id", "interval", "due", "tick", "running", "active",
+                 "cycles", "errors", "overruns", "total_time", "max_time", "last_time", "samples")
+
+    def __init__(self, agent: Any, interval: float, due: float, sample_size: int):
+        self.agent = agent
+        self.agent_id = agent.identity.id
+        self.interval = interval
+        self.due = due
+        self.tick = 0
+        self.running = False
+        self.active = True
+        self.cycles = 0
+        self.errors = 0
+        self.overruns = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.last_time = 0.0
+        self.samples: deque = deque(maxlen=sample_size)
+
+    def record(self, elapsed: float):
+        self.cycles += 1
+        self.total_time += elapsed
+        self.last_time = elapsed
+        if elapsed > self.max_time:
+            self.max_time = elapsed
+        self.samples.append(elapsed)
+
+    def stats(self) -> Dict[str, Any]:
+        ordered = sorted(self.samples)
+
+        def percentile(q: float) -> float:
+            if not ordered:
+                return 0.0
+            return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+        return {
+            "agent_id": self.agent_id,
+            "name": self.agent.identity.name,
+            "interval": self.interval,
+            "cycles": self.cycles,
+            "errors": self.errors,
+            "overruns": self.overruns,
+            "mean_ms": (self.total_time / self.cycles * 1e3) if self.cycles else 0.0,
+            "p50_ms": percentile(0.50) * 1e3,
+            "p95_ms": percentile(0.95) * 1e3,
+            "p99_ms": percentile(0.99) * 1e3,
+            "max_ms": self.max_time * 1e3,
+            "last_ms": self.last_time * 1e3,
+        }
+
+class AgentRuntime:
+    """
+    Agent Runtime: ขับเคลื่อน BaseAgent.run_cycle ของ Agent นับพันตัวบน Event Loop เดียว
+    - ใช้ Hashed Timer Wheel (Task เดียวเดินทีละ tick) แทนการสร้าง Task ที่ sleep ต่อ Agent
+    - run_cycle แบบ sync รันทันทีใน Driver (สลับให้ Event Loop ทุก yield_every cycle)
+      ส่วนแบบ async ถูกแยกเป็น Task จำกัดจำนวนพร้อมกันด้วย max_concurrent_cycles
+    - ตรวจจับ Overrun: Cycle ที่ใช้เวลาเกิน interval หรือเริ่มช้ากว่ากำหนดเกิน interval
+    """
+    def __init__(self, tick: float = 0.01, wheel_size: int = 512,
+                 max_concurrent_cycles: int = 100, yield_every: int = 64, sample_size: int = 128):
+        self.tick = tick
+        self.wheel_size = wheel_size
+        self.yield_every = yield_every
+        self.sample_size = sample_size
+        self.slots: Dict[str, AgentSlot] = {}
+        self._wheel: List[List[AgentSlot]] = [[] for _ in range(wheel_size)]
+        self._current_tick = 0
+        self._origin = 0.0
+        self._semaphore = asyncio.Semaphore(max_concurrent_cycles)
+        self._driver: Optional[asyncio.Task] = None
+        self._inflight: set = set()
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    # --- Registration ---
+    def add(self, agent: Any, interval: float, start_delay: Optional[float] = None) -> AgentSlot:
+        """เพิ่ม Agent เข้าตาราง (start_delay=None จะกระจายรอบแรกตาม hash ของ id เพื่อลด Burst)"""
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        agent_id = agent.identity.id
+        if agent_id in self.slots:
+            self.remove(agent_id)
+        if start_delay is None:
+            start_delay = (hash(agent_id) % 1000) / 1000 * interval
+        slot = AgentSlot(agent, interval, self._now() + start_delay, self.sample_size)
+        self.slots[agent_id] = slot
+        self._schedule(slot)
+        return slot
+
+    def remove(self, agent_id: str) -> Optional[AgentSlot]:
+        slot = self.slots.pop(agent_id, None)
+        if slot is not None:
+            slot.active = False  # ถูกเก็บกวาดออกจาก Wheel เมื่อถึง tick ของตัวเอง
+        return slot
+
+    # --- Timer Wheel ---
+    def _now(self) -> float:
+        return time.monotonic()
+
+    def _schedule(self, slot: AgentSlot):
+        due_tick = math.ceil((slot.due - self._origin) / self.tick) if self._origin else 0
+        slot.tick = max(due_tick, self._current_tick + 1)
+        self._wheel[slot.tick % self.wheel_size].append(slot)
+
+    async def start(self):
+        if self._driver is not None:
+            return
+        self._origin = self._now()
+        self._current_tick = 0
+        # จัดตารางใหม่ทั้งหมดเทียบกับจุดเริ่มต้นของ Wheel
+        self._wheel = [[] for _ in range(self.wheel_size)]
+        for slot in self.slots.values():
+            self._schedule(slot)
+        self._driver = asyncio.create_task(self._drive())
+        logger.info(f"⏱️ Agent Runtime started: {len(self.slots)} agents, tick={self.tick * 1e3:.0f}ms")
+
+    async def stop(self):
+        if self._driver is None:
+            return
+        self._driver.cancel()
+        await asyncio.gather(self._driver, return_exceptions=True)
+        self._driver = None
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+        logger.info("⏱️ Agent Runtime stopped.")
+
+    async def _drive(self):
+        while True:
+            target_tick = int((self._now() - self._origin) / self.tick)
+            # ไล่ทุก tick ที่ถึงกำหนด (Catch-up หาก Event Loop ช้าไป)
+            while self._current_tick < target_tick:
+                self._current_tick += 1
+                await self._fire(self._current_tick)
+            next_at = self._origin + (self._current_tick + 1) * self.tick
+            await asyncio.sleep(max(0.0, next_at - self._now()))
+
+    async def _fire(self, tick: int):
+        bucket = self._wheel[tick % self.wheel_size]
+        if not bucket:
+            return
+        due, keep = [], []
+        for slot in bucket:
+            if not slot.active:
+                continue
+            (due if slot.tick <= tick else keep).append(slot)
+        self._wheel[tick % self.wheel_size] = keep
+
+        for index, slot in enumerate(due):
+            if slot.running:
+                # Cycle ก่อนหน้ายังไม่จบ: นับเป็น Overrun แล้วเลื่อนไปรอบถัดไป
+                slot.overruns += 1
+                self._reschedule(slot)
+                continue
+            result = self._run_cycle(slot)
+            if result is not None:
+                task = asyncio.create_task(self._await_cycle(slot, result))
+                self._inflight.add(task)
+                task.add_done_callback(self._inflight.discard)
+            if index % self.yield_every == self.yield_every - 1:
+                await asyncio.sleep(0)
+
+    def _run_cycle(self, slot: AgentSlot):
+        """รัน run_cycle; คืน coroutine หากเป็นแบบ async (ให้ Task แยกไปรอ) หรือ None เมื่อจบแล้ว"""
+        started = self._now()
+        if started - slot.due > slot.interval:
+            slot.overruns += 1  # เริ่มช้ากว่ากำหนดเกิน 1 interval
+        try:
+            result = slot.agent.run_cycle()
+        except Exception as e:
+            slot.errors += 1
+            logger.error("❌ [Runtime] %s cycle failed: %s", slot.agent.identity.name, e, extra={"agent_id": slot.agent_id})
+            self._finish(slot, started)
+            return None
+        if inspect.isawaitable(result):
+            slot.running = True
+            return result
+        self._finish(slot, started)
+        return None
+
+    async def _await_cycle(self, slot: AgentSlot, awaitable):
+        started = self._now()
+        try:
+            async with self._semaphore:
+                await awaitable
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            slot.errors += 1
+            logger.error("❌ [Runtime] %s cycle failed: %s", slot.agent.identity.name, e, extra={"agent_id": slot.agent_id})
+        finally:
+            slot.running = False
+            self._finish(slot, started)
+
+    def _finish(self, slot: AgentSlot, started: float):
+        elapsed = self._now() - started
+        slot.record(elapsed)
+        if elapsed > slot.interval:
+            slot.overruns += 1
+        self._reschedule(slot)
+
+    def _reschedule(self, slot: AgentSlot):
+        if not slot.active:
+            return
+        # Fixed-rate: ข้ามรอบที่พลาดไปแทนการยิงซ้ำติดกัน
+        now = self._now()
+        slot.due += slot.interval
+        if slot.due <= now:
+            slot.due += math.ceil((now - slot.due) / slot.interval) * slot.interval
+        if not slot.running:
+            self._schedule(slot)
+
+    # --- Metrics ---
+    def agent_stats(self, agent_id: str) -> Optional[Dict[str, Any]]:
+        slot = self.slots.get(agent_id)
+        return slot.stats() if slot else None
+
+    def stats(self, top: Optional[int] = None) -> Dict[str, Any]:
+        """สรุปสถิติ Runtime; top=N คืนเฉพาะ N Agent ที่ p99 สูงสุด (เหมาะกับ Fleet ขนาดใหญ่)"""
+        slots = list(self.slots.values())
+        per_agent = [slot.stats() for slot in slots]
+        if top is not None:
+            per_agent = sorted(per_agent, key=lambda item: item["p99_ms"], reverse=True)[:top]
+        return {
+            "agents": len(slots),
+            "running": self._driver is not None,
+            "tick_ms": self.tick * 1e3,
+            "inflight_cycles": len(self._inflight),
+            "total_cycles": sum(slot.cycles for slot in slots),
+            "total_overruns": sum(slot.overruns for slot in slots),
+            "per_agent": per_agent,
+        }
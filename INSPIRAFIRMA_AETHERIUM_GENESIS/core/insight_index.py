@@ -0,0 +1,175 @@
+import json
+import logging
+import os
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger("GENESIS_INSIGHT")
+
+INDEX_VERSION = 1
+
+class InsightIndex:
+    """
+    Query Layer เหนือ system_insights.jsonl ด้วย Sidecar Offset Index (<log>.idx)
+    - Sidecar เป็น append-only: 1 แถวต่อ Insight = [offset, length, timestamp, source, agent_id]
+    - refresh() อ่านเฉพาะส่วนที่ Log งอกเพิ่มขึ้น (Incremental) และสร้าง Index ใหม่ทั้งหมดเมื่อ Log ถูก Rotate
+    - query() เป็น Generator: seek ไปอ่านเฉพาะ Record ที่ตรงเงื่อนไข ไม่โหลดทั้งไฟล์
+    """
+    def __init__(self, path: str, index_path: Optional[str] = None):
+        self.path = path
+        self.index_path = index_path or path + ".idx"
+        self._reset()
+        self._load_sidecar()
+
+    def _reset(self):
+        self.indexed_bytes = 0
+        self._file_key: Optional[List[int]] = None
+        self._offsets = array("Q")
+        self._lengths = array("I")
+        self._timestamps = array("d")
+        self._time_sorted = True
+        self._by_source: Dict[str, List[int]] = {}
+        self._by_agent: Dict[str, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    # --- Sidecar ---
+    def _current_file_key(self) -> Optional[List[int]]:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return [stat.st_dev, stat.st_ino]
+
+    def _load_sidecar(self):
+        if not os.path.exists(self.index_path):
+            return
+        good_offset = 0
+        with open(self.index_path, "rb") as f:
+            try:
+                header = json.loads(f.readline())
+            except ValueError:
+                header = {}
+            if header.get("version") != INDEX_VERSION or header.get("file_key") != self._current_file_key():
+                # Log ถูก Rotate/แทนที่ หรือ Sidecar เป็นรุ่นเก่า: สร้างใหม่ตอน refresh()
+                return
+            self._file_key = header["file_key"]
+            good_offset = f.tell()
+            for raw in f:
+                try:
+                    offset, length, timestamp, source, agent_id = json.loads(raw)
+                except ValueError:
+                    break  # แถวท้ายที่เขียนไม่ครบ
+                self._add_entry(offset, length, timestamp, source, agent_id)
+                good_offset += len(raw)
+        if good_offset < os.path.getsize(self.index_path):
+            with open(self.index_path, "r+b") as f:
+                f.truncate(good_offset)
+        if self._offsets:
+            self.indexed_bytes = self._offsets[-1] + self._lengths[-1]
+
+    def _add_entry(self, offset: int, length: int, timestamp: float, source: Optional[str], agent_id: Optional[str]):
+        entry = len(self._offsets)
+        if self._timestamps and timestamp < self._timestamps[-1]:
+            self._time_sorted = False
+        self._offsets.append(offset)
+        self._lengths.append(length)
+        self._timestamps.append(timestamp)
+        self._by_source.setdefault(source, []).append(entry)
+        self._by_agent.setdefault(agent_id, []).append(entry)
+
+    # --- Incremental Indexing ---
+    def refresh(self) -> int:
+        """ทำดัชนีส่วนที่ Log งอกเพิ่ม คืนจำนวน Insight ใหม่ที่ถูกทำดัชนี"""
+        file_key = self._current_file_key()
+        if file_key is None:
+            if self._offsets:
+                self._reset()
+            return 0
+        if file_key != self._file_key or os.path.getsize(self.path) < self.indexed_bytes:
+            self._reset()
+            self._file_key = file_key
+            with open(self.index_path, "w", encoding="utf-8") as sidecar:
+                sidecar.write(json.dumps({"version": INDEX_VERSION, "file_key": file_key}) + "\n")
+
+        added = 0
+        rows: List[str] = []
+        with open(self.path, "rb") as log:
+            log.seek(self.indexed_bytes)
+            offset = self.indexed_bytes
+            for raw in log:
+                if not raw.endswith(b"\n"):
+                    break  # บรรทัดที่ Sink ยังเขียนไม่เสร็จ จะถูกทำดัชนีในรอบถัดไป
+                try:
+                    record = json.loads(raw)
+                except ValueError:
+                    logger.warning(f"⚠️ Skipping malformed insight at offset {offset}")
+                    offset += len(raw)
+                    continue
+                timestamp = float(record.get("timestamp") or 0.0)
+                source, agent_id = record.get("source"), record.get("agent_id")
+                self._add_entry(offset, len(raw), timestamp, source, agent_id)
+                rows.append(json.dumps([offset, len(raw), timestamp, source, agent_id], ensure_ascii=False) + "\n")
+                offset += len(raw)
+                added += 1
+            self.indexed_bytes = offset
+
+        if rows:
+            with open(self.index_path, "a", encoding="utf-8") as sidecar:
+                sidecar.writelines(rows)
+        return added
+
+    # --- Query ---
+    def _candidates(self, source: Optional[str], agent_id: Optional[str],
+                    since: Optional[float], until: Optional[float]) -> Iterator[int]:
+        postings = []
+        if source is not None:
+            postings.append(self._by_source.get(source, []))
+        if agent_id is not None:
+            postings.append(self._by_agent.get(agent_id, []))
+
+        timestamps = self._timestamps
+        if not postings:
+            start, stop = 0, len(timestamps)
+            if self._time_sorted:
+                if since is not None:
+                    start = bisect_left(timestamps, since)
+                if until is not None:
+                    stop = bisect_right(timestamps, until)
+            driver = range(start, stop)
+            others: List[set] = []
+        else:
+            postings.sort(key=len)
+            driver, others = postings[0], [set(p) for p in postings[1:]]
+
+        for entry in driver:
+            if since is not None and timestamps[entry] < since:
+                continue
+            if until is not None and timestamps[entry] > until:
+                continue
+            if all(entry in other for other in others):
+                yield entry
+
+    def query(self, source: Optional[str] = None, agent_id: Optional[str] = None,
+              since: Optional[float] = None, until: Optional[float] = None,
+              limit: Optional[int] = None, refresh: bool = True) -> Iterator[Dict[str, Any]]:
+        """อ่าน Insight ที่ตรงเงื่อนไขแบบ Streaming (เรียงตามลำดับที่ถูกเขียน)"""
+        if refresh:
+            self.refresh()
+        if not self._offsets:
+            return
+        yielded = 0
+        with open(self.path, "rb") as log:
+            for entry in self._candidates(source, agent_id, since, until):
+                if limit is not None and yielded >= limit:
+                    return
+                log.seek(self._offsets[entry])
+                yield json.loads(log.read(self._lengths[entry]))
+                yielded += 1
+
+    def count_by(self, field: str, **filters) -> Counter:
+        """นับจำนวน Insight ตามค่าของ field (เช่น task_name) ภายใต้เงื่อนไขเดียวกับ query()"""
+        return Counter(record.get(field) for record in self.query(**filters))
@@ -0,0 +1,121 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger("GENESIS_INSIGHT")
+
+_STOP = object()
+
+class InsightSink:
+    """
+    ตัวเขียน Insight แบบ Buffered/Batched สำหรับ Knowledge Base (JSONL)
+    - ผู้เรียกเพียงใส่ข้อมูลลง Bounded Queue (ไม่มี File I/O บนเส้นทางของผู้เรียก)
+    - Background Thread เขียนเป็นชุดเมื่อครบ flush_size รายการ หรือทุก flush_interval วินาที
+    - หมุนไฟล์ (Rotation) เมื่อขนาดเกิน max_bytes และ Flush ทั้งหมดก่อนปิดโปรแกรมเสมอ
+    - เมื่อคิวเต็ม (Error Storm) จะทิ้งรายการใหม่และนับไว้ใน dropped แทนการบล็อกผู้เรียก
+    """
+    def __init__(self, path: str, max_queue: int = 10000, flush_size: int = 256,
+                 flush_interval: float = 1.0, max_bytes: int = 16 * 1024 * 1024,
+                 backup_count: int = 5):
+        self.path = path
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.dropped = 0
+        self.written = 0
+        self._queue: "queue.Queue" = queue.Queue(max_queue)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="insight-sink", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, data: Dict[str, Any]) -> bool:
+        """ส่ง Insight เข้าคิว (ไม่บล็อก) คืน False หากคิวเต็มหรือ Sink ถูกปิดแล้ว"""
+        if self._closed:
+            return False
+        try:
+            self._queue.put_nowait(data)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def close(self, timeout: Optional[float] = 10.0):
+        """หยุดรับงานใหม่ แล้ว Flush ทุกรายการที่ค้างอยู่ลงไฟล์"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        if self.dropped:
+            logger.warning(f"⚠️ Insight sink dropped {self.dropped} insights under back-pressure.")
+
+    def _run(self):
+        batch: List[Dict[str, Any]] = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                self._flush(batch)
+                return
+            if item is not None:
+                batch.append(item)
+
+            if len(batch) >= self.flush_size or time.monotonic() >= deadline:
+                self._flush(batch)
+                batch = []
+                deadline = time.monotonic() + self.flush_interval
+
+    def _flush(self, batch: List[Dict[str, Any]]):
+        if not batch:
+            return
+        data = "".join(json.dumps(item, ensure_ascii=False) + "\n" for item in batch)
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._rotate_if_needed(len(data.encode("utf-8")))
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(data)
+            self.written += len(batch)
+        except OSError as e:
+            logger.error(f"File system error: Failed to record {len(batch)} insights. Details: {e}")
+
+    def _rotate_if_needed(self, incoming: int):
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return
+        if size == 0 or size + incoming <= self.max_bytes:
+            return
+        # insights.jsonl -> insights.jsonl.1 -> ... -> insights.jsonl.{backup_count}
+        for index in range(self.backup_count - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+_sinks: Dict[str, InsightSink] = {}
+_sinks_lock = threading.Lock()
+
+def get_insight_sink(path: str) -> InsightSink:
+    """คืน Sink เดียวต่อไฟล์ (ป้องกันหลาย Thread เขียนไฟล์เดียวกัน)"""
+    key = os.path.abspath(path)
+    with _sinks_lock:
+        sink = _sinks.get(key)
+        if sink is None or sink._closed:
+            sink = _sinks[key] = InsightSink(path)
+        return sink
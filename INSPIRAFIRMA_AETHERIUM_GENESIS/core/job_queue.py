@@ -0,0 +1,156 @@
+import asyncio
+import itertools
+import logging
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from .mind_logic import RobustAsyncManager
+
+logger = logging.getLogger("GENESIS_JOBS")
+
+class JobStatus(str, Enum):
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
+    CANCELLED = "CANCELLED"
+
+TERMINAL_STATUSES = (JobStatus.SUCCEEDED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+class QueueFullError(Exception):
+    """คิวเต็ม (Back-pressure) ผู้เรียกควรลองใหม่ภายหลัง"""
+
+@dataclass
+class Job:
+    intent: str
+    payload: Dict[str, Any] = field(default_factory=dict)
+    priority: int = 0
+    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    status: JobStatus = JobStatus.QUEUED
+    result: Any = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    changed: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def done(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "intent": self.intent,
+            "priority": self.priority,
+            "status": self.status.value,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+class JobQueue:
+    """
+    Job Queue แบบ In-Process สำหรับ Gateway
+    รับงานแล้วคืน job_id ทันที งานจะถูกจัดลำดับตาม priority (ค่าน้อย = สำคัญกว่า)
+    และถูกดึงไปรันโดย Worker ที่ส่งต่อให้ R.A.M. อีกทอดหนึ่ง
+    """
+    def __init__(self, ram: RobustAsyncManager, maxsize: int = 1000,
+                 workers: Optional[int] = None, max_finished: int = 10000,
+                 on_change: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 execute: Optional[Callable[[Job], Awaitable[Any]]] = None):
+        self.ram = ram
+        self.on_change = on_change  # รับ Snapshot ทุกครั้งที่สถานะเปลี่ยน (เช่น ส่งต่อให้ Worker อื่น)
+        # วิธีรันงาน 1 ชิ้น (ค่าเริ่มต้น: ส่งให้ R.A.M. โดยตรง; Gateway ส่งผ่าน Stage execute ของ Sopan Pipeline)
+        self.execute = execute or (lambda job: self.ram.execute_task(job.intent, None))
+        self.maxsize = maxsize
+        self.worker_count = workers or ram.config.max_concurrent_tasks
+        self.jobs: Dict[str, Job] = {}
+        self._queue: "asyncio.PriorityQueue" = asyncio.PriorityQueue(maxsize)
+        self._sequence = itertools.count()  # รักษาลำดับ FIFO ภายใน priority เดียวกัน
+        self._finished: deque = deque()
+        self._max_finished = max_finished
+        self._workers: List[asyncio.Task] = []
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def submit(self, intent: str, payload: Optional[Dict[str, Any]] = None, priority: int = 0) -> Job:
+        job = Job(intent=intent, payload=payload or {}, priority=priority)
+        try:
+            self._queue.put_nowait((priority, next(self._sequence), job))
+        except asyncio.QueueFull:
+            raise QueueFullError(f"Job queue is full ({self.maxsize} pending)")
+        self.jobs[job.id] = job
+        if self.on_change is not None:
+            self.on_change(job.snapshot())
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.jobs.get(job_id)
+
+    async def watch(self, job: Job) -> AsyncIterator[Dict[str, Any]]:
+        """ส่ง Snapshot ทุกครั้งที่สถานะเปลี่ยน จนกว่างานจะจบ (ใช้กับ Server-Sent Events)"""
+        while True:
+            changed = job.changed
+            yield job.snapshot()
+            if job.done:
+                return
+            await changed.wait()
+
+    def start(self):
+        if self._workers:
+            return
+        self._workers = [asyncio.create_task(self._worker(i)) for i in range(self.worker_count)]
+        logger.info(f"📬 Job Queue started: {self.worker_count} workers, capacity {self.maxsize}")
+
+    async def stop(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        # งานที่ยังค้างในคิวจะถูกยกเลิก เพื่อให้ผู้ที่ Stream อยู่ได้รับสถานะสุดท้าย
+        while not self._queue.empty():
+            _, _, job = self._queue.get_nowait()
+            self._finish(job, JobStatus.CANCELLED, error="Gateway shutting down")
+        logger.info("📪 Job Queue stopped.")
+
+    async def _worker(self, index: int):
+        while True:
+            _, _, job = await self._queue.get()
+            try:
+                self._update(job, JobStatus.RUNNING, started_at=time.time())
+                result = await self.execute(job)
+                self._finish(job, JobStatus.SUCCEEDED, result=result)
+            except asyncio.CancelledError:
+                self._finish(job, JobStatus.CANCELLED, error="Gateway shutting down")
+                raise
+            except Exception as e:
+                logger.error("❌ Job %.8s failed: %s", job.id, e, extra={"job_id": job.id})
+                self._finish(job, JobStatus.FAILED, error=str(e))
+            finally:
+                self._queue.task_done()
+
+    def _update(self, job: Job, status: JobStatus, **fields):
+        job.status = status
+        for name, value in fields.items():
+            setattr(job, name, value)
+        # ปลุกผู้ที่ watch อยู่ แล้วเตรียม Event ใหม่สำหรับการเปลี่ยนแปลงครั้งถัดไป
+        changed, job.changed = job.changed, asyncio.Event()
+        changed.set()
+        if self.on_change is not None:
+            self.on_change(job.snapshot())
+
+    def _finish(self, job: Job, status: JobStatus, **fields):
+        self._update(job, status, finished_at=time.time(), **fields)
+        # จำกัดจำนวนงานที่จบแล้วในหน่วยความจำ (ลบงานเก่าสุดออกก่อน)
+        self._finished.append(job.id)
+        while len(self._finished) > self._max_finished:
+            self.jobs.pop(self._finished.popleft(), None)
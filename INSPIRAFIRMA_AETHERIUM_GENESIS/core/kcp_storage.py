@@ -1,2 +1,185 @@
 # AETHERIUM GENESIS MODULE: kcp_storage.py
-# Status: Awaiting Inspira Injection
+# KCP (Knowledge Core Platform) Storage Engine
+# โหลด Knowledge Graph แบบลำดับชั้น (Topic -> Chapter -> Section) จาก knowledge_structure.json
+# เข้าสู่ดัชนีในหน่วยความจำ หรือคอมไพล์เป็นไฟล์ไบนารีสำหรับ mmap เมื่อฐานความรู้ใหญ่ขึ้น
+
+import hashlib
+import json
+import logging
+import mmap
+import os
+import re
+import struct
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger("GENESIS_KCP")
+
+# --- รูปแบบไฟล์ .kcp (Memory-Mapped) ---
+# Header : magic(4s) version(H) reserved(H) slot_count(Q) data_offset(Q)
+# Slots  : slot_count x [key_hash(Q) offset(Q) length(I) pad(4x)]  (Open Addressing, Linear Probing)
+# Data   : JSON records (utf-8) ต่อกัน; แต่ละ record มี "id" เพื่อยืนยัน key เมื่อ hash ชนกัน
+KCP_MAGIC = b"KCP1"
+KCP_VERSION = 1
+_HEADER = struct.Struct("<4sHHQQ")
+_SLOT = struct.Struct("<QQI4x")
+
+TOPIC, CHAPTER, SECTION, META = "topic", "chapter", "section", "meta"
+_LINE_COMMENT = re.compile(r'^\s*//.*$', re.MULTILINE)
+
+def _key_hash(kind: str, key: str) -> int:
+    digest = hashlib.blake2b(f"{kind}\x00{key}".encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") or 1  # 0 สงวนไว้สำหรับช่องว่าง
+
+def load_knowledge_structure(path: str) -> Dict[str, Any]:
+    """อ่าน knowledge_structure.json (รองรับบรรทัดคอมเมนต์แบบ // ที่มีอยู่ในไฟล์ต้นฉบับ)"""
+    with open(path, "r", encoding="utf-8") as f:
+        text = _LINE_COMMENT.sub("", f.read())
+    return json.loads(text)
+
+class KCPStorage:
+    """
+    ดัชนี Knowledge Graph ในหน่วยความจำ: ค้นหา Topic / Chapter / Section ด้วย id ได้แบบ O(1)
+    Record ถูกทำให้เป็นรูปแบบ Denormalized (Topic รู้ Chapter ของตน, Chapter รู้ Topic และ Section)
+    """
+    def __init__(self, structure: Optional[Dict[str, Any]] = None):
+        structure = structure or {}
+        self.meta: Dict[str, Any] = structure.get("meta", {})
+        self.topics: Dict[str, Dict[str, Any]] = {}
+        self.chapters: Dict[str, Dict[str, Any]] = {}
+        self.sections: Dict[str, Dict[str, Any]] = {}
+
+        for chapter_id, title in structure.get("chapters", {}).items():
+            self.chapters[chapter_id] = {"id": chapter_id, "title": title, "topic_id": None, "sections": []}
+        for topic in structure.get("topics", []):
+            self.topics[topic["id"]] = {"id": topic["id"], "name": topic["name"], "chapters": list(topic.get("chapters", []))}
+            for chapter_id in topic.get("chapters", []):
+                chapter = self.chapters.setdefault(chapter_id, {"id": chapter_id, "title": None, "topic_id": None, "sections": []})
+                chapter["topic_id"] = topic["id"]
+        for section_id, section in structure.get("sections", {}).items():
+            self.sections[section_id] = {"id": section_id, **section}
+            chapter = self.chapters.get(section.get("chapter_ref"))
+            if chapter is not None:
+                chapter["sections"].append(section_id)
+
+    @classmethod
+    def from_file(cls, path: str) -> "KCPStorage":
+        storage = cls(load_knowledge_structure(path))
+        logger.info(f"📚 KCP Loaded: {len(storage.topics)} topics / {len(storage.chapters)} chapters / {len(storage.sections)} sections")
+        return storage
+
+    def get_topic(self, topic_id: str) -> Optional[Dict[str, Any]]:
+        return self.topics.get(topic_id)
+
+    def get_chapter(self, chapter_id: str) -> Optional[Dict[str, Any]]:
+        return self.chapters.get(chapter_id)
+
+    def get_section(self, section_id: str) -> Optional[Dict[str, Any]]:
+        return self.sections.get(section_id)
+
+    def list_topics(self) -> List[Dict[str, Any]]:
+        return list(self.topics.values())
+
+    def _records(self) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+        yield META, "meta", {"id": "meta", "meta": self.meta, "topics": list(self.topics)}
+        for kind, table in ((TOPIC, self.topics), (CHAPTER, self.chapters), (SECTION, self.sections)):
+            for key, record in table.items():
+                yield kind, key, record
+
+    def compile(self, path: str):
+        """เขียนดัชนีเป็นไฟล์ .kcp สำหรับเปิดด้วย MappedKCPStorage"""
+        records = list(self._records())
+        slot_count = 1
+        while slot_count < len(records) * 2:
+            slot_count <<= 1
+        data_offset = _HEADER.size + slot_count * _SLOT.size
+
+        slots = [(0, 0, 0)] * slot_count
+        blobs, cursor = [], data_offset
+        for kind, key, record in records:
+            blob = json.dumps(record, ensure_ascii=False).encode("utf-8")
+            key_hash = _key_hash(kind, key)
+            index = key_hash & (slot_count - 1)
+            while slots[index][0]:
+                index = (index + 1) & (slot_count - 1)
+            slots[index] = (key_hash, cursor, len(blob))
+            blobs.append(blob)
+            cursor += len(blob)
+
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(KCP_MAGIC, KCP_VERSION, 0, slot_count, data_offset))
+            for slot in slots:
+                f.write(_SLOT.pack(*slot))
+            for blob in blobs:
+                f.write(blob)
+        os.replace(tmp_path, path)
+        logger.info(f"📚 KCP compiled: {len(records)} records -> {path}")
+
+class MappedKCPStorage:
+    """
+    อ่านไฟล์ .kcp ผ่าน mmap: ไม่ต้องโหลดหรือ parse ฐานความรู้ทั้งก้อน
+    แต่ละการค้นหาคือการ probe hash table (O(1) โดยเฉลี่ย) แล้ว decode เฉพาะ Record ที่ต้องการ
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, self._slot_count, self._data_offset = _HEADER.unpack_from(self._mm, 0)
+        if magic != KCP_MAGIC or version != KCP_VERSION:
+            self.close()
+            raise ValueError(f"Not a KCP v{KCP_VERSION} file: {path}")
+        header = self._lookup(META, "meta") or {}
+        self.meta: Dict[str, Any] = header.get("meta", {})
+        self._topic_ids: List[str] = header.get("topics", [])
+        logger.info(f"📚 KCP Mapped: {path} ({self._slot_count} slots)")
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
+
+    def _lookup(self, kind: str, key: str) -> Optional[Dict[str, Any]]:
+        key_hash = _key_hash(kind, key)
+        mask = self._slot_count - 1
+        index = key_hash & mask
+        for _ in range(self._slot_count):
+            slot_hash, offset, length = _SLOT.unpack_from(self._mm, _HEADER.size + index * _SLOT.size)
+            if not slot_hash:
+                return None
+            if slot_hash == key_hash:
+                record = json.loads(self._mm[offset:offset + length])
+                if record.get("id") == key:
+                    return record
+            index = (index + 1) & mask
+        return None
+
+    def get_topic(self, topic_id: str) -> Optional[Dict[str, Any]]:
+        return self._lookup(TOPIC, topic_id)
+
+    def get_chapter(self, chapter_id: str) -> Optional[Dict[str, Any]]:
+        return self._lookup(CHAPTER, chapter_id)
+
+    def get_section(self, section_id: str) -> Optional[Dict[str, Any]]:
+        return self._lookup(SECTION, section_id)
+
+    def list_topics(self) -> List[Dict[str, Any]]:
+        return [self._lookup(TOPIC, topic_id) for topic_id in self._topic_ids]
+
+def open_kcp(path: str):
+    """เปิดฐานความรู้: ไฟล์ .kcp ใช้ mmap, ไฟล์ .json โหลดเข้าหน่วยความจำ, ไม่พบไฟล์ใช้ฐานว่าง"""
+    if not os.path.exists(path):
+        logger.warning(f"⚠️ Knowledge structure not found at {path}! Using empty KCP.")
+        return KCPStorage()
+    if path.endswith(".kcp"):
+        return MappedKCPStorage(path)
+    return KCPStorage.from_file(path)
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compile knowledge_structure.json into a memory-mapped .kcp file")
+    parser.add_argument("source", help="Path to knowledge_structure.json")
+    parser.add_argument("output", help="Path of the .kcp file to write")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    KCPStorage.from_file(args.source).compile(args.output)
@@ -0,0 +1,161 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from typing import Dict, Optional
+
+TEXT_FORMAT = "%(asctime)s [%(levelname)s] %(message)s"
+
+# Attribute มาตรฐานของ LogRecord (ที่เหลือถือเป็น Field เพิ่มเติมจาก extra=...)
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+class JsonFormatter(logging.Formatter):
+    """จัดรูปแบบ LogRecord เป็น JSON หนึ่งบรรทัด (รวม Field จาก extra=... และ suppressed จาก Rate Limit)"""
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": record.created,
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+class SamplingFilter(logging.Filter):
+    """ปล่อยผ่านเพียงสัดส่วน rate ของ Record (Level ตั้งแต่ always_level ขึ้นไปผ่านเสมอ)"""
+    def __init__(self, rate: float, always_level: int = logging.ERROR):
+        super().__init__()
+        self.rate = rate
+        self.always_level = always_level
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno >= self.always_level or random.random() < self.rate
+
+class RateLimitFilter(logging.Filter):
+    """
+    Token Bucket ต่อ Logger: ไม่เกิน per_second Record ต่อวินาที (สะสมได้ถึง burst)
+    จำนวนที่ถูกตัดทิ้งจะถูกแนบเป็น record.suppressed ใน Record ถัดไปที่ผ่าน
+    """
+    def __init__(self, per_second: float, burst: Optional[float] = None):
+        super().__init__()
+        self.per_second = per_second
+        self.burst = burst if burst is not None else max(1.0, per_second)
+        self.tokens = self.burst
+        self.suppressed = 0
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self._last) * self.per_second)
+            self._last = now
+            if self.tokens < 1.0:
+                self.suppressed += 1
+                return False
+            self.tokens -= 1.0
+            if self.suppressed:
+                record.suppressed = self.suppressed
+                self.suppressed = 0
+        return True
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler ที่ไม่บล็อกผู้เรียก: ไม่ Format ล่วงหน้าบน Thread ของผู้เรียก (Format ใน Listener Thread แทน)
+    และทิ้ง Record (นับใน dropped) เมื่อคิวเต็ม
+    หมายเหตุ: args ของ Log จะถูกอ่านตอน Format จึงไม่ควรส่ง Object ที่จะถูกแก้ไขทันทีหลังเรียก logger
+    """
+    def __init__(self, log_queue: "queue.Queue"):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_handler: Optional[NonBlockingQueueHandler] = None
+
+def _parse_mapping(spec: Optional[str]) -> Dict[str, float]:
+    """แปลง "GENESIS_CORE=0.1,GENESIS_GOV=0.5" เป็น dict"""
+    mapping: Dict[str, float] = {}
+    for part in (spec or "").split(","):
+        if "=" in part:
+            name, value = part.split("=", 1)
+            mapping[name.strip()] = float(value)
+    return mapping
+
+def configure_logging(fmt: Optional[str] = None, level: Optional[str] = None,
+                      sampling: Optional[Dict[str, float]] = None,
+                      rate_limits: Optional[Dict[str, float]] = None,
+                      queue_size: int = 10000) -> NonBlockingQueueHandler:
+    """
+    ติดตั้ง Logging Pipeline แบบ Non-blocking ที่ Root Logger (เรียกซ้ำได้ จะคืน Handler เดิม)
+    แทนที่ Handler เดิมทั้งหมดของ Root จึงเรียกจาก Entry Point ของ Process เท่านั้น (genesis_node --serve / Prefork Worker)
+    ไม่ใช่จาก create_app() ซึ่งอาจถูกฝังใน Process อื่น (Test Harness, uvicorn ที่ตั้ง Logging เอง)
+    ค่าเริ่มต้นอ่านจาก Environment:
+      GENESIS_LOG_FORMAT=text|json, GENESIS_LOG_LEVEL=INFO,
+      GENESIS_LOG_SAMPLING="GENESIS_CORE=0.1", GENESIS_LOG_RATE_LIMIT="GENESIS_GOV=50"
+    """
+    global _listener, _handler
+    if _handler is not None:
+        return _handler
+
+    fmt = fmt or os.getenv("GENESIS_LOG_FORMAT", "text")
+    level = level or os.getenv("GENESIS_LOG_LEVEL", "INFO")
+    sampling = _parse_mapping(os.getenv("GENESIS_LOG_SAMPLING")) if sampling is None else sampling
+    rate_limits = _parse_mapping(os.getenv("GENESIS_LOG_RATE_LIMIT")) if rate_limits is None else rate_limits
+
+    output = logging.StreamHandler(sys.stderr)
+    output.setFormatter(JsonFormatter() if fmt == "json" else logging.Formatter(TEXT_FORMAT))
+
+    log_queue: "queue.Queue" = queue.Queue(queue_size)
+    _handler = NonBlockingQueueHandler(log_queue)
+    _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=False)
+    _listener.start()
+
+    # แทนที่ Handler เดิมของ Root (เช่น StreamHandler จาก logging.basicConfig ของ Entry Point)
+    # มิฉะนั้นทุกบรรทัดจะถูกเขียนซ้ำ 2 ครั้ง และหนึ่งในนั้นยังเขียน stderr แบบ Blocking บน Event Loop
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(_handler)
+    root.setLevel(level.upper())
+
+    # Filter ติดที่ตัว Logger เพื่อให้ Record ที่ถูกตัดทิ้งไม่เสียค่าใช้จ่ายในการเข้าคิว
+    for name, rate in sampling.items():
+        logging.getLogger(name).addFilter(SamplingFilter(rate))
+    for name, per_second in rate_limits.items():
+        logging.getLogger(name).addFilter(RateLimitFilter(per_second))
+
+    atexit.register(shutdown_logging)
+    return _handler
+
+def installed_handler() -> Optional[NonBlockingQueueHandler]:
+    """Handler ของ Pipeline หาก Entry Point ติดตั้งไว้แล้ว (ไม่ติดตั้งให้เอง)"""
+    return _handler
+
+def shutdown_logging():
+    """หยุด Listener Thread หลังจากเขียน Record ที่ค้างในคิวทั้งหมดแล้ว"""
+    global _listener, _handler
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    if _handler is not None:
+        logging.getLogger().removeHandler(_handler)
+        _handler = None
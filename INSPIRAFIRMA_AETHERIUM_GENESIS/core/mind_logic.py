@@ -1,35 +1,229 @@
 import asyncio
+import functools
+import inspect
 import logging
+import os
 import random
-from dataclasses import dataclass
-from typing import Any
+import time
+from contextlib import asynccontextmanager
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Dict, Optional, Tuple, Type
 
 # ตั้งค่า Logger
 logger = logging.getLogger("GENESIS_CORE")
 
+class ExecutionMode(str, Enum):
+    """ตำแหน่งที่ workload ถูกรัน"""
+    INLINE = "inline"    # รันบน Event Loop (เหมาะกับงาน I/O-bound แบบ async)
+    THREAD = "thread"    # รันใน Thread Pool (เหมาะกับ Blocking I/O / C-extension ที่ปล่อย GIL)
+    PROCESS = "process"  # รันใน Process Pool (เหมาะกับงาน CPU-bound, workload ต้อง pickle ได้)
+
 @dataclass
 class RAMConfig:
     max_concurrent_tasks: int = 5
     max_retries: int = 3
     retry_base_delay: float = 0.5
+    retry_max_delay: float = 8.0
+    task_timeout: Optional[float] = None  # Timeout ต่อ 1 attempt (วินาที), None = ไม่จำกัด
+    # Exception ที่ไม่ควร Retry (ความผิดพลาดเชิงตรรกะ/ละเมิดกฎ ไม่หายเองเมื่อลองใหม่)
+    fatal_exceptions: Tuple[Type[BaseException], ...] = (ValueError, TypeError)
+    # Execution Mode ต่อประเภทงาน (task_type -> mode); งานที่ไม่ได้ระบุจะใช้ default_mode
+    default_mode: ExecutionMode = ExecutionMode.INLINE
+    task_modes: Dict[str, ExecutionMode] = field(default_factory=dict)
+    thread_pool_size: int = 4
+    process_pool_size: int = field(default_factory=lambda: os.cpu_count() or 1)
+    # ช่วงเวลาของงานจำลอง (ใช้เมื่อ workload_func เป็น None)
+    simulated_work_range: Tuple[float, float] = (0.5, 1.5)
+
+class TaskTimeoutError(asyncio.TimeoutError):
+    """Task ใช้เวลาเกิน timeout ต่อ attempt หรือเลย deadline ที่กำหนด"""
+
+class _WorkloadTimeout(Exception):
+    """ห่อ TimeoutError ที่ workload raise เอง (เช่น Socket ปลายทาง) ให้แยกจาก Timeout ของ attempt ได้"""
 
 class RobustAsyncManager:
     """
     R.A.M. (Robust Async Manager) - The Heart of the System
     ทำหน้าที่บริหารจัดการ Task และความพร้อมกันของการทำงาน (Concurrency)
     """
-    def __init__(self, config: RAMConfig = RAMConfig()):
+    def __init__(self, config: RAMConfig = RAMConfig(), metrics: Any = None):
         self.config = config
         self.semaphore = asyncio.Semaphore(config.max_concurrent_tasks)
+        self.thread_pool: Optional[ThreadPoolExecutor] = None
+        self.process_pool: Optional[ProcessPoolExecutor] = None
+        # สถานะจริงของ Semaphore (ใช้ใน /system/status และ /metrics)
+        self.active_tasks = 0
+        self.waiting_tasks = 0
+        self._task_seconds = None
+        self._retries = None
+        if metrics is not None:
+            self.bind_metrics(metrics)
+
+    def bind_metrics(self, metrics: Any):
+        """ลงทะเบียน Metrics ของ R.A.M. กับ MetricsRegistry (Gauge อ่านค่าตอน Scrape จึงไม่มีต้นทุนบน Hot Path)"""
+        metrics.gauge("genesis_ram_active_tasks", "Tasks currently holding a R.A.M. semaphore slot").set_function(lambda: self.active_tasks)
+        metrics.gauge("genesis_ram_waiting_tasks", "Tasks waiting for a R.A.M. semaphore slot").set_function(lambda: self.waiting_tasks)
+        metrics.gauge("genesis_ram_capacity", "Configured R.A.M. concurrency limit").set(self.config.max_concurrent_tasks)
+        self._task_seconds = metrics.histogram("genesis_ram_task_seconds", "End-to-end execute_task latency including retries", ("outcome",))
+        self._retries = metrics.counter("genesis_ram_retries_total", "Retry attempts scheduled by R.A.M.")
+
+    @asynccontextmanager
+    async def _slot(self):
+        self.waiting_tasks += 1
+        try:
+            await self.semaphore.acquire()
+        finally:
+            self.waiting_tasks -= 1
+        self.active_tasks += 1
+        try:
+            yield
+        finally:
+            self.active_tasks -= 1
+            self.semaphore.release()
+
+    def start_pools(self):
+        """สร้าง Thread/Process Pool แบบจำกัดขนาด (เรียกจาก FastAPI lifespan ตอน Startup)"""
+        if self.thread_pool is None:
+            self.thread_pool = ThreadPoolExecutor(max_workers=self.config.thread_pool_size, thread_name_prefix="ram-worker")
+        if self.process_pool is None:
+            self.process_pool = ProcessPoolExecutor(max_workers=self.config.process_pool_size)
+        logger.info(f"🧵 [R.A.M.] Pools ready: threads={self.config.thread_pool_size} processes={self.config.process_pool_size}")
+
+    def shutdown_pools(self, wait: bool = True):
+        """ปิด Pool อย่างเรียบร้อย (เรียกจาก FastAPI lifespan ตอน Shutdown)"""
+        for pool in (self.thread_pool, self.process_pool):
+            if pool is not None:
+                pool.shutdown(wait=wait, cancel_futures=True)
+        self.thread_pool = None
+        self.process_pool = None
+        logger.info("🧵 [R.A.M.] Pools shut down.")
+
+    def resolve_mode(self, task_type: Optional[str] = None, mode: Optional[ExecutionMode] = None) -> ExecutionMode:
+        if mode is None:
+            mode = self.config.task_modes.get(task_type, self.config.default_mode)
+        return ExecutionMode(mode)
+
+    async def execute_task(self, task_name: str, workload_func: Any, *args,
+                           timeout: Optional[float] = None,
+                           deadline: Optional[float] = None,
+                           max_retries: Optional[int] = None,
+                           task_type: Optional[str] = None,
+                           mode: Optional[ExecutionMode] = None):
+        """
+        รัน workload_func (coroutine function หรือ callable ธรรมดา) พร้อม Retry แบบ Exponential Backoff + Jitter
+        - timeout: เวลาสูงสุดต่อ 1 attempt (ค่าเริ่มต้นจาก RAMConfig.task_timeout)
+        - deadline: เวลาสิ้นสุดแบบ absolute ตาม time.monotonic() ครอบคลุมทุก attempt รวม backoff
+        - task_type / mode: เลือก Execution Mode (inline / thread / process) ตาม RAMConfig.task_modes
+        - การ Cancel จากผู้เรียกจะถูกส่งต่อเข้าไปยัง workload ทันที (ไม่ถูก Retry)
+        """
+        timeout = self.config.task_timeout if timeout is None else timeout
+        retries = self.config.max_retries if max_retries is None else max_retries
+        run_mode = self.resolve_mode(task_type, mode)
+
+        if self._task_seconds is None:
+            return await self._attempt_loop(task_name, run_mode, workload_func, args, timeout, deadline, retries)
+
+        started = time.perf_counter()
+        outcome = "failure"
+        try:
+            result = await self._attempt_loop(task_name, run_mode, workload_func, args, timeout, deadline, retries)
+            outcome = "success"
+            return result
+        except TaskTimeoutError:
+            outcome = "timeout"
+            raise
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        finally:
+            self._task_seconds.labels(outcome).observe(time.perf_counter() - started)
+
+    async def _attempt_loop(self, task_name: str, run_mode: ExecutionMode, workload_func: Any, args: tuple,
+                            timeout: Optional[float], deadline: Optional[float], retries: int):
+        attempt = 0
+        while True:
+            attempt_timeout = self._remaining(task_name, timeout, deadline)
+            try:
+                # ถือ Semaphore เฉพาะช่วงที่ทำงานจริง ไม่ถือค้างไว้ระหว่างรอ Backoff
+                async with self._slot():
+                    logger.info("❤️ [R.A.M.] Pumping task: %s (attempt %d)", task_name, attempt + 1,
+                                extra={"task": task_name, "attempt": attempt + 1})
+                    return await asyncio.wait_for(self._guarded_workload(task_name, run_mode, workload_func, *args), attempt_timeout)
+            except _WorkloadTimeout as e:
+                error: BaseException = e.__cause__  # ความผิดพลาดชั่วคราวของ workload: Retry ตามปกติ
+            except asyncio.TimeoutError as e:
+                # มาจาก wait_for เท่านั้น (Timeout ของ workload ถูกห่อไว้แล้ว) จึงมี attempt_timeout เสมอ
+                error = TaskTimeoutError(f"{task_name} exceeded {attempt_timeout:.3f}s")
+                error.__cause__ = e
+            except self.config.fatal_exceptions:
+                raise
+            except Exception as e:
+                error = e
+
+            if attempt >= retries:
+                raise error
+
+            delay = self._backoff_delay(attempt)
+            if deadline is not None and time.monotonic() + delay >= deadline:
+                raise TaskTimeoutError(f"{task_name} deadline exceeded after {attempt + 1} attempts") from error
+
+            logger.warning("🔁 [R.A.M.] Retrying %s in %.2fs after: %r", task_name, delay, error,
+                           extra={"task": task_name, "attempt": attempt + 1})
+            if self._retries is not None:
+                self._retries.inc()
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def _remaining(self, task_name: str, timeout: Optional[float], deadline: Optional[float]) -> Optional[float]:
+        """คำนวณ Timeout ของ attempt ปัจจุบัน โดยไม่ให้เกิน deadline ที่เหลืออยู่"""
+        if deadline is None:
+            return timeout
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TaskTimeoutError(f"{task_name} deadline exceeded")
+        return remaining if timeout is None else min(timeout, remaining)
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Exponential Backoff แบบ Full Jitter"""
+        ceiling = min(self.config.retry_max_delay, self.config.retry_base_delay * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    async def _guarded_workload(self, task_name: str, run_mode: ExecutionMode, workload_func: Any, *args):
+        try:
+            return await self._run_workload(task_name, run_mode, workload_func, *args)
+        except (asyncio.TimeoutError, TimeoutError) as e:
+            raise _WorkloadTimeout() from e
+
+    async def _run_workload(self, task_name: str, run_mode: ExecutionMode, workload_func: Any, *args):
+        if workload_func is None:
+            return await self._simulated_workload(task_name)
+
+        if run_mode is not ExecutionMode.INLINE:
+            if inspect.iscoroutinefunction(workload_func):
+                raise TypeError(f"{task_name}: coroutine workloads must run in {ExecutionMode.INLINE.value} mode")
+            # หมายเหตุ: Timeout/Cancel จะปล่อย Semaphore ทันที แต่ไม่สามารถหยุด Thread/Process ที่รันอยู่ได้
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor_for(run_mode), functools.partial(workload_func, *args))
+
+        result = workload_func(*args)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+    def _executor_for(self, run_mode: ExecutionMode) -> Executor:
+        # รองรับการใช้งานนอก Gateway (เช่น CLI) ที่ไม่ได้ผ่าน lifespan
+        if self.thread_pool is None or self.process_pool is None:
+            self.start_pools()
+        return self.thread_pool if run_mode is ExecutionMode.THREAD else self.process_pool
 
-    async def execute_task(self, task_name: str, workload_func: Any, *args):
-        async with self.semaphore:
-            # Mock Processing Logic
-            logger.info(f"❤️ [R.A.M.] Pumping task: {task_name}")
-            await asyncio.sleep(random.uniform(0.5, 1.5)) # Simulating work
+    async def _simulated_workload(self, task_name: str):
+        # Mock Processing Logic
+        await asyncio.sleep(random.uniform(*self.config.simulated_work_range)) # Simulating work
 
-            # Check for simulated critical failure logic based on rules
-            if "INFINITE_LOOP" in task_name:
-                raise ValueError("PARAJIKA_03 Triggered: Recursive Loop Detected")
+        # Check for simulated critical failure logic based on rules
+        if "INFINITE_LOOP" in task_name:
+            raise ValueError("PARAJIKA_03 Triggered: Recursive Loop Detected")
 
-            return f"✅ {task_name} Completed via R.A.M."
+        return f"✅ {task_name} Completed via R.A.M."
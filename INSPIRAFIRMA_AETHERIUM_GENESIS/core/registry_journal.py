@@ -0,0 +1,198 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from .agent_registry import AgentRecord, AgentRegistry
+
+logger = logging.getLogger("GENESIS_REGISTRY")
+
+SNAPSHOT_FILE = "registry.snapshot.jsonl"
+WAL_FILE = "registry.wal"
+
+class RegistryJournal:
+    """
+    ความคงทนของ Agent Registry: Write-Ahead Log (append-only) + Snapshot แบบ Compact
+    - ทุกการเปลี่ยนแปลงถูกเขียนลง WAL ก่อนตอบกลับผู้เรียก
+    - Group Commit: การเขียนที่มาพร้อมกันถูกรวมเป็น write + fsync ครั้งเดียว
+    - เมื่อ WAL ยาวเกิน snapshot_every รายการ จะเขียน Snapshot ใหม่และล้าง WAL
+      ทำให้เวลา Recovery ตอน Startup มีขอบเขตเสมอ (Snapshot + WAL ไม่เกิน snapshot_every รายการ)
+    """
+    def __init__(self, registry: AgentRegistry, directory: str,
+                 snapshot_every: int = 10000, commit_interval: float = 0.002,
+                 fsync: bool = True):
+        self.registry = registry
+        self.directory = directory
+        self.snapshot_path = os.path.join(directory, SNAPSHOT_FILE)
+        self.wal_path = os.path.join(directory, WAL_FILE)
+        self.snapshot_every = snapshot_every
+        self.commit_interval = commit_interval
+        self.fsync = fsync
+        self.lsn = 0  # Log Sequence Number ล่าสุดที่ถูกกำหนดแล้ว
+        self._wal_entries = 0
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self._wal = None
+
+    # --- Recovery ---
+    def recover(self) -> int:
+        """โหลด Snapshot แล้ว Replay WAL ที่ใหม่กว่า คืนจำนวน Agent ที่กู้คืนได้"""
+        os.makedirs(self.directory, exist_ok=True)
+        started = time.perf_counter()
+        snapshot_lsn = self._load_snapshot()
+        replayed = self._replay_wal(snapshot_lsn)
+        logger.info(f"💾 Registry recovered: {len(self.registry)} agents "
+                    f"(snapshot lsn={snapshot_lsn}, replayed {replayed}) in {time.perf_counter() - started:.3f}s")
+        return len(self.registry)
+
+    def _load_snapshot(self) -> int:
+        if not os.path.exists(self.snapshot_path):
+            return 0
+        with open(self.snapshot_path, "r", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            for line in f:
+                self._apply_register(json.loads(line))
+        self.lsn = header["lsn"]
+        return self.lsn
+
+    def _replay_wal(self, snapshot_lsn: int) -> int:
+        if not os.path.exists(self.wal_path):
+            return 0
+        replayed, good_offset = 0, 0
+        with open(self.wal_path, "rb") as f:
+            for raw in f:
+                # Record ที่ Commit แล้วต้องจบด้วย \n เสมอ: บรรทัดท้ายที่ไม่มี \n (Crash ระหว่างเขียน) ถือว่าไม่เคยถูก Commit
+                # แม้จะ Parse ได้ ต้องตัดทิ้ง มิฉะนั้น Record ถัดไปจะถูกเขียนต่อท้ายบรรทัดเดียวกัน
+                try:
+                    entry = json.loads(raw) if raw.endswith(b"\n") else None
+                except ValueError:
+                    entry = None
+                if entry is None:
+                    logger.warning(f"⚠️ Torn WAL record at offset {good_offset}; truncating.")
+                    break
+                good_offset += len(raw)
+                self._wal_entries += 1
+                if entry["lsn"] <= snapshot_lsn:
+                    continue
+                self._apply(entry)
+                self.lsn = entry["lsn"]
+                replayed += 1
+        if good_offset < os.path.getsize(self.wal_path):
+            with open(self.wal_path, "r+b") as f:
+                f.truncate(good_offset)
+                os.fsync(f.fileno())
+        return replayed
+
+    def _apply(self, entry: Dict[str, Any]):
+        op = entry["op"]
+        if op == "register":
+            self._apply_register(entry["agent"])
+        elif op == "status":
+            self.registry.update_status(entry["id"], entry["status"])
+        elif op == "remove":
+            self.registry.remove(entry["id"])
+
+    def _apply_register(self, agent: Dict[str, Any]):
+        self.registry.register(agent["id"], agent["name"], agent["role"], agent["key"],
+                               agent["capabilities"], agent["status"], agent["registered_at"])
+
+    # --- Write Path ---
+    def start(self):
+        os.makedirs(self.directory, exist_ok=True)
+        self._wal = open(self.wal_path, "a", encoding="utf-8")
+        self._wakeup = asyncio.Event()
+        self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        """Flush งานที่ค้างทั้งหมด เขียน Snapshot สุดท้าย แล้วปิดไฟล์"""
+        if self._flusher is None:
+            return
+        self._flusher.cancel()
+        await asyncio.gather(self._flusher, return_exceptions=True)
+        self._flusher = None
+        await self._commit_pending()
+        await self._compact()
+        self._wal.close()
+        self._wal = None
+
+    async def log_register(self, record: AgentRecord):
+        await self._append({"op": "register", "agent": record.to_dict()})
+
+    async def log_status(self, agent_id: str, status: str):
+        await self._append({"op": "status", "id": agent_id, "status": status})
+
+    async def log_remove(self, agent_id: str):
+        await self._append({"op": "remove", "id": agent_id})
+
+    async def _append(self, entry: Dict[str, Any]):
+        """กำหนด LSN ทันที (ตรงกับลำดับการแก้ไข Registry ในหน่วยความจำ) แล้วรอจนกว่าจะถูก fsync"""
+        if self._flusher is None:
+            raise RuntimeError("RegistryJournal is not started")
+        self.lsn += 1
+        entry["lsn"] = self.lsn
+        done = asyncio.get_running_loop().create_future()
+        self._pending.append((json.dumps(entry, ensure_ascii=False) + "\n", done))
+        self._wakeup.set()
+        await done
+
+    async def _flush_loop(self):
+        while True:
+            await self._wakeup.wait()
+            # รอสั้นๆ เพื่อรวบรวมการเขียนที่มาพร้อมกันให้อยู่ใน fsync เดียว
+            if self.commit_interval:
+                await asyncio.sleep(self.commit_interval)
+            self._wakeup.clear()
+            await self._commit_pending()
+            if self._wal_entries >= self.snapshot_every:
+                await self._compact()
+
+    async def _commit_pending(self):
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        try:
+            await asyncio.to_thread(self._write_batch, "".join(line for line, _ in batch))
+        except Exception as e:
+            for _, done in batch:
+                if not done.done():
+                    done.set_exception(e)
+            return
+        self._wal_entries += len(batch)
+        for _, done in batch:
+            if not done.done():
+                done.set_result(None)
+
+    def _write_batch(self, data: str):
+        self._wal.write(data)
+        self._wal.flush()
+        if self.fsync:
+            os.fsync(self._wal.fileno())
+
+    # --- Compaction ---
+    async def _compact(self):
+        """
+        เขียน Snapshot ของ Registry ณ LSN ปัจจุบัน แล้วล้าง WAL
+        (จับ Records + LSN ในจังหวะเดียวบน Event Loop จึงได้ Cut ที่สอดคล้องกัน)
+        """
+        snapshot_lsn = self.lsn
+        agents = [record.to_dict() for record in self.registry.query(limit=len(self.registry) + 1)[0]]
+        await asyncio.to_thread(self._write_snapshot, snapshot_lsn, agents)
+        # WAL ที่เหลือมี LSN <= snapshot_lsn ทั้งหมด (งานใหม่ยังรออยู่ใน _pending) จึงล้างได้อย่างปลอดภัย
+        self._wal.truncate(0)
+        self._wal.seek(0)
+        self._wal_entries = 0
+        logger.info(f"💾 Registry snapshot written: {len(agents)} agents at lsn={snapshot_lsn}")
+
+    def _write_snapshot(self, snapshot_lsn: int, agents: List[Dict[str, Any]]):
+        tmp_path = self.snapshot_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"lsn": snapshot_lsn, "created_at": time.time(), "count": len(agents)}) + "\n")
+            for agent in agents:
+                f.write(json.dumps(agent, ensure_ascii=False) + "\n")
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
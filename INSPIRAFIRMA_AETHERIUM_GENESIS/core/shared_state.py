@@ -0,0 +1,274 @@
+import asyncio
+import json
+import logging
+import multiprocessing
+import struct
+from collections import deque
+from typing import Any, AsyncIterator, Dict, Iterable, Optional, Set
+
+from .agent_registry import AgentRecord, AgentRegistry
+from .registry_journal import RegistryJournal
+
+logger = logging.getLogger("GENESIS_SHARED")
+
+_FRAME_HEADER = struct.Struct(">I")
+
+def _encode(message: Dict[str, Any]) -> bytes:
+    body = json.dumps(message, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return _FRAME_HEADER.pack(len(body)) + body
+
+async def _read_message(reader: asyncio.StreamReader) -> Dict[str, Any]:
+    header = await reader.readexactly(_FRAME_HEADER.size)
+    return json.loads(await reader.readexactly(_FRAME_HEADER.unpack(header)[0]))
+
+def _agent_payload(record: AgentRecord) -> Dict[str, Any]:
+    payload = record.to_dict()
+    payload["seq"] = record.seq
+    return payload
+
+def _apply_agent(registry: AgentRegistry, agent: Dict[str, Any]) -> AgentRecord:
+    return registry.register(agent["id"], agent["name"], agent["role"], agent["key"], agent["capabilities"],
+                             agent["status"], agent["registered_at"], seq=agent.get("seq"))
+
+# --- Shared Memory Counters ---
+class SharedCounter:
+    """ตัวนับ 1 ช่องใน SharedCounters (API เดียวกับ Counter ทั่วไป: inc() และ value)"""
+    __slots__ = ("_array", "_index", "_lock")
+
+    def __init__(self, array, index: int, lock):
+        self._array = array
+        self._index = index
+        self._lock = lock
+
+    def inc(self, amount: int = 1):
+        with self._lock:
+            self._array[self._index] += amount
+
+    @property
+    def value(self) -> int:
+        return self._array[self._index]
+
+class SharedCounters:
+    """
+    ตัวนับ int64 ใน Shared Memory (RawArray) ที่ต้องสร้างใน Process แม่ก่อน fork
+    Worker ทุกตัวเห็นค่าเดียวกัน การเพิ่มค่าป้องกันด้วย Lock ข้าม Process ตัวเดียว (ถือสั้นมาก)
+    """
+    def __init__(self, names: Iterable[str]):
+        self.names = list(names)
+        self._array = multiprocessing.RawArray("q", len(self.names))
+        self._lock = multiprocessing.Lock()
+        self._counters = {name: SharedCounter(self._array, i, self._lock) for i, name in enumerate(self.names)}
+
+    def counter(self, name: str) -> SharedCounter:
+        return self._counters[name]
+
+    def snapshot(self) -> Dict[str, int]:
+        return {name: counter.value for name, counter in self._counters.items()}
+
+# --- State Hub (Process เดียวที่ถือ State ต้นฉบับ) ---
+class StateHub:
+    """
+    ศูนย์กลาง State ของ Gateway แบบหลาย Worker (รันใน Process แยกของตัวเอง)
+    - ถือ Agent Registry ต้นฉบับพร้อม RegistryJournal (WAL + Snapshot) เพียงชุดเดียว
+    - ทุกการเปลี่ยนแปลงถูกกำหนดลำดับที่นี่ แล้ว Broadcast ให้ Replica ในทุก Worker ตามลำดับเดียวกัน
+    - สถานะ Job ที่ Worker ส่งมาถูกเก็บล่าสุดต่อ Job และกระจายให้ Worker อื่น (ค้นหา/Stream ได้จากทุก Worker)
+    Worker ที่เชื่อมต่อใหม่ได้รับ Snapshot ทั้งหมดก่อน แล้วจึงได้รับการเปลี่ยนแปลงต่อเนื่อง
+    """
+    def __init__(self, path: str, registry_dir: str, max_jobs: int = 10000):
+        self.path = path
+        self.registry = AgentRegistry()
+        self.journal = RegistryJournal(self.registry, registry_dir)
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self._job_order: deque = deque()
+        self._max_jobs = max_jobs
+        self._peers: Set[asyncio.StreamWriter] = set()
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self):
+        self.journal.recover()
+        self.journal.start()
+        self._server = await asyncio.start_unix_server(self._handle, path=self.path)
+        logger.info(f"🗄️ State Hub listening on {self.path} ({len(self.registry)} agents)")
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for writer in list(self._peers):
+            writer.close()
+        await self.journal.stop()
+        logger.info("🗄️ State Hub stopped.")
+
+    def _broadcast(self, message: Dict[str, Any], skip: Optional[asyncio.StreamWriter] = None):
+        frame = _encode(message)
+        for writer in self._peers:
+            if writer is not skip:
+                writer.write(frame)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        # ส่ง Snapshot และเพิ่มเข้ารายชื่อผู้รับในขั้นตอนเดียว (ไม่มี await คั่น) จึงไม่พลาดการเปลี่ยนแปลงใดๆ
+        agents, cursor = [], None
+        while True:
+            page, cursor = self.registry.query(cursor=cursor, limit=1000)
+            agents.extend(_agent_payload(record) for record in page)
+            if cursor is None:
+                break
+        writer.write(_encode({"op": "snapshot", "agents": agents, "jobs": list(self.jobs.values())}))
+        self._peers.add(writer)
+        try:
+            while True:
+                message = await _read_message(reader)
+                if message["op"] == "register":
+                    asyncio.create_task(self._register(message))
+                elif message["op"] == "job":
+                    self._store_job(message["job"])
+                    self._broadcast(message, skip=writer)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._peers.discard(writer)
+            writer.close()
+
+    async def _register(self, message: Dict[str, Any]):
+        agent = message["agent"]
+        agent.pop("seq", None)
+        record = _apply_agent(self.registry, agent)
+        await self.journal.log_register(record)  # Broadcast หลังจากถูก fsync แล้วเท่านั้น
+        self._broadcast({"op": "register", "agent": _agent_payload(record),
+                         "origin": message.get("origin"), "rid": message.get("rid")})
+
+    def _store_job(self, job: Dict[str, Any]):
+        job_id = job["job_id"]
+        if job_id not in self.jobs:
+            self._job_order.append(job_id)
+            while len(self._job_order) > self._max_jobs:
+                self.jobs.pop(self._job_order.popleft(), None)
+        self.jobs[job_id] = job
+
+async def run_state_hub(path: str, registry_dir: str, stop_event: asyncio.Event):
+    hub = StateHub(path, registry_dir)
+    await hub.start()
+    await stop_event.wait()
+    await hub.stop()
+
+# --- Replica (ฝั่ง Worker) ---
+class StateReplica:
+    """
+    สำเนาของ State ใน Worker 1 ตัว: อ่านจากหน่วยความจำของตัวเอง (ไม่มี IPC บนเส้นทางอ่าน)
+    ส่วนการเขียนส่งไปที่ StateHub แล้วรอจน Hub Broadcast กลับมา (ทุก Worker จึงเห็นลำดับเดียวกัน)
+    """
+    def __init__(self, path: str, worker_id: int, counters: Optional[SharedCounters] = None,
+                 max_jobs: int = 10000, connect_timeout: float = 10.0):
+        self.path = path
+        self.worker_id = worker_id
+        self.counters = counters
+        self.registry = AgentRegistry()
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self._job_order: deque = deque()
+        self._max_jobs = max_jobs
+        self._job_events: Dict[str, asyncio.Event] = {}
+        self._connect_timeout = connect_timeout
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._next_rid = 0
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """เชื่อมต่อ Hub (ลองใหม่จนกว่า Hub จะพร้อม) แล้วโหลด Snapshot ก่อนเริ่มรับ Request"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._connect_timeout
+        while True:
+            try:
+                reader, self._writer = await asyncio.open_unix_connection(self.path)
+                break
+            except (FileNotFoundError, ConnectionError):
+                if loop.time() > deadline:
+                    raise
+                await asyncio.sleep(0.05)
+        self._apply(await _read_message(reader))
+        self._reader_task = asyncio.create_task(self._read_loop(reader))
+        logger.info(f"🔗 Worker {self.worker_id} attached to State Hub ({len(self.registry)} agents)")
+
+    async def stop(self):
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            await asyncio.gather(self._reader_task, return_exceptions=True)
+            self._reader_task = None
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    async def _read_loop(self, reader: asyncio.StreamReader):
+        try:
+            while True:
+                self._apply(await _read_message(reader))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            logger.error(f"❌ Worker {self.worker_id} lost its State Hub connection")
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("State Hub connection lost"))
+            self._pending.clear()
+
+    def _apply(self, message: Dict[str, Any]):
+        op = message["op"]
+        if op == "register":
+            record = _apply_agent(self.registry, message["agent"])
+            if message.get("origin") == self.worker_id:
+                future = self._pending.pop(message.get("rid"), None)
+                if future is not None and not future.done():
+                    future.set_result(record)
+        elif op == "job":
+            self._store_job(message["job"])
+        elif op == "snapshot":
+            for agent in message["agents"]:
+                _apply_agent(self.registry, agent)
+            for job in message["jobs"]:
+                self._store_job(job)
+
+    # --- Agent Registry ---
+    async def register(self, agent_id: str, name: str, role: str, key: str,
+                       capabilities: Iterable[str] = ()) -> AgentRecord:
+        """ลงทะเบียนผ่าน Hub: คืน Record หลังจาก Hub fsync WAL และ Replica นี้ได้ Apply แล้ว"""
+        if self._writer is None:
+            raise ConnectionError("State Hub is not connected")
+        self._next_rid += 1
+        future = asyncio.get_running_loop().create_future()
+        self._pending[self._next_rid] = future
+        agent = AgentRecord(agent_id, name, role, key, capabilities).to_dict()
+        self._writer.write(_encode({"op": "register", "agent": agent, "origin": self.worker_id, "rid": self._next_rid}))
+        return await future
+
+    # --- Job State ---
+    def publish_job(self, snapshot: Dict[str, Any]):
+        """ส่งสถานะ Job ของ Worker นี้ให้ Worker อื่น (Fire-and-forget)"""
+        if self._writer is not None:
+            self._writer.write(_encode({"op": "job", "job": snapshot}))
+
+    def _store_job(self, job: Dict[str, Any]):
+        job_id = job["job_id"]
+        if job_id not in self.jobs:
+            self._job_order.append(job_id)
+            while len(self._job_order) > self._max_jobs:
+                self.jobs.pop(self._job_order.popleft(), None)
+        self.jobs[job_id] = job
+        event = self._job_events.pop(job_id, None)
+        if event is not None:
+            event.set()
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self.jobs.get(job_id)
+
+    async def watch_job(self, job_id: str, terminal: Iterable[str]) -> AsyncIterator[Dict[str, Any]]:
+        """ส่ง Snapshot ของ Job ที่รันอยู่บน Worker อื่นทุกครั้งที่สถานะเปลี่ยน จนกว่าจะจบ"""
+        terminal = set(terminal)
+        while True:
+            event = self._job_events.setdefault(job_id, asyncio.Event())
+            snapshot = self.jobs.get(job_id)
+            if snapshot is None:
+                return
+            yield snapshot
+            if snapshot["status"] in terminal:
+                return
+            await event.wait()
@@ -0,0 +1 @@
+"""Data Structures: โครงสร้างข้อมูลที่ส่งผ่านระหว่าง Agent"""
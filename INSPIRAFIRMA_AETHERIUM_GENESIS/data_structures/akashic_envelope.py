@@ -1,2 +1,249 @@
 # AETHERIUM GENESIS MODULE: akashic_envelope.py
-# Status: Awaiting Inspira Injection
+# Akashic Envelope: ซองข้อความไบนารีขนาดกะทัดรัดสำหรับส่ง Intent + Payload ระหว่าง Agent / Gateway
+# แทนการส่ง Dict[str, Any] ผ่าน JSON ทุกชั้น: Header ถอดได้ทันทีจาก memoryview โดยไม่ต้องแตะ Body
+
+import base64
+import json
+import struct
+import time
+import uuid
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
+
+# --- รูปแบบ Wire (Little-endian) ---
+# Prefix : frame_length(I)  จำนวนไบต์ของ Frame ที่ตามมา (ไม่รวม Prefix เอง)
+# Fixed  : magic(2s) version(B) flags(B) priority(h) reserved(H) created_at(d) header_length(I) body_length(I)
+# Header : สตริง utf-8 คั่นด้วย NUL (\x00) ตามลำดับ envelope_id, source, target, intent, content_type
+#          แล้วตามด้วยคู่ key / value ของ headers เพิ่มเติม (ถอดได้ด้วย decode + split ครั้งเดียว)
+# Body   : ไบต์ดิบ body_length ไบต์ (Decode แล้วได้ memoryview ชี้เข้า Buffer เดิม ไม่มีการคัดลอก)
+ENVELOPE_MAGIC = b"AK"
+ENVELOPE_VERSION = 1
+_PREFIX = struct.Struct("<I")
+_FIXED = struct.Struct("<2sBBhHdII")
+_SEPARATOR = "\x00"
+_FIXED_FIELDS = 5
+
+FLAG_JSON_BODY = 0x01  # Body เป็น JSON (utf-8) ที่ payload() ถอดได้
+
+CONTENT_JSON = "application/json"
+CONTENT_BINARY = "application/octet-stream"
+MEDIA_TYPE = "application/x-akashic-envelope"
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+class EnvelopeDecodeError(ValueError):
+    """Buffer ไม่ใช่ Akashic Envelope ที่สมบูรณ์ (Magic / Version / ความยาวไม่ถูกต้อง)"""
+    pass
+
+def _is_json(content_type: str) -> bool:
+    return content_type == CONTENT_JSON or content_type.endswith("+json")
+
+class AkashicEnvelope:
+    """
+    รูปแบบในหน่วยความจำของ Envelope (__slots__: ไม่มี __dict__ ต่อ Instance)
+    body เก็บเป็นไบต์เสมอ; ใช้ from_payload() / payload() เมื่อต้องการทำงานกับ Dict แบบ JSON
+    """
+    __slots__ = ("envelope_id", "source", "target", "intent", "content_type",
+                 "priority", "created_at", "headers", "body")
+
+    def __init__(self, intent: str, body: BytesLike = b"", source: str = "", target: str = "",
+                 content_type: str = CONTENT_BINARY, priority: int = 0,
+                 headers: Optional[Dict[str, str]] = None, envelope_id: Optional[str] = None,
+                 created_at: Optional[float] = None):
+        self.envelope_id = envelope_id or uuid.uuid4().hex
+        self.source = source
+        self.target = target
+        self.intent = intent
+        self.content_type = content_type
+        self.priority = priority
+        self.created_at = time.time() if created_at is None else created_at
+        self.headers: Dict[str, str] = headers or {}
+        self.body = body
+
+    @classmethod
+    def from_payload(cls, intent: str, payload: Any, **fields) -> "AkashicEnvelope":
+        """สร้าง Envelope จาก Payload แบบ JSON (เช่น GenesisCommand.payload)"""
+        body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        return cls(intent, body, content_type=CONTENT_JSON, **fields)
+
+    def payload(self) -> Any:
+        if not _is_json(self.content_type):
+            raise ValueError(f"Envelope body is not JSON: {self.content_type}")
+        return json.loads(bytes(self.body)) if self.body else None
+
+    # --- Binary Codec ---
+    def encode(self) -> bytes:
+        """คืน Frame ที่สมบูรณ์ (รวม Length Prefix) ต่อกันหลาย Frame ใน Stream เดียวได้"""
+        fields = [self.envelope_id, self.source, self.target, self.intent, self.content_type]
+        for key, value in self.headers.items():
+            fields.append(key)
+            fields.append(value)
+        text = _SEPARATOR.join(fields)
+        if text.count(_SEPARATOR) != len(fields) - 1:
+            raise ValueError("Envelope header fields must not contain NUL characters")
+        header = text.encode("utf-8")
+        flags = FLAG_JSON_BODY if _is_json(self.content_type) else 0
+        fixed = _FIXED.pack(ENVELOPE_MAGIC, ENVELOPE_VERSION, flags, self.priority, 0,
+                            self.created_at, len(header), len(self.body))
+        frame_length = len(fixed) + len(header) + len(self.body)
+        return b"".join((_PREFIX.pack(frame_length), fixed, header, self.body))
+
+    @staticmethod
+    def decode(buffer: BytesLike, offset: int = 0) -> "EnvelopeView":
+        return EnvelopeView(buffer, offset)
+
+    # --- JSON Codec ---
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        รูปแบบ JSON สำหรับ Client ที่ไม่รองรับไบนารี:
+        Body ที่เป็น JSON อยู่ใน "payload" ตามเดิม ส่วน Body ไบนารีอยู่ใน "body_b64"
+        """
+        data: Dict[str, Any] = {
+            "envelope_id": self.envelope_id,
+            "source": self.source,
+            "target": self.target,
+            "intent": self.intent,
+            "content_type": self.content_type,
+            "priority": self.priority,
+            "created_at": self.created_at,
+            "headers": dict(self.headers),
+        }
+        if _is_json(self.content_type):
+            data["payload"] = self.payload()
+        else:
+            data["body_b64"] = base64.b64encode(self.body).decode("ascii")
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "AkashicEnvelope":
+        fields = {
+            "source": data.get("source", ""),
+            "target": data.get("target", ""),
+            "priority": data.get("priority", 0),
+            "headers": data.get("headers"),
+            "envelope_id": data.get("envelope_id"),
+            "created_at": data.get("created_at"),
+        }
+        if "body_b64" in data:
+            return cls(data["intent"], base64.b64decode(data["body_b64"]),
+                       content_type=data.get("content_type", CONTENT_BINARY), **fields)
+        envelope = cls.from_payload(data["intent"], data.get("payload"), **fields)
+        envelope.content_type = data.get("content_type", CONTENT_JSON)
+        return envelope
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, text: Union[str, bytes]) -> "AkashicEnvelope":
+        return cls.from_dict(json.loads(text))
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, AkashicEnvelope):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__ if name != "body") \
+            and bytes(self.body) == bytes(other.body)
+
+    def __repr__(self) -> str:
+        return (f"AkashicEnvelope(id={self.envelope_id!r}, intent={self.intent!r}, "
+                f"source={self.source!r}, target={self.target!r}, body={len(self.body)} bytes)")
+
+class EnvelopeView:
+    """
+    มุมมองแบบ Read-only ของ Envelope 1 Frame ภายใน Buffer (bytes / bytearray / mmap / memoryview)
+    - ตอนสร้าง: ตรวจเฉพาะ Prefix + Fixed Header (struct.unpack_from ครั้งเดียว)
+    - Header แบบสตริงถูกถอดครั้งแรกที่มีการอ่าน แล้ว Cache ไว้
+    - body คืน memoryview ชี้เข้า Buffer เดิม (ไม่มีการคัดลอก); Buffer ต้องมีชีวิตอยู่ตลอดที่ใช้ View
+    """
+    __slots__ = ("_buffer", "_header_start", "_body_start", "_end", "flags", "priority", "created_at", "_fields")
+
+    def __init__(self, buffer: BytesLike, offset: int = 0):
+        view = buffer if isinstance(buffer, memoryview) else memoryview(buffer)
+        if view.ndim != 1 or view.itemsize != 1:
+            view = view.cast("B")
+        if len(view) - offset < _PREFIX.size + _FIXED.size:
+            raise EnvelopeDecodeError("Truncated envelope: missing fixed header")
+        (frame_length,) = _PREFIX.unpack_from(view, offset)
+        magic, version, self.flags, self.priority, _, self.created_at, header_length, body_length = \
+            _FIXED.unpack_from(view, offset + _PREFIX.size)
+        if magic != ENVELOPE_MAGIC:
+            raise EnvelopeDecodeError(f"Bad envelope magic: {magic!r}")
+        if version != ENVELOPE_VERSION:
+            raise EnvelopeDecodeError(f"Unsupported envelope version: {version}")
+        if frame_length != _FIXED.size + header_length + body_length:
+            raise EnvelopeDecodeError("Envelope length fields are inconsistent")
+        self._header_start = offset + _PREFIX.size + _FIXED.size
+        self._body_start = self._header_start + header_length
+        self._end = self._body_start + body_length
+        if self._end > len(view):
+            raise EnvelopeDecodeError(f"Truncated envelope: need {self._end - offset} bytes, have {len(view) - offset}")
+        self._buffer = view
+        self._fields: Optional[Tuple[str, str, str, str, str, Dict[str, str]]] = None
+
+    def _decode_header(self) -> Tuple[str, str, str, str, str, Dict[str, str]]:
+        if self._fields is None:
+            try:
+                strings = str(self._buffer[self._header_start:self._body_start], "utf-8").split(_SEPARATOR)
+            except UnicodeDecodeError as e:
+                raise EnvelopeDecodeError(f"Envelope header is not valid utf-8: {e}") from None
+            if len(strings) < _FIXED_FIELDS or (len(strings) - _FIXED_FIELDS) % 2:
+                raise EnvelopeDecodeError(f"Malformed envelope header ({len(strings)} fields)")
+            extra = strings[_FIXED_FIELDS:]
+            self._fields = (*strings[:_FIXED_FIELDS], dict(zip(extra[::2], extra[1::2])))
+        return self._fields
+
+    @property
+    def envelope_id(self) -> str:
+        return self._decode_header()[0]
+
+    @property
+    def source(self) -> str:
+        return self._decode_header()[1]
+
+    @property
+    def target(self) -> str:
+        return self._decode_header()[2]
+
+    @property
+    def intent(self) -> str:
+        return self._decode_header()[3]
+
+    @property
+    def content_type(self) -> str:
+        return self._decode_header()[4]
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return self._decode_header()[5]
+
+    @property
+    def body(self) -> memoryview:
+        return self._buffer[self._body_start:self._end]
+
+    @property
+    def frame_size(self) -> int:
+        """จำนวนไบต์ของ Frame นี้รวม Prefix (ใช้เลื่อน offset ไปยัง Frame ถัดไป)"""
+        return self._end - self._header_start + _PREFIX.size + _FIXED.size
+
+    def payload(self) -> Any:
+        if not self.flags & FLAG_JSON_BODY:
+            raise ValueError(f"Envelope body is not JSON: {self.content_type}")
+        return json.loads(str(self.body, "utf-8")) if self._end > self._body_start else None
+
+    def materialize(self) -> AkashicEnvelope:
+        """คัดลอกออกเป็น AkashicEnvelope ที่เป็นอิสระจาก Buffer เดิม"""
+        envelope_id, source, target, intent, content_type, headers = self._decode_header()
+        return AkashicEnvelope(intent, bytes(self.body), source=source, target=target, content_type=content_type,
+                               priority=self.priority, headers=dict(headers), envelope_id=envelope_id,
+                               created_at=self.created_at)
+
+    def __repr__(self) -> str:
+        return f"EnvelopeView(intent={self.intent!r}, body={self._end - self._body_start} bytes)"
+
+def iter_envelopes(buffer: BytesLike) -> Iterator[EnvelopeView]:
+    """ไล่ Frame ที่ต่อกันอยู่ใน Buffer เดียว (เช่น Batch ที่อ่านมาจาก Socket หรือไฟล์ mmap)"""
+    view = memoryview(buffer)
+    offset = 0
+    while offset < len(view):
+        envelope = EnvelopeView(view, offset)
+        yield envelope
+        offset += envelope.frame_size
@@ -1,2 +1,203 @@
 # AETHERIUM GENESIS MODULE: media_intent.py
-# Status: Awaiting Inspira Injection
+# MediaIntent: คำสั่งงานสื่อ (เสียง / ภาพ / วิดีโอ) ที่ส่งให้ ActuatorAgent
+# สื่อไหลผ่าน Pipeline เป็น Chunk ขนาดจำกัด (Async Iterator) แทนการโหลดทั้งก้อนเข้าหน่วยความจำ
+
+import asyncio
+import tempfile
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterable, AsyncIterator, BinaryIO, Callable, Dict, Iterator, List, Optional, Union
+
+BytesLike = Union[bytes, bytearray, memoryview]
+# Stage ของ Pipeline: รับ Stream ของ Chunk แล้วคืน Stream ใหม่ (เช่น async generator function)
+MediaStage = Callable[[AsyncIterator[bytes]], AsyncIterator[bytes]]
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+DEFAULT_QUEUE_SIZE = 4
+
+@dataclass
+class MediaIntent:
+    """
+    เจตนาของงานสื่อ 1 งาน: ข้อความ Intent (ใช้ตรวจ Governance) + ลำดับ Operation ที่ Actuator ต้องทำ
+    ตัวสื่อไม่ได้อยู่ในโครงสร้างนี้ แต่ถูกส่งแยกเป็น Stream ของ Chunk
+    """
+    intent: str
+    operations: List[Dict[str, Any]] = field(default_factory=list)  # เช่น [{"op": "gain", "factor": 0.5}]
+    media_type: str = "application/octet-stream"
+    output_type: Optional[str] = None  # ค่าเริ่มต้น = media_type
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    intent_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    created_at: float = field(default_factory=time.time)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MediaIntent":
+        known = {name for name in cls.__dataclass_fields__}
+        return cls(**{key: value for key, value in data.items() if key in known})
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "intent_id": self.intent_id,
+            "intent": self.intent,
+            "operations": list(self.operations),
+            "media_type": self.media_type,
+            "output_type": self.output_type or self.media_type,
+            "chunk_size": self.chunk_size,
+            "metadata": dict(self.metadata),
+            "created_at": self.created_at,
+        }
+
+# --- แหล่ง Chunk (Sources) ---
+def iter_chunks(data: BytesLike, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[memoryview]:
+    """แบ่ง Buffer ที่มีอยู่แล้วเป็น Chunk แบบ Zero-copy (memoryview ชี้เข้า Buffer เดิม)"""
+    view = memoryview(data)
+    for offset in range(0, len(view), chunk_size):
+        yield view[offset:offset + chunk_size]
+
+async def aiter_chunks(data: BytesLike, chunk_size: int = DEFAULT_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    for chunk in iter_chunks(data, chunk_size):
+        yield chunk
+        await asyncio.sleep(0)  # คืนสิทธิ์ให้ Event Loop ระหว่าง Chunk
+
+async def aiter_fileobj(handle: BinaryIO, chunk_size: int = DEFAULT_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """อ่านไฟล์ที่เปิดอยู่ทีละ Chunk ใน Thread Pool (ไม่บล็อก Event Loop และไม่โหลดทั้งไฟล์) แล้วปิดเมื่อจบ"""
+    try:
+        while True:
+            chunk = await asyncio.to_thread(handle.read, chunk_size)
+            if not chunk:
+                return
+            yield chunk
+    finally:
+        handle.close()
+
+async def aiter_file(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    handle = await asyncio.to_thread(open, path, "rb")
+    async for chunk in aiter_fileobj(handle, chunk_size):
+        yield chunk
+
+async def spool(source: AsyncIterable[BytesLike], max_bytes: Optional[int] = None) -> BinaryIO:
+    """
+    เขียน Stream ขาเข้าลงไฟล์ชั่วคราวบนดิสก์ (หน่วยความจำคงที่) แล้วคืนไฟล์ที่ seek กลับไปต้นไฟล์
+    ใช้กับ HTTP Upload: Client ส่วนใหญ่ส่ง Body จนจบก่อนเริ่มอ่าน Response
+    หากประมวลผลและตอบกลับระหว่างรับ Body ทั้งสองฝั่งจะรอกันเมื่อ Buffer ของ Socket เต็ม
+    """
+    handle = await asyncio.to_thread(tempfile.TemporaryFile)
+    written = 0
+    try:
+        async for chunk in source:
+            written += len(chunk)
+            if max_bytes is not None and written > max_bytes:
+                raise ValueError(f"Media upload exceeds {max_bytes} bytes")
+            await asyncio.to_thread(handle.write, chunk)
+        await asyncio.to_thread(handle.seek, 0)
+    except BaseException:
+        handle.close()
+        raise
+    return handle
+
+async def rechunk(source: AsyncIterable[BytesLike], chunk_size: int) -> AsyncIterator[bytes]:
+    """จัด Stream ใหม่ให้ทุก Chunk มีขนาด chunk_size พอดี (ยกเว้นก้อนสุดท้าย); บัฟเฟอร์ไม่เกิน 2 x chunk_size"""
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be >= 1, got {chunk_size}")
+    pending = bytearray()
+    async for chunk in source:
+        pending += chunk
+        while len(pending) >= chunk_size:
+            yield bytes(pending[:chunk_size])
+            del pending[:chunk_size]
+    if pending:
+        yield bytes(pending)
+
+# --- Back-pressure ---
+@dataclass
+class StreamStats:
+    """สถิติของ Channel 1 ช่วงใน Pipeline"""
+    chunks: int = 0
+    bytes: int = 0
+    max_depth: int = 0
+    stalls: int = 0           # จำนวนครั้งที่ฝั่งผลิตต้องรอเพราะคิวเต็ม (Back-pressure ทำงาน)
+    stalled_seconds: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "chunks": self.chunks,
+            "bytes": self.bytes,
+            "max_depth": self.max_depth,
+            "stalls": self.stalls,
+            "stalled_seconds": self.stalled_seconds,
+        }
+
+_END = object()
+
+async def bounded(source: AsyncIterable[bytes], maxsize: int = DEFAULT_QUEUE_SIZE,
+                  stats: Optional[StreamStats] = None) -> AsyncIterator[bytes]:
+    """
+    รัน source ใน Task แยกและส่งต่อผ่านคิวขนาด maxsize:
+    ฝั่งผลิตทำงานล่วงหน้าได้ไม่เกิน maxsize Chunk แล้วต้องรอ (Back-pressure) ฝั่งบริโภคที่ช้ากว่า
+    เมื่อผู้บริโภคหยุดกลางทาง (เช่น Client ตัดการเชื่อมต่อ) Task ฝั่งผลิตจะถูกยกเลิกด้วย
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize)
+    stats = stats if stats is not None else StreamStats()
+
+    async def pump():
+        try:
+            async for chunk in source:
+                if queue.full():
+                    stats.stalls += 1
+                    started = time.perf_counter()
+                    await queue.put(chunk)
+                    stats.stalled_seconds += time.perf_counter() - started
+                else:
+                    queue.put_nowait(chunk)
+                stats.chunks += 1
+                stats.bytes += len(chunk)
+                stats.max_depth = max(stats.max_depth, queue.qsize())
+        except Exception as e:
+            await queue.put(e)
+            return
+        await queue.put(_END)
+
+    producer = asyncio.create_task(pump())
+    try:
+        while True:
+            item = await queue.get()
+            if item is _END:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        if not producer.done():
+            producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
+
+class MediaPipeline:
+    """
+    ต่อ Stage หลายตัวเป็นสาย โดยคั่นทุก Stage ด้วย bounded() คิวขนาด queue_size
+    หน่วยความจำสูงสุด ~ (จำนวน Stage + 1) x queue_size x chunk_size ไม่ขึ้นกับขนาดสื่อทั้งหมด
+    """
+    def __init__(self, stages: List[MediaStage], queue_size: int = DEFAULT_QUEUE_SIZE):
+        self.stages = stages
+        self.queue_size = queue_size
+        self.stats: List[StreamStats] = []
+
+    def run(self, source: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+        self.stats = [StreamStats() for _ in range(len(self.stages) + 1)]
+        stream = bounded(source, self.queue_size, self.stats[0])
+        for stage, stats in zip(self.stages, self.stats[1:]):
+            stream = bounded(stage(stream), self.queue_size, stats)
+        return stream
+
+    def describe(self) -> List[Dict[str, Any]]:
+        names = ["source"] + [getattr(stage, "__name__", type(stage).__name__) for stage in self.stages]
+        return [{"stage": name, **stats.to_dict()} for name, stats in zip(names, self.stats)]
+
+async def collect(stream: AsyncIterable[bytes], limit: Optional[int] = None) -> bytes:
+    """รวม Stream เป็น bytes (สำหรับสื่อขนาดเล็กหรือการทดสอบ); limit ป้องกันการใช้หน่วยความจำเกินกำหนด"""
+    output = bytearray()
+    async for chunk in stream:
+        output += chunk
+        if limit is not None and len(output) > limit:
+            raise ValueError(f"Media stream exceeds {limit} bytes")
+    return bytes(output)
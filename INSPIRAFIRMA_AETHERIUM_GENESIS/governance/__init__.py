@@ -0,0 +1 @@
+"""Governance: GEP Enforcer, Intent Automaton, Verdict Cache และชั้น Semantic"""
@@ -1,16 +1,59 @@
+import hashlib
 import json
 import logging
 import os
-from typing import Tuple, Optional
+import threading
+import time
+from typing import Any, Dict, List, Tuple, Optional
+
+from .intent_automaton import IntentAutomaton
+from .verdict_cache import MISS, VerdictCache, normalize_intent
+from .semantic_screen import HashedNgramEmbedder, SemanticBatcher, SemanticIndex
 
 logger = logging.getLogger("GENESIS_GOV")
 
+class RulesetSnapshot:
+    """
+    Ruleset ที่คอมไพล์แล้ว 1 รุ่น (Immutable หลังสร้าง)
+    ผู้อ่านหยิบ Snapshot ไปใช้ทั้งก้อน จึงไม่มีวันเห็น rules / rule_index / automaton ต่างรุ่นปนกัน
+    """
+    __slots__ = ("version", "digest", "rules", "rule_index", "automaton", "semantic", "loaded_at")
+
+    def __init__(self, version: int, digest: str, rules: dict, automaton: IntentAutomaton,
+                 semantic: Optional[SemanticIndex] = None):
+        self.version = version
+        self.digest = digest
+        self.rules = rules
+        self.rule_index = {rule['id']: rule for rule in rules.get("prime_directives", [])}
+        self.automaton = automaton
+        self.semantic = semantic
+        self.loaded_at = time.time()
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "digest": self.digest,
+            "meta_version": self.rules.get("meta", {}).get("version"),
+            "loaded_at": self.loaded_at,
+            "rule_count": len(self.rule_index),
+            "semantic_exemplars": len(self.semantic) if self.semantic is not None else 0,
+            "semantic_threshold": self.semantic.threshold if self.semantic is not None else None,
+            "semantic_min_tokens": self.semantic.min_tokens if self.semantic is not None else None,
+        }
+
 class GovernanceEnforcer:
     """
     GEP Enforcer (Governance Enforcement Protocol)
     ผู้ตรวจสอบความถูกต้องตามกฎระเบียบ (Patimokkha/Inspirafirma Ruleset)
+    รองรับ Hot Reload: Watcher Thread เฝ้าไฟล์ Ruleset แล้วคอมไพล์ Snapshot ใหม่อยู่เบื้องหลัง
+    ก่อนสลับเข้าแทนที่ในครั้งเดียว (Copy-on-Write) ผู้อ่านจึงไม่ต้องใช้ Lock
+    ผลการสแกนถูกเก็บใน VerdictCache (LRU + TTL ต่อ Ruleset Version); cache_size=0 คือปิด Cache
+    ตรวจ 2 ชั้น: Keyword (Aho-Corasick) ก่อน แล้วจึงใช้ชั้น Semantic (Embedding + Cosine Similarity)
+    เฉพาะ Intent ที่ Keyword ไม่พบแต่ผ่านตัวกรองเบื้องต้นของ SemanticIndex
     """
-    def __init__(self, ruleset_path: str = "governance/inspirafirma_ruleset.json"):
+    def __init__(self, ruleset_path: str = "governance/inspirafirma_ruleset.json", metrics: Any = None,
+                 cache_size: int = 4096, cache_ttl: float = 300.0, semantic: bool = True,
+                 violation_counter: Any = None):
         # ปรับ Path ให้ยืดหยุ่น (รองรับการรันจาก Root หรือ Subfolder)
         base_path = os.path.dirname(os.path.abspath(__file__))
         # ถ้าหาไฟล์ใน path ที่ระบุไม่เจอ ให้ลองหาใน folder เดียวกับ script นี้
@@ -19,8 +62,72 @@ class GovernanceEnforcer:
         else:
              self.ruleset_path = ruleset_path
 
-        self.rules = self._load_rules()
-        self.violation_count = 0
+        # ตัวนับการละเมิด: ค่าเริ่มต้นอยู่ใน Process นี้ หรือรับตัวนับที่มี inc()/value มาแทน (เช่น Shared Memory ข้าม Worker)
+        self._violation_counter = violation_counter
+        self._violations_local = 0
+        self.cache = VerdictCache(cache_size, cache_ttl) if cache_size > 0 else None
+        self.embedder = HashedNgramEmbedder() if semantic else None
+        self.batcher = SemanticBatcher()
+        self._inspect_seconds = None
+        self._violations = None
+        self._cache_hits = self._cache_misses = None
+        self._semantic_checks = None
+        self._reload_lock = threading.Lock()  # กันการ Reload ซ้อนกัน (ผู้อ่านไม่ใช้ Lock นี้)
+        self._watcher: Optional[threading.Thread] = None
+        self._stop_watching = threading.Event()
+        self._file_stamp = self._stat_ruleset()
+        self.snapshot = self._build_snapshot(self._load_rules(), version=1)
+        if metrics is not None:
+            self.bind_metrics(metrics)
+
+    # --- มุมมองของ Snapshot ปัจจุบัน (คงชื่อเดิมไว้ให้โค้ดที่เรียกใช้อยู่) ---
+    @property
+    def rules(self) -> dict:
+        return self.snapshot.rules
+
+    @property
+    def rule_index(self) -> Dict[str, dict]:
+        return self.snapshot.rule_index
+
+    @property
+    def automaton(self) -> IntentAutomaton:
+        return self.snapshot.automaton
+
+    @property
+    def version(self) -> int:
+        return self.snapshot.version
+
+    @property
+    def violation_count(self) -> int:
+        if self._violation_counter is not None:
+            return self._violation_counter.value
+        return self._violations_local
+
+    def _count_violations(self, amount: int):
+        if self._violation_counter is not None:
+            self._violation_counter.inc(amount)
+        else:
+            self._violations_local += amount
+
+    def bind_metrics(self, metrics: Any):
+        """ลงทะเบียน Latency ของ inspect_intent และตัวนับการละเมิดแยกตาม Rule กับ MetricsRegistry"""
+        histogram = metrics.histogram("genesis_governance_inspect_seconds", "inspect_intent latency", ("mode",))
+        self._inspect_seconds = {"single": histogram.labels("single"), "batch": histogram.labels("batch")}
+        self._violations = metrics.counter("genesis_governance_violations_total", "Blocked intents per PARAJIKA rule", ("rule",))
+        metrics.gauge("genesis_governance_ruleset_version", "Active governance ruleset version").set_function(lambda: self.version)
+        if self.cache is not None:
+            lookups = metrics.counter("genesis_governance_cache_lookups_total", "Verdict cache lookups", ("result",))
+            self._cache_hits, self._cache_misses = lookups.labels("hit"), lookups.labels("miss")
+            metrics.gauge("genesis_governance_cache_entries", "Cached governance verdicts").set_function(lambda: len(self.cache))
+        if self.embedder is not None:
+            checks = metrics.counter("genesis_governance_semantic_checks_total", "Intents scored by the semantic tier", ("result",))
+            self._semantic_checks = {"blocked": checks.labels("blocked"), "passed": checks.labels("passed")}
+        self._register_rule_labels()
+
+    def _register_rule_labels(self):
+        if self._violations is not None:
+            for rule_id in self.rule_index:
+                self._violations.labels(rule_id)  # แสดงทุก Rule ตั้งแต่เริ่ม แม้ยังไม่มีการละเมิด
 
     def _load_rules(self):
         try:
@@ -32,18 +139,215 @@ class GovernanceEnforcer:
             logger.warning(f"⚠️ Ruleset file not found at {self.ruleset_path}! Using Default Fallback.")
             return {"prime_directives": []}
 
+    def _compile_rules(self, rules: dict) -> IntentAutomaton:
+        """คอมไพล์ keywords ของทุก Rule เป็น Automaton เดียว (ทำครั้งเดียวต่อรุ่นของ Ruleset)"""
+        directives = rules.get("prime_directives", [])
+        automaton = IntentAutomaton(
+            (rule['id'], [normalize_intent(keyword) for keyword in rule.get('keywords', [])]) for rule in directives
+        )
+        logger.info(f"🧭 Intent Automaton compiled: {automaton.keyword_count} keywords / {len(directives)} rules")
+        return automaton
+
+    def _compile_semantic(self, rules: dict) -> Optional[SemanticIndex]:
+        """คำนวณเมทริกซ์ Exemplar ของชั้น Semantic (exemplars + keywords ของแต่ละ Rule)"""
+        if self.embedder is None:
+            return None
+        directives = rules.get("prime_directives", [])
+        settings = rules.get("semantic", {})
+        threshold = float(settings.get("threshold", 0.55))
+        min_tokens = int(settings.get("min_tokens", 2))
+        index = SemanticIndex(
+            ((rule['id'], [normalize_intent(text) for text in rule.get('exemplars', []) + rule.get('keywords', [])])
+             for rule in directives),
+            self.embedder, threshold, min_tokens,
+        )
+        logger.info(f"🧠 Semantic index built: {len(index)} exemplars, {len(index.actions)} actions, "
+                    f"threshold={threshold}, min_tokens={min_tokens}")
+        return index
+
+    def _build_snapshot(self, rules: dict, version: int) -> RulesetSnapshot:
+        digest = hashlib.sha256(json.dumps(rules, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+        return RulesetSnapshot(version, digest, rules, self._compile_rules(rules), self._compile_semantic(rules))
+
+    # --- Hot Reload ---
+    def _stat_ruleset(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            st = os.stat(self.ruleset_path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def reload(self) -> bool:
+        """
+        โหลดและคอมไพล์ Ruleset ใหม่ แล้วสลับเข้าแทนที่ Snapshot เดิม
+        ไฟล์ที่อ่านไม่ได้/JSON เสีย จะถูกข้าม (คง Ruleset เดิมไว้) คืนค่า True เมื่อมีการสลับรุ่น
+        """
+        with self._reload_lock:
+            self._file_stamp = self._stat_ruleset()
+            try:
+                with open(self.ruleset_path, 'r', encoding='utf-8') as f:
+                    rules = json.load(f)
+                if not isinstance(rules.get("prime_directives", []), list):
+                    raise ValueError("prime_directives must be a list")
+                current = self.snapshot
+                candidate = self._build_snapshot(rules, current.version + 1)
+            except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+                logger.error("❌ Ruleset reload rejected, keeping version %d: %s", self.snapshot.version, e)
+                return False
+            if candidate.digest == current.digest:
+                return False
+            self.snapshot = candidate  # การกำหนดค่า Attribute เดียว = สลับแบบ Atomic
+            self._register_rule_labels()
+            logger.warning("📜 Governance ruleset reloaded: version %d (%s, %d rules)",
+                           candidate.version, candidate.digest, len(candidate.rule_index),
+                           extra={"ruleset_version": candidate.version})
+            return True
+
+    def start_watching(self, interval: float = 1.0):
+        """เริ่ม Watcher Thread ที่ตรวจ mtime/size/inode ของไฟล์ทุก interval วินาที"""
+        if self._watcher is not None:
+            return
+        self._stop_watching.clear()
+        self._watcher = threading.Thread(target=self._watch_loop, args=(interval,),
+                                         name="gep-ruleset-watcher", daemon=True)
+        self._watcher.start()
+        logger.info(f"👁️ Ruleset watcher started: {self.ruleset_path} (every {interval}s)")
+
+    def stop_watching(self):
+        if self._watcher is None:
+            return
+        self._stop_watching.set()
+        self._watcher.join()
+        self._watcher = None
+
+    def _watch_loop(self, interval: float):
+        while not self._stop_watching.wait(interval):
+            stamp = self._stat_ruleset()
+            if stamp is not None and stamp != self._file_stamp:
+                self.reload()
+
+    def match_rules(self, intent: str) -> List[str]:
+        """คืน Rule ID ทั้งหมดที่ Intent ละเมิด โดยสแกนเพียงรอบเดียว"""
+        return self.snapshot.automaton.match_all(normalize_intent(intent))
+
+    # --- การตรวจ (Keyword -> Cache -> Semantic) ---
+    def _cached(self, snapshot: RulesetSnapshot, normalized: str) -> Any:
+        if self.cache is None:
+            return MISS
+        verdict = self.cache.get(normalized, snapshot.version)
+        counter = self._cache_misses if verdict is MISS else self._cache_hits
+        if counter is not None:
+            counter.inc()
+        return verdict
+
+    def _remember(self, snapshot: RulesetSnapshot, normalized: str, verdict: Optional[str]):
+        if self.cache is not None:
+            self.cache.put(normalized, snapshot.version, verdict)
+
+    def _keyword_pass(self, snapshot: RulesetSnapshot, normalized: str) -> Tuple[Optional[str], bool]:
+        """ชั้น Keyword: คืน (rule_id, ต้องส่งต่อชั้น Semantic หรือไม่)"""
+        rule_id = snapshot.automaton.first_match(normalized)
+        inconclusive = rule_id is None and snapshot.semantic is not None and snapshot.semantic.is_candidate(normalized)
+        return rule_id, inconclusive
+
+    def _semantic_verdict(self, normalized: str, result: Optional[Tuple[str, float]]) -> Optional[str]:
+        if result is None:
+            if self._semantic_checks is not None:
+                self._semantic_checks["passed"].inc()
+            return None
+        rule_id, score = result
+        if self._semantic_checks is not None:
+            self._semantic_checks["blocked"].inc()
+        logger.warning("🧠 Semantic match %s (similarity %.2f): %r", rule_id, score, normalized,
+                       extra={"rule": rule_id, "similarity": score})
+        return rule_id
+
+    def _screen(self, snapshot: RulesetSnapshot, intent: str) -> Optional[str]:
+        """ตรวจ Intent กับ Snapshot ที่กำหนด (ชั้น Semantic รันเป็น Batch ขนาด 1)"""
+        normalized = normalize_intent(intent)
+        verdict = self._cached(snapshot, normalized)
+        if verdict is MISS:
+            verdict, inconclusive = self._keyword_pass(snapshot, normalized)
+            if inconclusive:
+                verdict = self._semantic_verdict(normalized, snapshot.semantic.score_batch([normalized])[0])
+            self._remember(snapshot, normalized, verdict)
+        return verdict
+
+    async def _screen_async(self, snapshot: RulesetSnapshot, intent: str) -> Optional[str]:
+        """เหมือน _screen แต่ชั้น Semantic ถูกรวม Batch กับ Request อื่นที่มาถึงพร้อมกันผ่าน SemanticBatcher"""
+        normalized = normalize_intent(intent)
+        verdict = self._cached(snapshot, normalized)
+        if verdict is MISS:
+            verdict, inconclusive = self._keyword_pass(snapshot, normalized)
+            if inconclusive:
+                verdict = self._semantic_verdict(normalized, await self.batcher.score(snapshot.semantic, normalized))
+            self._remember(snapshot, normalized, verdict)
+        return verdict
+
+    def _record(self, snapshot: RulesetSnapshot, rule_id: Optional[str], started: float) -> Tuple[bool, Optional[str]]:
+        if self._inspect_seconds is not None:
+            self._inspect_seconds["single"].observe(time.perf_counter() - started)
+        if rule_id is None:
+            return True, None
+
+        # นับการละเมิดทุกครั้ง ไม่ว่าผลจะมาจาก Cache หรือการสแกนจริง
+        logger.critical("🛑 BLOCKED by %s: %s", rule_id, snapshot.rule_index[rule_id]['name'], extra={"rule": rule_id})
+        self._count_violations(1)
+        if self._violations is not None:
+            self._violations.labels(rule_id).inc()
+        return False, rule_id
+
     def inspect_intent(self, intent: str) -> Tuple[bool, Optional[str]]:
         """
         ตรวจสอบเจตนา (Intent) ว่าขัดต่อ PARAJIKA หรือไม่
         """
-        directives = self.rules.get("prime_directives", [])
+        started = time.perf_counter()
+        snapshot = self.snapshot  # อ่าน Snapshot ครั้งเดียว ใช้รุ่นเดียวกันตลอดการตรวจ
+        return self._record(snapshot, self._screen(snapshot, intent), started)
+
+    async def inspect_intent_async(self, intent: str) -> Tuple[bool, Optional[str]]:
+        """inspect_intent สำหรับ Event Loop: ชั้น Semantic ของ Request ที่มาพร้อมกันถูกคำนวณเป็น Batch เดียว"""
+        started = time.perf_counter()
+        snapshot = self.snapshot
+        return self._record(snapshot, await self._screen_async(snapshot, intent), started)
+
+    def inspect_batch(self, intents: List[str]) -> List[Tuple[bool, Optional[str]]]:
+        """
+        ตรวจสอบ Intent ทั้ง Batch ในรอบเดียว: Intent ที่ซ้ำกัน (หลัง Normalize) จะถูกตรวจเพียงครั้งเดียว
+        Intent ที่ต้องใช้ชั้น Semantic ถูกให้คะแนนด้วยการคูณเมทริกซ์ครั้งเดียว
+        และสรุปผลการ Block เป็น Log บรรทัดเดียว (ผลลัพธ์เรียงตามลำดับ Input)
+        """
+        started = time.perf_counter()
+        snapshot = self.snapshot
+        normalized = {intent: normalize_intent(intent) for intent in set(intents)}
+        verdicts: Dict[str, Optional[str]] = {}
+        semantic_pending: List[str] = []
+        for text in set(normalized.values()):
+            verdict = self._cached(snapshot, text)
+            if verdict is MISS:
+                verdict, inconclusive = self._keyword_pass(snapshot, text)
+                if inconclusive:
+                    semantic_pending.append(text)
+                    continue
+                self._remember(snapshot, text, verdict)
+            verdicts[text] = verdict
+        if semantic_pending:
+            for text, result in zip(semantic_pending, snapshot.semantic.score_batch(semantic_pending)):
+                verdicts[text] = self._semantic_verdict(text, result)
+                self._remember(snapshot, text, verdicts[text])
 
-        for rule in directives:
-            forbidden_keywords = rule.get('keywords', [])
-            for keyword in forbidden_keywords:
-                if keyword in intent.lower():
-                    logger.critical(f"🛑 BLOCKED by {rule['id']}: {rule['name']}")
-                    self.violation_count += 1
-                    return False, rule['id']
+        results = [(verdicts[normalized[intent]] is None, verdicts[normalized[intent]]) for intent in intents]
+        if self._inspect_seconds is not None:
+            self._inspect_seconds["batch"].observe(time.perf_counter() - started)
 
-        return True, None
+        blocked = sum(1 for is_safe, _ in results if not is_safe)
+        if blocked:
+            self._count_violations(blocked)
+            if self._violations is not None:
+                for _, rule_id in results:
+                    if rule_id:
+                        self._violations.labels(rule_id).inc()
+            rule_ids = sorted({rule_id for _, rule_id in results if rule_id})
+            logger.critical("🛑 BLOCKED %d/%d intents in batch by %s", blocked, len(intents), ", ".join(rule_ids),
+                            extra={"rules": rule_ids})
+        return results
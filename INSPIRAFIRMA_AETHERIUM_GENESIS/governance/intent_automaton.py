@@ -0,0 +1,87 @@
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class IntentAutomaton:
+    """
+    Aho-Corasick Automaton สำหรับ GEP Enforcer
+    คอมไพล์ keywords ของทุก Rule ให้เป็นดัชนีเดียว แล้วสแกน Intent เพียงรอบเดียว (Linear Time)
+    ไม่ว่า Ruleset จะมีกี่หมื่น keyword ก็ตาม
+    """
+    __slots__ = ("rule_ids", "_goto", "_fail", "_output", "keyword_count")
+
+    def __init__(self, rules: Iterable[Tuple[str, Iterable[str]]]):
+        self.rule_ids: List[str] = []
+        # Node 0 คือ Root; แต่ละ Node เก็บ transition เป็น dict[char -> node]
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Output ของแต่ละ Node เป็น bitmask ของลำดับ Rule (bit i = rule_ids[i])
+        self._output: List[int] = [0]
+        self.keyword_count = 0
+
+        for rule_id, keywords in rules:
+            bit = 1 << len(self.rule_ids)
+            self.rule_ids.append(rule_id)
+            for keyword in keywords:
+                if keyword:
+                    self._insert(keyword.lower(), bit)
+
+        self._build_failure_links()
+
+    def _insert(self, keyword: str, bit: int):
+        goto, node = self._goto, 0
+        for ch in keyword:
+            nxt = goto[node].get(ch)
+            if nxt is None:
+                nxt = len(goto)
+                goto[node][ch] = nxt
+                goto.append({})
+                self._fail.append(0)
+                self._output.append(0)
+            node = nxt
+        self._output[node] |= bit
+        self.keyword_count += 1
+
+    def _build_failure_links(self):
+        goto, fail, output = self._goto, self._fail, self._output
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in goto[node].items():
+                queue.append(child)
+                state = fail[node]
+                while state and ch not in goto[state]:
+                    state = fail[state]
+                target = goto[state].get(ch, 0)
+                fail[child] = target if target != child else 0
+                # รวม Output ของ suffix เข้ามาล่วงหน้า เพื่อไม่ต้องไล่ fail chain ตอนสแกน
+                output[child] |= output[fail[child]]
+
+    def scan(self, intent: str) -> int:
+        """สแกน Intent หนึ่งรอบ คืนค่า bitmask ของ Rule ที่ถูกละเมิดทั้งหมด"""
+        goto, fail, output = self._goto, self._fail, self._output
+        node, matched = 0, 0
+        for ch in intent.lower():
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            matched |= output[node]
+        return matched
+
+    def match_all(self, intent: str) -> List[str]:
+        """คืนรายการ Rule ID ทั้งหมดที่ Intent ละเมิด (เรียงตามลำดับใน Ruleset)"""
+        matched = self.scan(intent)
+        rule_ids, hits, index = self.rule_ids, [], 0
+        while matched:
+            if matched & 1:
+                hits.append(rule_ids[index])
+            matched >>= 1
+            index += 1
+        return hits
+
+    def first_match(self, intent: str) -> Optional[str]:
+        """คืน Rule ID ที่มีลำดับความสำคัญสูงสุด (มาก่อนใน Ruleset) หรือ None หากปลอดภัย"""
+        matched = self.scan(intent)
+        if not matched:
+            return None
+        return self.rule_ids[(matched & -matched).bit_length() - 1]
@@ -0,0 +1,194 @@
+import asyncio
+import math
+import zlib
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# คำทั่วไปที่ไม่มีน้ำหนักทางความหมาย: ไม่นำไปคำนวณ Embedding และไม่ใช้ในตัวกรองเบื้องต้น
+STOPWORDS = frozenset({
+    "a", "an", "and", "all", "any", "are", "as", "at", "be", "by", "every", "for", "from", "in",
+    "into", "is", "it", "its", "me", "my", "of", "on", "or", "our", "out", "please", "so", "some",
+    "that", "the", "then", "this", "to", "up", "us", "we", "with", "you", "your",
+})
+
+_SUFFIXES = ("ing", "ed", "es", "s", "e")
+
+def stem(word: str) -> str:
+    """Stemmer อย่างง่ายสำหรับคำกริยา: wipe/wiping/wiped -> wip, drop/dropping -> drop (ไม่ทำให้ publish ปนกับ public)"""
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[:-len(suffix)]
+            if suffix in ("ing", "ed") and word[-1] == word[-2] and word[-1] not in "aeiouls":
+                word = word[:-1]  # พยัญชนะซ้ำ: dropping -> dropp -> drop
+            break
+    return word
+
+def informative_words(text: str) -> List[str]:
+    return [word for word in text.split() if word not in STOPWORDS]
+
+class HashedNgramEmbedder:
+    """
+    Text Embedding แบบคำนวณในเครื่อง: Hashing Trick ของ Character n-gram (ภายในคำ) + ตัวคำ
+    ลงเวกเตอร์ขนาด dim แล้ว Normalize (L2) เพื่อให้ Dot Product = Cosine Similarity
+    - ตัด Stopword ออก และให้ทุกคำมีน้ำหนักเท่ากันก่อนคูณ weights (คำยาวไม่ครอบงำคำสั้น)
+    - ใช้ crc32 แทน hash() เพื่อให้ผลเหมือนกันทุก Process (ไม่ขึ้นกับ PYTHONHASHSEED)
+    """
+    def __init__(self, dim: int = 2048, char_ngrams: Tuple[int, int] = (3, 5), word_weight: float = 1.0):
+        self.dim = dim
+        self.char_ngrams = char_ngrams
+        self.word_weight = word_weight
+        self._word_features = lru_cache(maxsize=65536)(self._compute_word_features)
+
+    def _compute_word_features(self, word: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(ตำแหน่ง, ค่า) ของคำหนึ่งคำ: n-gram รวมกันมีความยาวหนึ่งหน่วย บวกตัวคำอีก word_weight"""
+        low, high = self.char_ngrams
+        padded = f"<{word}>"
+        grams = [padded[i:i + n] for n in range(low, high + 1) for i in range(len(padded) - n + 1)] or [padded]
+        hashes = [zlib.crc32(gram.encode("utf-8")) for gram in grams]
+        values = [1.0 / math.sqrt(len(grams))] * len(grams)
+        hashes.append(zlib.crc32(("w:" + word).encode("utf-8")))
+        values.append(self.word_weight)
+        hashes = np.asarray(hashes, dtype=np.uint32)
+        signs = np.where(hashes & 0x80000000, 1.0, -1.0).astype(np.float32)
+        return (hashes % self.dim).astype(np.intp), signs * np.asarray(values, dtype=np.float32)
+
+    def embed_batch(self, texts: Sequence[str], weights: Optional[Dict[str, float]] = None,
+                    default_weight: float = 1.0) -> np.ndarray:
+        """
+        คืนเมทริกซ์ (len(texts), dim) แบบ float32 ที่แต่ละแถวมีความยาวหนึ่งหน่วย (แถวว่างเป็นศูนย์)
+        weights คือน้ำหนักต่อคำ (เช่น IDF); คำที่ไม่อยู่ใน weights ใช้ default_weight
+        """
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        weights = weights or {}
+        for row, text in enumerate(texts):
+            vector = matrix[row]
+            for word in text.split():
+                if word in STOPWORDS:
+                    continue
+                indexes, values = self._word_features(word)
+                np.add.at(vector, indexes, values * weights.get(word, default_weight))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+class SemanticIndex:
+    """
+    ดัชนี Semantic ของ Ruleset 1 รุ่น: เมทริกซ์ Exemplar (m, dim) ที่คำนวณไว้ล่วงหน้า และ Rule ของแต่ละแถว
+    Exemplar มาจาก field "exemplars" ของแต่ละ Rule รวมกับ "keywords" (ข้อความต้อง Normalize มาแล้ว)
+    คำที่พบใน Exemplar หลายตัว (เช่น "database") ได้น้ำหนัก IDF ต่ำกว่าคำกริยาที่เจาะจง (เช่น "wipe")
+    ชั้นนี้ Block ได้เฉพาะ Intent ที่มีคำกริยาการกระทำ (คำแรกของ Exemplar เช่น wipe / leak) และมีคำที่มีความหมาย
+    อย่างน้อย min_tokens คำ: คำนามล้วนหรือคำเดี่ยว (เช่น "user data", "delete") ใกล้ Exemplar เกิน threshold ได้ง่าย
+    """
+    def __init__(self, rules: Iterable[Tuple[str, Iterable[str]]], embedder: HashedNgramEmbedder,
+                 threshold: float = 0.55, min_tokens: int = 2):
+        self.embedder = embedder
+        self.threshold = threshold
+        self.min_tokens = min_tokens
+        self.rule_ids: List[str] = []
+        exemplars: List[str] = []
+        owners: List[int] = []
+        for rule_id, texts in rules:
+            self.rule_ids.append(rule_id)
+            for text in texts:
+                if text:
+                    exemplars.append(text)
+                    owners.append(len(self.rule_ids) - 1)
+        self.exemplars = exemplars
+        self.owners = np.asarray(owners, dtype=np.intp)
+
+        document_frequency: Dict[str, int] = {}
+        actions = set()
+        for text in exemplars:
+            words = informative_words(text)
+            if words:
+                actions.add(stem(words[0]))  # Exemplar / Keyword ขึ้นต้นด้วยคำกริยาเสมอ
+            for word in set(words):
+                document_frequency[word] = document_frequency.get(word, 0) + 1
+        total = len(exemplars)
+        self.weights = {word: math.log((total + 1) / (count + 1)) + 1.0 for word, count in document_frequency.items()}
+        self.default_weight = math.log(total + 1) + 1.0  # คำที่ไม่เคยเห็นถือว่าหายากที่สุด
+        self.actions = frozenset(actions)
+        self.matrix = self._embed(exemplars)  # (m, dim) ทำครั้งเดียวต่อรุ่นของ Ruleset
+
+    def __len__(self) -> int:
+        return len(self.exemplars)
+
+    def _embed(self, texts: Sequence[str]) -> np.ndarray:
+        return self.embedder.embed_batch(texts, self.weights, self.default_weight)
+
+    def is_candidate(self, text: str) -> bool:
+        """ตัวกรองราคาถูก: ส่งต่อให้ชั้น Semantic เฉพาะ Intent ที่มีคำกริยาการกระทำ และมีคำที่มีความหมายครบ min_tokens"""
+        words = informative_words(text)
+        return len(words) >= self.min_tokens and any(stem(word) in self.actions for word in words)
+
+    def score_batch(self, texts: Sequence[str]) -> List[Optional[Tuple[str, float]]]:
+        """
+        ให้คะแนน Intent ทั้งชุดด้วยการคูณเมทริกซ์ครั้งเดียว
+        คืน (rule_id, similarity) ของ Exemplar ที่ใกล้ที่สุดเมื่อเกิน threshold มิฉะนั้น None
+        """
+        if not texts or not self.exemplars:
+            return [None] * len(texts)
+        similarity = self._embed(texts) @ self.matrix.T  # (n, m)
+        best = similarity.argmax(axis=1)
+        scores = similarity[np.arange(len(texts)), best]
+        return [
+            (self.rule_ids[self.owners[column]], float(score)) if score >= self.threshold else None
+            for column, score in zip(best, scores)
+        ]
+
+class SemanticBatcher:
+    """
+    รวมคำขอ Semantic จากหลาย Request ที่มาถึงในรอบเดียวกันของ Event Loop ให้เป็น Batch เดียว
+    (max_wait=0 คือ Flush ท้ายรอบ Event Loop ปัจจุบัน, > 0 คือรอสะสมเพิ่มได้ไม่เกินเวลานั้น)
+    """
+    def __init__(self, max_batch: int = 256, max_wait: float = 0.0):
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.batches = 0
+        self.items = 0
+        self._pending: Dict[int, Tuple[SemanticIndex, List[str], List[asyncio.Future]]] = {}
+        self._flush_handle: Optional[asyncio.Handle] = None
+
+    async def score(self, index: SemanticIndex, text: str) -> Optional[Tuple[str, float]]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        # แยก Batch ตาม Index (Ruleset คนละรุ่นระหว่าง Hot Reload ห้ามปนกัน)
+        _, texts, futures = self._pending.setdefault(id(index), (index, [], []))
+        texts.append(text)
+        futures.append(future)
+        if len(texts) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            if self.max_wait > 0:
+                self._flush_handle = loop.call_later(self.max_wait, self._flush)
+            else:
+                self._flush_handle = loop.call_soon(self._flush)
+        return await future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending, self._pending = self._pending, {}
+        for index, texts, futures in pending.values():
+            try:
+                results = index.score_batch(texts)
+            except Exception as e:
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.batches += 1
+            self.items += len(texts)
+            for future, result in zip(futures, results):
+                if not future.done():
+                    future.set_result(result)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch": self.items / self.batches if self.batches else 0.0,
+        }
@@ -0,0 +1,76 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+# ค่าที่คืนเมื่อไม่พบใน Cache (แยกจาก None ซึ่งหมายถึง "ปลอดภัย")
+MISS = object()
+
+def normalize_intent(intent: str) -> str:
+    """รูปแบบมาตรฐานของ Intent ที่ใช้ทั้งเป็น Key ของ Cache และเป็นข้อความที่ถูกสแกน (ตัวพิมพ์เล็ก + ช่องว่างเดียว)"""
+    return " ".join(intent.lower().split())
+
+class VerdictCache:
+    """
+    LRU + TTL Cache ของผลการตรวจ Governance (Intent ที่ Normalize แล้ว -> Rule ID หรือ None)
+    ผูกกับ Ruleset Version: เมื่อ Version เปลี่ยน ผลเดิมทั้งหมดจะถูกล้างก่อนใช้งานครั้งถัดไป
+    """
+    def __init__(self, maxsize: int = 4096, ttl: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.version: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _sync_version(self, version: int):
+        if version != self.version:
+            if self.version is not None:
+                self.invalidations += 1
+            self._entries.clear()
+            self.version = version
+
+    def get(self, intent: str, version: int) -> Any:
+        """คืน Verdict ที่เก็บไว้ หรือ MISS หากไม่มี/หมดอายุ/ต่าง Version"""
+        with self._lock:
+            self._sync_version(version)
+            entry = self._entries.get(intent)
+            if entry is not None:
+                verdict, expires_at = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(intent)
+                    self.hits += 1
+                    return verdict
+                del self._entries[intent]
+            self.misses += 1
+            return MISS
+
+    def put(self, intent: str, version: int, verdict: Optional[str]):
+        with self._lock:
+            self._sync_version(version)
+            self._entries[intent] = (verdict, time.monotonic() + self.ttl)
+            self._entries.move_to_end(intent)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "version": self.version,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "invalidations": self.invalidations,
+        }
@@ -0,0 +1 @@
+"""Interface: API Gateway (create_app) และ Adapter ภายนอก"""
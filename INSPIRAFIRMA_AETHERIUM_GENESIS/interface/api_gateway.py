@@ -1,104 +1,593 @@
-import time
+import asyncio
+import json
 import logging
-import random
-import sys
 import os
-from typing import Dict, Any, List
+from dataclasses import dataclass, field
+from typing import Dict, Any, AsyncIterator, List, Optional, Set
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
-
-# --- PATH SETUP (เพื่อให้ Import module ข้าม folder ได้) ---
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from starlette.background import BackgroundTask
 
 # --- IMPORT MODULES ---
-from core.mind_logic import RobustAsyncManager, RAMConfig
-from governance.gep_enforcer import GovernanceEnforcer
-from agents.taxonomy import ZoIdentity
+from .. import __version__
+from ..core.mind_logic import RobustAsyncManager, RAMConfig, TaskTimeoutError
+from ..core.job_queue import JobQueue, QueueFullError, TERMINAL_STATUSES
+from ..core.agent_registry import AgentRecord, AgentRegistry
+from ..core.registry_journal import RegistryJournal
+from ..core.shared_state import StateReplica
+from ..core.kcp_storage import open_kcp
+from ..core.agent_runtime import AgentRuntime
+from ..core.telemetry import MetricsRegistry
+from ..core.log_pipeline import configure_logging, installed_handler
+from ..governance.gep_enforcer import GovernanceEnforcer
+from ..data_structures.akashic_envelope import FLAG_JSON_BODY, EnvelopeDecodeError, EnvelopeView
+from ..agents.taxonomy import ZoIdentity
+from ..agents.pangenes_rsi import DEFAULT_KNOWLEDGE_BASE_PATH, PangenesAgent
+from ..agents.resonance_shell import ActuatorAgent
+from ..agents.validator_sage import ValidatorAgent
+from ..data_structures.media_intent import MediaIntent, aiter_fileobj, spool
+from ..protocols.dtp_digisonic import (
+    CLOSE_UNSUPPORTED_DATA, DEFAULT_CREDITS, DTP_SUBPROTOCOL, DTPError, DTPProtocolError, DTPSession,
+)
+from ..protocols.sopan_ritual import SopanPipeline, SopanRejected, SopanStage
+from ..protocols.mcp_orchestrator import OVERFLOW_DROP_NEW, AetherBus
 
-# Setup Logger
-logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 logger = logging.getLogger("GENESIS_NEXUS")
 
-# Global Instances
-ram_engine = RobustAsyncManager(RAMConfig())
-enforcer = GovernanceEnforcer()
+PACKAGE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 
-# In-Memory Agent Registry
-active_agents: Dict[str, Dict] = {}
+def _env_float(name: str, default: float) -> float:
+    return float(os.getenv(name, str(default)))
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    logger.info("🔮 GENESIS_NEXUS Awakening... (API Gateway Initialized)")
-    yield
-    logger.info("💤 GENESIS_NEXUS Hibernating...")
+@dataclass
+class GatewayConfig:
+    """
+    ค่าตั้งของ Gateway 1 Instance (ค่าเริ่มต้นอ่านจาก Environment ตอนสร้าง ไม่ใช่ตอน Import)
+      GENESIS_REGISTRY_DIR, GENESIS_KCP_PATH, GENESIS_PANGENES_INTERVAL, GENESIS_RULESET_POLL, GENESIS_INSIGHT_PATH
+    """
+    # In-Memory Agent Registry: ความคงทนผ่าน WAL + Snapshot ในโฟลเดอร์นี้
+    registry_dir: str = field(default_factory=lambda: os.getenv(
+        "GENESIS_REGISTRY_DIR", os.path.join(PACKAGE_DIR, "wisdom_archive", "agent_registry")))
+    # Knowledge Core (KCP): ไฟล์ .json โหลดเข้าหน่วยความจำ, ไฟล์ .kcp เปิดผ่าน mmap
+    kcp_path: str = field(default_factory=lambda: os.getenv(
+        "GENESIS_KCP_PATH", os.path.join(os.path.dirname(PACKAGE_DIR), "knowledge_structure.json")))
+    # Agent Runtime: รอบการสแกนของ Pangenes (วินาที)
+    pangenes_interval: float = field(default_factory=lambda: _env_float("GENESIS_PANGENES_INTERVAL", 60))
+    # Insight Log ของ Pangenes (JSONL + Sidecar .idx); แบบหลาย Worker แต่ละ Worker เขียนไฟล์ของตัวเอง (ดู insight_path())
+    insight_path: str = field(default_factory=lambda: os.getenv("GENESIS_INSIGHT_PATH", DEFAULT_KNOWLEDGE_BASE_PATH))
+    # Governance Hot Reload: ตรวจไฟล์ Ruleset ทุก N วินาที (0 = ปิด)
+    ruleset_poll_interval: float = field(default_factory=lambda: _env_float("GENESIS_RULESET_POLL", 2))
+    # ขนาด Batch สูงสุดต่อ 1 Request
+    max_batch_size: int = 1000
+    # Media Streaming: จำนวน Chunk ที่ค้างได้ต่อช่วงของ Pipeline ก่อน Back-pressure ทำงาน
+    media_queue_size: int = 4
+    # ขนาดสูงสุดของสื่อที่ Upload ต่อ 1 Request (พักไว้บนดิสก์ ไม่ใช่ในหน่วยความจำ)
+    media_max_bytes: int = 2 * 1024 * 1024 * 1024
+    # DTP over WebSocket: จำนวนคำขอที่ค้างได้ต่อ Connection (Credit เริ่มต้นที่ให้ Client)
+    dtp_credits: int = DEFAULT_CREDITS
+    # Sopan Pipeline ของการส่งงาน: ปรับแต่ละ Stage ตามชื่อ เช่น {"execute": {"workers": 128}}
+    sopan_stages: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    ram: RAMConfig = field(default_factory=RAMConfig)
 
-app = FastAPI(title="INSPIRAFIRMA GENESIS API", version="1.1.0-AGENTS", lifespan=lifespan)
+class GenesisServices:
+    """
+    Instance ของทุก Component ที่ Gateway 1 ตัวใช้ร่วมกัน (เดิมเป็น Global ระดับ Module)
+    สร้างโดย create_app() และเก็บไว้ที่ app.state.services
+    เมื่อรันแบบหลาย Worker (replica != None): Registry, ตัวนับการละเมิด และสถานะ Job
+    ถูกแชร์ผ่าน StateHub / Shared Memory แทนการเก็บไว้ใน Process นี้เพียงลำพัง
+    """
+    def __init__(self, config: GatewayConfig, log_handler: Any = None, replica: Optional[StateReplica] = None):
+        self.config = config
+        self.replica = replica
+        self.metrics = MetricsRegistry()
+        self.ram_engine = RobustAsyncManager(config.ram, metrics=self.metrics)
+        violation_counter = replica.counters.counter("violations") if replica and replica.counters else None
+        self.enforcer = GovernanceEnforcer(metrics=self.metrics, violation_counter=violation_counter)
+        # งานใน Job Queue ผ่านการตรวจ (validate / audit) ตอนรับงานแล้ว จึงเริ่มที่ Stage execute
+        self.job_queue = JobQueue(self.ram_engine, on_change=replica.publish_job if replica else None,
+                                  execute=lambda job: self.sopan.submit({"intent": job.intent, "payload": job.payload},
+                                                                        first="execute"))
+        if replica is None:
+            self.agent_registry = AgentRegistry()
+            self.registry_journal: Optional[RegistryJournal] = RegistryJournal(self.agent_registry, config.registry_dir)
+        else:
+            self.agent_registry = replica.registry  # อ่านจาก Replica ใน Process, เขียนผ่าน Hub
+            self.registry_journal = None  # WAL มีชุดเดียวที่ StateHub
+        self.agent_runtime = AgentRuntime()
+        self.kcp_storage = open_kcp(config.kcp_path)
+        self.actuator = ActuatorAgent("Media", queue_size=config.media_queue_size)
+        self.dtp_sessions: Set[DTPSession] = set()
+        self.validator = ValidatorAgent()
+        self.pangenes: Optional[PangenesAgent] = None
+        self.bus = AetherBus("gateway")  # ช่องทางเหตุการณ์ระหว่าง Component กับ Agent ใน Process นี้
+        self.sopan = SopanPipeline(self._sopan_stages(), config.sopan_stages, metrics=self.metrics)
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+        self.metrics.gauge("genesis_job_queue_depth", "Jobs waiting in the in-process job queue").set_function(lambda: self.job_queue.depth)
+        self.metrics.gauge("genesis_job_queue_capacity", "Maximum pending jobs before 429").set(self.job_queue.maxsize)
+        self.metrics.gauge("genesis_dtp_sessions", "Open DTP WebSocket connections").set_function(lambda: len(self.dtp_sessions))
+        self.metrics.gauge("genesis_dtp_in_flight", "DTP requests executing across all connections").set_function(
+            lambda: sum(len(session.in_flight) for session in self.dtp_sessions))
+        if log_handler is not None:
+            self.metrics.gauge("genesis_log_dropped", "Log records dropped because the log queue was full").set_function(lambda: log_handler.dropped)
+
+    def _sopan_stages(self) -> List[SopanStage]:
+        """
+        ขั้นตอนของการส่งงาน 1 รายการ ({"intent", "payload"}):
+        validate (Governance, Micro-batch) -> audit (ValidatorAgent) -> execute (R.A.M.)
+        งานที่ล้มเหลวที่ execute ถูกประกาศบน AetherBus (task.failed.execute) ผ่าน on_error
+        ให้ Pangenes บันทึกเป็น Insight (ความล้มเหลวยังนับเป็นของ execute)
+        """
+        def validate(items: List[Dict[str, Any]]) -> List[Any]:
+            verdicts = self.enforcer.inspect_batch([item["intent"] for item in items])
+            return [item if is_safe else SopanRejected(403, f"PARAJIKA VIOLATION: {violation}")
+                    for item, (is_safe, violation) in zip(items, verdicts)]
+
+        def audit(item: Dict[str, Any]) -> Dict[str, Any]:
+            is_valid, reason = self.validator.audit(item)
+            if not is_valid:
+                raise SopanRejected(400, f"AUDIT FAILED: {reason}")
+            return item
+
+        async def execute(item: Dict[str, Any]) -> Any:
+            return await self.ram_engine.execute_task(item["intent"], None)
+
+        async def announce_failure(item: Dict[str, Any], error: Exception):
+            await self.bus.publish("task.failed.execute", {
+                "source": "sopan",
+                "error_type": type(error).__name__,
+                "task_name": item["intent"],
+            }, sender="sopan")
+
+        return [
+            SopanStage("validate", validate, workers=1, batch_size=64),
+            SopanStage("audit", audit, workers=1),
+            SopanStage("execute", execute, workers=64, queue_size=256, on_error=announce_failure),
+        ]
+
+    async def start(self):
+        if self.replica is not None:
+            await self.replica.start()
+        else:
+            self.registry_journal.recover()
+            self.registry_journal.start()
+        self.ram_engine.start_pools()
+        self.job_queue.start()
+        self.sopan.start()
+        if self.config.ruleset_poll_interval > 0:
+            self.enforcer.start_watching(self.config.ruleset_poll_interval)
+        if not self.agent_runtime:
+            self.pangenes = PangenesAgent(knowledge_base_path=self.insight_path())
+            self.agent_runtime.add(self.pangenes, interval=self.config.pangenes_interval)
+            # คิวเต็มทิ้งรายงานใหม่: Worker ของ execute ไม่ต้องรอการบันทึก Insight
+            self.bus.subscribe_agent("task.failed.#", self.pangenes.trigger_self_correction,
+                                     maxsize=1024, overflow=OVERFLOW_DROP_NEW)
+        await self.bus.start()
+        await self.agent_runtime.start()
+
+    def insight_path(self) -> str:
+        """
+        ไฟล์ Insight ของ Process นี้: Worker แต่ละตัวใช้ <ชื่อ>.w<worker_id>.jsonl
+        เพราะ InsightSink (Rotation) และ InsightIndex (Sidecar) ถือว่าตัวเองเป็นผู้เขียนไฟล์เพียงรายเดียว
+        (Worker ที่ถูก Respawn ได้ worker_id เดิม จึงเขียนต่อไฟล์เดิม)
+        """
+        if self.replica is None:
+            return self.config.insight_path
+        root, ext = os.path.splitext(self.config.insight_path)
+        return f"{root}.w{self.replica.worker_id}{ext}"
+
+    async def stop(self):
+        await self.agent_runtime.stop()
+        self.enforcer.stop_watching()
+        await self.job_queue.stop()  # ก่อน Pipeline: งานที่กำลังรันจบเป็น CANCELLED (ยกเลิกต่อถึง R.A.M.)
+        await self.sopan.stop()
+        await self.bus.stop()  # ส่งรายงานที่ค้างในคิวให้ Pangenes ก่อนปิด
+        self.ram_engine.shutdown_pools()
+        if self.replica is not None:
+            await self.replica.stop()
+        else:
+            await self.registry_journal.stop()
+
+    async def register_agent(self, agent_id: str, name: str, role: str, key: str,
+                             capabilities: List[str]) -> AgentRecord:
+        if self.replica is not None:
+            return await self.replica.register(agent_id, name, role, key, capabilities)
+        record = self.agent_registry.register(agent_id, name=name, role=role, key=key, capabilities=capabilities)
+        # ตอบกลับหลังจาก WAL ถูก fsync แล้วเท่านั้น (Group Commit รวมหลาย Request ต่อ fsync)
+        await self.registry_journal.log_register(record)
+        return record
+
+    def job_snapshot(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """สถานะของ Job จาก Queue ใน Process นี้ หรือจาก Worker อื่น (ผ่าน Replica)"""
+        job = self.job_queue.get(job_id)
+        if job is not None:
+            return job.snapshot()
+        return self.replica.get_job(job_id) if self.replica is not None else None
+
+    def watch_job(self, job_id: str) -> AsyncIterator[Dict[str, Any]]:
+        job = self.job_queue.get(job_id)
+        if job is not None or self.replica is None:
+            return self.job_queue.watch(job)
+        return self.replica.watch_job(job_id, [status.value for status in TERMINAL_STATUSES])
 
 # --- Pydantic Models ---
 class GenesisCommand(BaseModel):
     intent: str
     payload: Dict[str, Any] = {}
 
+class SystemStatus(BaseModel):
+    status: str
+    version: str
+    governance_active: bool
+    active_tasks: int
+    waiting_tasks: int
+    queued_jobs: int
+    registered_agents: int
+    parajika_violations: int
+
+class JobSubmission(GenesisCommand):
+    priority: int = 0  # ค่าน้อย = ถูกหยิบไปทำก่อน
+
 class AgentRegistration(BaseModel):
     name: str
     role: str
     capabilities: List[str] = []
 
-# --- System Endpoints ---
-@app.get("/")
-async def root():
-    return {"system": "AETHERIUM GENESIS Gateway", "status": "ONLINE"}
-
-@app.post("/submit/task")
-async def submit_task(cmd: GenesisCommand):
-    # 1. Governance Check
-    is_safe, violation = enforcer.inspect_intent(cmd.intent)
-    if not is_safe:
-        raise HTTPException(status_code=403, detail=f"PARAJIKA VIOLATION: {violation}")
-
-    # 2. Execution
-    try:
-        result = await ram_engine.execute_task(cmd.intent, None)
-        return {"status": "SUCCESS", "result": result}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-# --- Agent Endpoints (New!) ---
-@app.post("/agents/register")
-async def register_agent(agent: AgentRegistration):
-    """ลงทะเบียน Agent เข้าสู่ระบบ"""
-    new_identity = ZoIdentity(agent.name, agent.role)
-
-    agent_data = {
-        "id": new_identity.id,
-        "name": agent.name,
-        "role": agent.role,
-        "key": new_identity.aether_key,
-        "capabilities": agent.capabilities,
-        "status": "IDLE",
-        "registered_at": time.time()
-    }
-
-    active_agents[new_identity.id] = agent_data
-    logger.info(f"🤖 Agent Registered: {agent.name} ({agent.role}) ID:{new_identity.id[:8]}")
-
-    return {"status": "REGISTERED", "agent_id": new_identity.id, "token": new_identity.aether_key}
-
-@app.get("/agents/list")
-async def list_agents():
-    """ดูรายชื่อ Agent ที่ Active อยู่ทั้งหมด"""
-    return {
-        "count": len(active_agents),
-        "agents": list(active_agents.values())
-    }
+
+def _kcp_or_404(record: Optional[Dict[str, Any]], kind: str, key: str) -> Dict[str, Any]:
+    if record is None:
+        raise HTTPException(status_code=404, detail=f"{kind} not found: {key}")
+    return record
+
+def create_app(config: Optional[GatewayConfig] = None, replica: Optional[StateReplica] = None) -> FastAPI:
+    """
+    App Factory: สร้าง Component ทั้งหมดและ FastAPI App ใหม่ 1 ชุด
+    (การ Import Module นี้เพียงอย่างเดียวจะไม่สร้าง App หรือ Instance ใดๆ)
+    replica: ส่งมาเมื่อรันเป็น Worker ของ interface.prefork (แชร์ State กับ Worker อื่น)
+    """
+    config = config or GatewayConfig()
+    # ไม่แตะ Root Logger: Entry Point เป็นผู้ติดตั้ง Pipeline (configure_logging) หากต้องการ
+    # ที่นี่เพียงผูก Gauge ของ Record ที่ถูกทิ้ง เมื่อ Pipeline ถูกติดตั้งไว้แล้ว
+    services = GenesisServices(config, installed_handler(), replica)
+    ram_engine = services.ram_engine
+    enforcer = services.enforcer
+    job_queue = services.job_queue
+    agent_registry = services.agent_registry
+    agent_runtime = services.agent_runtime
+    kcp_storage = services.kcp_storage
+    actuator = services.actuator
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        logger.info("🔮 GENESIS_NEXUS Awakening... (API Gateway Initialized)")
+        await services.start()
+        yield
+        await services.stop()
+        logger.info("💤 GENESIS_NEXUS Hibernating...")
+
+    app = FastAPI(title="INSPIRAFIRMA GENESIS API", version=__version__, lifespan=lifespan)
+    app.state.services = services
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # --- System Endpoints ---
+    @app.get("/")
+    async def root():
+        return {"system": "AETHERIUM GENESIS Gateway", "status": "ONLINE"}
+
+    @app.get("/system/status", response_model=SystemStatus)
+    async def get_system_status():
+        """สถานะจริงของระบบ สำหรับ React Dashboard"""
+        return SystemStatus(
+            status="ONLINE",
+            version=app.version,
+            governance_active=True,
+            active_tasks=ram_engine.active_tasks,
+            waiting_tasks=ram_engine.waiting_tasks,
+            queued_jobs=job_queue.depth,
+            registered_agents=len(agent_registry),
+            parajika_violations=enforcer.violation_count,
+        )
+
+    @app.get("/metrics", response_class=PlainTextResponse)
+    async def get_metrics():
+        """Metrics ในรูปแบบ Prometheus Text Exposition"""
+        return PlainTextResponse(services.metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+    # --- Governance Endpoints ---
+    @app.get("/governance/rules")
+    async def get_governance_rules():
+        """Ruleset ที่ใช้งานอยู่พร้อมเลขรุ่น (เปลี่ยนทุกครั้งที่ Hot Reload สำเร็จ)"""
+        snapshot = enforcer.snapshot
+        cache = enforcer.cache.stats() if enforcer.cache is not None else None
+        return {"ruleset": snapshot.describe(), "cache": cache, "semantic": enforcer.batcher.stats(), "rules": snapshot.rules}
+
+    @app.post("/governance/reload")
+    async def reload_governance_rules():
+        """สั่ง Reload Ruleset ทันที (คอมไพล์ใน Thread แยก ไม่บล็อก Event Loop)"""
+        swapped = await asyncio.to_thread(enforcer.reload)
+        return {"reloaded": swapped, "ruleset": enforcer.snapshot.describe()}
+
+    async def _run_intent(intent: str, payload: Optional[Dict[str, Any]] = None) -> Any:
+        # Sopan Pipeline: validate (Governance) -> audit -> execute (R.A.M.) -> record insight
+        try:
+            return await services.sopan.submit({"intent": intent, "payload": payload})
+        except SopanRejected as e:
+            raise HTTPException(status_code=e.status, detail=e.detail)
+        except TaskTimeoutError as e:
+            raise HTTPException(status_code=504, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+    @app.post("/submit/task")
+    async def submit_task(cmd: GenesisCommand):
+        return {"status": "SUCCESS", "result": await _run_intent(cmd.intent, cmd.payload)}
+
+    @app.post("/submit/envelope")
+    async def submit_envelope(request: Request):
+        """
+        รับคำสั่งเป็น Akashic Envelope แบบไบนารี (Content-Type: application/x-akashic-envelope)
+        ถอด Header ตรงจาก Request Body; Payload ถูกถอดเฉพาะเมื่อ Body เป็น JSON (FLAG_JSON_BODY)
+        Body ชนิดอื่นที่ไม่ว่างได้ 415 เพราะ Pipeline รับ Payload เป็น JSON Object เท่านั้น
+        """
+        try:
+            envelope = EnvelopeView(await request.body())
+            intent = envelope.intent
+            if envelope.flags & FLAG_JSON_BODY:
+                payload = envelope.payload()
+            elif envelope.body.nbytes:
+                raise HTTPException(status_code=415, detail=f"Unsupported envelope body: {envelope.content_type}")
+            else:
+                payload = None
+        except (EnvelopeDecodeError, ValueError) as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return {"status": "SUCCESS", "envelope_id": envelope.envelope_id, "result": await _run_intent(intent, payload)}
+
+    async def _dtp_handler(intent: str, payload: Any) -> Any:
+        try:
+            return await _run_intent(intent, payload)
+        except HTTPException as e:
+            raise DTPError(e.status_code, e.detail)
+
+    @app.websocket("/dtp")
+    async def dtp_stream(websocket: WebSocket):
+        """
+        DTP: ส่ง Intent หลายรายการบน WebSocket เดียว (Frame ไบนารีแบบ Akashic Envelope)
+        ผลลัพธ์กลับมาตามลำดับที่ R.A.M. ทำเสร็จ และจำนวนคำขอค้างถูกจำกัดด้วย Credit ต่อ Connection
+        """
+        offered = websocket.scope.get("subprotocols", [])
+        await websocket.accept(subprotocol=DTP_SUBPROTOCOL if DTP_SUBPROTOCOL in offered else None)
+
+        async def receive() -> Optional[bytes]:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return None
+            if message.get("bytes") is None:
+                raise DTPProtocolError(CLOSE_UNSUPPORTED_DATA, "DTP frames must be sent as binary messages")
+            return message["bytes"]
+
+        session = DTPSession(_dtp_handler, config.dtp_credits)
+        services.dtp_sessions.add(session)
+        try:
+            await session.run(receive, websocket.send_bytes)
+        except DTPProtocolError as e:
+            logger.warning("⚠️ DTP connection closed: %s", e.reason)
+            await websocket.close(e.close_code, e.reason)
+        except WebSocketDisconnect:
+            pass
+        finally:
+            services.dtp_sessions.discard(session)
+
+    @app.get("/sopan/stats")
+    async def sopan_stats():
+        """Queue Time / Service Time ต่อ Stage ของ Pipeline การส่งงาน พร้อมชื่อ Stage ที่เป็นคอขวด"""
+        return {**services.sopan.stats(), "validator": services.validator.stats(), "bus": services.bus.stats()}
+
+    @app.post("/submit/batch")
+    async def submit_batch(cmds: List[GenesisCommand]):
+        """
+        รับคำสั่งเป็นชุด: ส่งทุกรายการเข้า Sopan Pipeline พร้อมกัน (Stage validate รวม Governance เป็น Micro-batch)
+        ผลลัพธ์เรียงตามลำดับ Input เสมอ
+        """
+        if len(cmds) > config.max_batch_size:
+            raise HTTPException(status_code=413, detail=f"Batch too large: {len(cmds)} > {config.max_batch_size}")
+
+        outcomes = await asyncio.gather(
+            *(services.sopan.submit({"intent": cmd.intent, "payload": cmd.payload}) for cmd in cmds),
+            return_exceptions=True,
+        )
+        results: List[Dict[str, Any]] = []
+        for i, outcome in enumerate(outcomes):
+            if isinstance(outcome, SopanRejected):
+                status = "BLOCKED" if outcome.status == 403 else "REJECTED"
+                results.append({"index": i, "status": status, "detail": outcome.detail})
+            elif isinstance(outcome, TaskTimeoutError):
+                results.append({"index": i, "status": "TIMEOUT", "detail": str(outcome)})
+            elif isinstance(outcome, Exception):
+                results.append({"index": i, "status": "FAILED", "detail": str(outcome)})
+            else:
+                results.append({"index": i, "status": "SUCCESS", "result": outcome})
+
+        return {
+            "count": len(results),
+            "blocked": sum(1 for result in results if result["status"] == "BLOCKED"),
+            "rejected": sum(1 for result in results if result["status"] == "REJECTED"),
+            "results": results,
+        }
+
+    # --- Job Endpoints (Asynchronous Submission) ---
+    @app.post("/jobs", status_code=202)
+    async def submit_job(cmd: JobSubmission):
+        """
+        ส่งงานเข้าคิวแล้วคืน job_id ทันที (ไม่ถือ Connection ระหว่างรอ R.A.M.)
+        ตรวจ validate / audit ของ Sopan Pipeline ก่อนรับงาน ส่วน execute รันภายหลังโดย Worker ของ Job Queue
+        """
+        try:
+            await services.sopan.submit({"intent": cmd.intent, "payload": cmd.payload}, last="audit")
+        except SopanRejected as e:
+            raise HTTPException(status_code=e.status, detail=e.detail)
+
+        try:
+            job = job_queue.submit(cmd.intent, cmd.payload, cmd.priority)
+        except QueueFullError as e:
+            raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "1"})
+
+        return {"status": job.status.value, "job_id": job.id, "queue_depth": job_queue.depth}
+
+    def _get_job_or_404(job_id: str) -> Dict[str, Any]:
+        snapshot = services.job_snapshot(job_id)
+        if snapshot is None:
+            raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+        return snapshot
+
+    @app.get("/jobs/{job_id}")
+    async def get_job(job_id: str):
+        """ดึงสถานะ/ผลลัพธ์ของงาน (รวมถึงงานที่รันอยู่บน Worker อื่น)"""
+        return _get_job_or_404(job_id)
+
+    @app.get("/jobs/{job_id}/stream")
+    async def stream_job(job_id: str):
+        """ติดตามสถานะงานแบบ Server-Sent Events จนกว่างานจะจบ"""
+        _get_job_or_404(job_id)
+
+        async def event_stream():
+            async for snapshot in services.watch_job(job_id):
+                yield f"event: {snapshot['status'].lower()}\ndata: {json.dumps(snapshot)}\n\n"
+
+        return StreamingResponse(event_stream(), media_type="text/event-stream",
+                                 headers={"Cache-Control": "no-cache"})
+
+    # --- Agent Endpoints (New!) ---
+    @app.post("/agents/register")
+    async def register_agent(agent: AgentRegistration):
+        """ลงทะเบียน Agent เข้าสู่ระบบ"""
+        new_identity = ZoIdentity(agent.name, agent.role)
+
+        try:
+            await services.register_agent(
+                new_identity.id,
+                name=agent.name,
+                role=agent.role,
+                key=new_identity.aether_key,
+                capabilities=agent.capabilities,
+            )
+        except ConnectionError as e:
+            raise HTTPException(status_code=503, detail=str(e))
+        logger.info("🤖 Agent Registered: %s (%s) ID:%.8s", agent.name, agent.role, new_identity.id,
+                    extra={"agent_id": new_identity.id, "role": agent.role})
+
+        return {"status": "REGISTERED", "agent_id": new_identity.id, "token": new_identity.aether_key}
+
+    @app.get("/agents/list")
+    async def list_agents(
+        role: Optional[str] = None,
+        capability: Optional[str] = None,
+        status: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = Query(100, ge=1, le=1000),
+    ):
+        """ดูรายชื่อ Agent แบบแบ่งหน้า (ใช้ next_cursor เพื่อขอหน้าถัดไป) และกรองตาม role / capability / status"""
+        try:
+            agents, next_cursor = agent_registry.query(role, capability, status, cursor, limit)
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Invalid cursor: {cursor}")
+        return {
+            "count": len(agent_registry),
+            "agents": [record.to_dict() for record in agents],
+            "next_cursor": next_cursor,
+        }
+
+    @app.get("/agents/runtime")
+    async def runtime_stats(top: int = Query(50, ge=1, le=1000)):
+        """สถิติ Agent Runtime: จำนวน Cycle, Overrun และ Latency ต่อ Agent (เรียงตาม p99 สูงสุด)"""
+        return agent_runtime.stats(top=top)
+
+    @app.get("/agents/{agent_id}")
+    async def get_agent(agent_id: str):
+        """ดูข้อมูล Agent รายตัว"""
+        record = agent_registry.get(agent_id)
+        if record is None:
+            raise HTTPException(status_code=404, detail=f"Agent not found: {agent_id}")
+        return record.to_dict()
+
+    # --- Media Endpoints (Streaming) ---
+    @app.post("/media/stream")
+    async def stream_media(
+        request: Request,
+        intent: str,
+        operations: str = Query("[]", description='JSON list เช่น [{"op": "gain", "factor": 0.5}]'),
+        output_type: Optional[str] = None,
+        chunk_size: int = Query(64 * 1024, ge=1024, le=4 * 1024 * 1024),
+    ):
+        """
+        ส่งสื่อขาเข้าเป็น Request Body แล้วรับผลลัพธ์กลับแบบ Streaming ผ่าน ActuatorAgent
+        Body ถูกพักลงไฟล์ชั่วคราวทีละ Chunk แล้ว Pipeline อ่านต่อตามจังหวะที่ Client รับผลลัพธ์
+        (หน่วยความจำคงที่ ไม่ขึ้นกับขนาดสื่อ; Client ที่อ่านช้าจะชะลอการประมวลผลทั้งสาย)
+        """
+        is_safe, violation = await enforcer.inspect_intent_async(intent)
+        if not is_safe:
+            raise HTTPException(status_code=403, detail=f"PARAJIKA VIOLATION: {violation}")
+        try:
+            media_intent = MediaIntent(
+                intent,
+                operations=json.loads(operations),
+                media_type=request.headers.get("content-type", "application/octet-stream"),
+                output_type=output_type,
+                chunk_size=chunk_size,
+            )
+            actuator.build_stages(media_intent.operations)  # ตรวจ Operation ก่อนรับ Upload
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        try:
+            upload = await spool(request.stream(), config.media_max_bytes)
+        except ValueError as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        stream = actuator.execute_task(media_intent, aiter_fileobj(upload, chunk_size))
+        return StreamingResponse(stream, media_type=media_intent.output_type or media_intent.media_type,
+                                 headers={"X-Media-Intent-Id": media_intent.intent_id},
+                                 background=BackgroundTask(upload.close))
+
+    @app.get("/media/stats")
+    async def media_stats():
+        """สถิติของ ActuatorAgent และ Back-pressure ของแต่ละ Stage ในงานล่าสุด"""
+        return actuator.stats()
+
+    # --- Knowledge Endpoints (KCP) ---
+    @app.get("/kcp/topics")
+    async def list_topics():
+        """รายการ Topic ทั้งหมดในฐานความรู้"""
+        return {"meta": kcp_storage.meta, "topics": kcp_storage.list_topics()}
+
+    @app.get("/kcp/topics/{topic_id}")
+    async def get_topic(topic_id: str):
+        return _kcp_or_404(kcp_storage.get_topic(topic_id), "Topic", topic_id)
+
+    @app.get("/kcp/chapters/{chapter_id}")
+    async def get_chapter(chapter_id: str):
+        return _kcp_or_404(kcp_storage.get_chapter(chapter_id), "Chapter", chapter_id)
+
+    @app.get("/kcp/sections/{section_id}")
+    async def get_section(section_id: str):
+        return _kcp_or_404(kcp_storage.get_section(section_id), "Section", section_id)
+
+    return app
+
+def __getattr__(name: str):
+    """
+    รองรับ `uvicorn ...api_gateway:app` และโค้ดเดิมที่ Import `app` โดยตรง:
+    App ระดับ Module ถูกสร้างครั้งแรกเมื่อถูกเรียกใช้เท่านั้น
+    """
+    if name == "app":
+        configure_logging()  # ใช้เป็น Entry Point ของ `uvicorn ...:app` เท่านั้น
+        app = globals()["app"] = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,178 @@
+import asyncio
+import logging
+import os
+import shutil
+import signal
+import socket
+import tempfile
+import time
+from typing import Dict, Optional
+
+from ..core.log_pipeline import configure_logging, shutdown_logging
+from ..core.shared_state import SharedCounters, StateReplica, run_state_hub
+from .api_gateway import GatewayConfig, create_app
+
+logger = logging.getLogger("GENESIS_ARBITER")
+
+# ตัวนับที่ทุก Worker ใช้ร่วมกันผ่าน Shared Memory
+SHARED_COUNTERS = ("violations",)
+
+class PreforkArbiter:
+    """
+    รัน Gateway แบบ Pre-fork หลาย Worker บน Socket เดียวกัน (Linux/Unix เท่านั้น)
+    - Process แม่ (Arbiter) เปิด Listening Socket และสร้าง Shared Memory Counter ก่อน fork
+      Kernel เป็นผู้กระจาย Connection ให้ Worker ที่ว่างเอง (accept จาก Socket เดียวกัน)
+    - StateHub 1 Process ถือ Agent Registry (WAL ชุดเดียว) และสถานะ Job; Worker เชื่อมผ่าน Unix Socket
+    - SIGTERM/SIGINT: ส่ง SIGTERM ให้ Worker (uvicorn หยุดรับ Connection ใหม่และรอ Request ที่ค้างอยู่)
+      รอไม่เกิน graceful_timeout แล้ว SIGKILL ตัวที่เหลือ จากนั้นจึงปิด StateHub (flush WAL)
+    - Worker ที่ตายโดยไม่ได้สั่งจะถูกสร้างใหม่อัตโนมัติ
+    """
+    def __init__(self, workers: int, host: str = "0.0.0.0", port: int = 8000,
+                 config: Optional[GatewayConfig] = None, graceful_timeout: float = 30.0):
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+        self.workers = workers
+        self.host = host
+        self.port = port
+        self.config = config or GatewayConfig()
+        # แบ่ง CPU ให้ Process Pool ของแต่ละ Worker (ไม่ให้ N Worker x cpu_count Process แย่งกัน)
+        self.config.ram.process_pool_size = max(1, (os.cpu_count() or 1) // workers)
+        self.graceful_timeout = graceful_timeout
+        self.counters: Optional[SharedCounters] = None
+        self._sock: Optional[socket.socket] = None
+        self._runtime_dir: Optional[str] = None
+        self._hub_path = ""
+        self._hub_pid: Optional[int] = None
+        self._worker_pids: Dict[int, int] = {}  # pid -> worker_id
+        self._stopping = False
+
+    # --- Process ลูก ---
+    def _run_hub(self) -> int:
+        signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl+C จัดการโดย Arbiter (Hub ต้องปิดหลัง Worker)
+
+        async def serve():
+            stop_event = asyncio.Event()
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stop_event.set)
+            await run_state_hub(self._hub_path, self.config.registry_dir, stop_event)
+
+        asyncio.run(serve())
+        return 0
+
+    def _run_worker(self, worker_id: int) -> int:
+        import uvicorn
+
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        configure_logging()  # Entry Point ของ Worker: แทนที่ Handler ที่สืบทอดมาจาก Arbiter หลัง fork
+        replica = StateReplica(self._hub_path, worker_id, self.counters)
+        app = create_app(self.config, replica=replica)
+        server = uvicorn.Server(uvicorn.Config(app, timeout_graceful_shutdown=int(self.graceful_timeout)))
+        server.run(sockets=[self._sock])
+        return 0
+
+    def _spawn(self, target, *args) -> int:
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                code = target(*args)
+            except BaseException:
+                logger.exception("💥 Child process crashed")
+            finally:
+                shutdown_logging()  # os._exit ไม่เรียก atexit: ต้อง Flush คิว Log เอง
+                logging.shutdown()
+                os._exit(code)
+        return pid
+
+    def _spawn_worker(self, worker_id: int):
+        pid = self._spawn(self._run_worker, worker_id)
+        self._worker_pids[pid] = worker_id
+        logger.info(f"👷 Worker {worker_id} started (pid {pid})")
+
+    # --- Arbiter ---
+    def _bind(self) -> socket.socket:
+        sock = socket.socket(socket.AF_INET6 if ":" in self.host else socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        sock.listen(2048)
+        sock.set_inheritable(True)
+        return sock
+
+    def _handle_signal(self, signum, frame):
+        if not self._stopping:
+            logger.info(f"🛑 Received {signal.Signals(signum).name}: draining {len(self._worker_pids)} workers...")
+        self._stopping = True
+
+    def _reap(self):
+        """เก็บ Process ลูกที่จบแล้ว; สร้าง Worker ใหม่แทนตัวที่ตายระหว่างทำงาน"""
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            code = os.waitstatus_to_exitcode(status)
+            if pid == self._hub_pid:
+                self._hub_pid = None
+                if not self._stopping:
+                    logger.error(f"❌ State Hub exited unexpectedly (code {code}); shutting down.")
+                    self._stopping = True
+                continue
+            worker_id = self._worker_pids.pop(pid, None)
+            if worker_id is not None and not self._stopping:
+                logger.warning(f"⚠️ Worker {worker_id} (pid {pid}) exited with code {code}; respawning.")
+                time.sleep(0.5)  # กันการ Respawn ถี่เกินไปเมื่อ Worker พังตั้งแต่เริ่ม
+                self._spawn_worker(worker_id)
+
+    def _wait_for(self, predicate, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        while not predicate():
+            if time.monotonic() >= deadline:
+                return False
+            self._reap()
+            time.sleep(0.05)
+        return True
+
+    def _signal_all(self, pids, signum):
+        for pid in list(pids):
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    def _drain(self):
+        self._signal_all(self._worker_pids, signal.SIGTERM)
+        # Worker ปิด Socket ของตัวเองก่อน แล้วรอ Request ที่ค้างอยู่ (รวมเวลาปิด Lifespan อีกเล็กน้อย)
+        if not self._wait_for(lambda: not self._worker_pids, self.graceful_timeout + 5):
+            logger.warning(f"⚠️ Killing {len(self._worker_pids)} workers after graceful timeout.")
+            self._signal_all(self._worker_pids, signal.SIGKILL)
+            self._wait_for(lambda: not self._worker_pids, 5)
+        if self._hub_pid is not None:
+            self._signal_all([self._hub_pid], signal.SIGTERM)
+            if not self._wait_for(lambda: self._hub_pid is None, 10):
+                self._signal_all([self._hub_pid], signal.SIGKILL)
+                self._wait_for(lambda: self._hub_pid is None, 5)
+
+    def run(self) -> int:
+        self._sock = self._bind()
+        self.counters = SharedCounters(SHARED_COUNTERS)
+        self._runtime_dir = tempfile.mkdtemp(prefix="genesis-")
+        self._hub_path = os.path.join(self._runtime_dir, "hub.sock")
+        previous = {sig: signal.signal(sig, self._handle_signal) for sig in (signal.SIGTERM, signal.SIGINT)}
+        logger.info(f"🚀 Arbiter (pid {os.getpid()}) listening on {self.host}:{self.port} with {self.workers} workers")
+        try:
+            self._hub_pid = self._spawn(self._run_hub)
+            for worker_id in range(self.workers):
+                self._spawn_worker(worker_id)
+            while not self._stopping:
+                self._reap()
+                time.sleep(0.2)
+            self._drain()
+        finally:
+            for sig, handler in previous.items():
+                signal.signal(sig, handler)
+            self._sock.close()
+            shutil.rmtree(self._runtime_dir, ignore_errors=True)
+        logger.info(f"🛑 Arbiter stopped. Shared counters: {self.counters.snapshot()}")
+        return 0
@@ -0,0 +1 @@
+"""Protocols: AetherBus (MCP Orchestrator) และโปรโตคอลสื่อสารระหว่าง Agent"""
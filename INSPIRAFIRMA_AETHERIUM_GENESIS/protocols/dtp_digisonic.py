@@ -1,2 +1,216 @@
 # AETHERIUM GENESIS MODULE: dtp_digisonic.py
-# Status: Awaiting Inspira Injection
+# DTP (Digisonic Transfer Protocol): ส่ง Intent จำนวนมากบน Connection ถาวรเดียว (เช่น WebSocket)
+# - Multiplex: ทุกคำขอมี request_id (envelope_id) ผลลัพธ์กลับมาตามลำดับที่ทำเสร็จ ไม่ใช่ลำดับที่ส่ง
+# - Credit-based Flow Control: Client ส่งคำขอค้างได้ไม่เกินจำนวน Credit ที่ Server ให้
+# - Frame ไบนารี: AkashicEnvelope ต่อกันหลาย Frame ใน 1 Message (Server รวมผลลัพธ์ที่พร้อมส่งเป็น Batch)
+# Session / Client ไม่ผูกกับ Library ของ WebSocket: รับเพียงฟังก์ชัน send(bytes) / receive() -> bytes
+
+import asyncio
+import logging
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set
+
+from ..data_structures.akashic_envelope import AkashicEnvelope, EnvelopeDecodeError, iter_envelopes
+
+logger = logging.getLogger("DTP_DIGISONIC")
+
+# --- รูปแบบ Frame ---
+# ทุก Frame เป็น AkashicEnvelope; ชนิดของ Frame อยู่ใน headers["dtp"]
+#   hello  (S->C) : headers credit = Credit เริ่มต้น, version
+#   submit (C->S) : envelope_id = request_id, intent = Intent, body = Payload (JSON)
+#   result (S->C) : envelope_id = request_id, headers status = รหัสแบบ HTTP, body = {"result"} หรือ {"detail"}
+#   credit (S->C) : headers credit = จำนวน Credit ที่คืนให้ Client (ส่งพร้อมผลลัพธ์ใน Message เดียวกัน)
+DTP_VERSION = "1"
+DTP_SUBPROTOCOL = "dtp.akashic.v1"
+FRAME_HELLO = "hello"
+FRAME_SUBMIT = "submit"
+FRAME_RESULT = "result"
+FRAME_CREDIT = "credit"
+DEFAULT_CREDITS = 64
+
+# WebSocket Close Codes (RFC 6455)
+CLOSE_PROTOCOL_ERROR = 1002
+CLOSE_UNSUPPORTED_DATA = 1003
+CLOSE_POLICY_VIOLATION = 1008
+
+Sender = Callable[[bytes], Awaitable[None]]
+Receiver = Callable[[], Awaitable[Optional[bytes]]]  # คืน None เมื่อ Connection ปิด
+
+class DTPError(Exception):
+    """คำขอ 1 รายการล้มเหลว (status ตามความหมายของ HTTP เช่น 403 / 504)"""
+    def __init__(self, status: int, detail: str):
+        super().__init__(f"{status}: {detail}")
+        self.status = status
+        self.detail = detail
+
+class DTPProtocolError(Exception):
+    """อีกฝั่งละเมิดโปรโตคอล: Connection ต้องถูกปิดด้วย close_code"""
+    def __init__(self, close_code: int, reason: str):
+        super().__init__(reason)
+        self.close_code = close_code
+        self.reason = reason
+
+def pack_frames(envelopes: Iterable[AkashicEnvelope]) -> bytes:
+    return b"".join(envelope.encode() for envelope in envelopes)
+
+def _frame(kind: str, request_id: Optional[str] = None, **headers: str) -> AkashicEnvelope:
+    return AkashicEnvelope("", envelope_id=request_id or "-", headers={"dtp": kind, **headers})
+
+class DTPSession:
+    """
+    ฝั่ง Server ของ 1 Connection
+    handler(intent, payload) -> ผลลัพธ์ (JSON ได้) หรือ raise DTPError; ทุกคำขอรันเป็น Task แยกพร้อมกัน
+    Credit ถูกคืนให้ Client หลังผลลัพธ์ถูกส่งออกไปจริงเท่านั้น จึงมีคำขอค้าง + ผลลัพธ์รอส่งรวมไม่เกิน credits
+    (Client ที่อ่านช้าจะได้ Credit คืนช้าตามไปด้วย)
+    """
+    def __init__(self, handler: Callable[[str, Any], Awaitable[Any]], credits: int = DEFAULT_CREDITS):
+        self.handler = handler
+        self.credits = credits
+        self.available = credits  # Credit ที่ Client ยังใช้ได้ (มุมมองของ Server)
+        self.in_flight: Dict[str, asyncio.Task] = {}
+        self._outbox: List[AkashicEnvelope] = []
+        self._ready = asyncio.Event()
+        self.requests = 0
+        self.messages_out = 0
+
+    async def run(self, receive: Receiver, send: Sender):
+        """รับ-ส่งจนกว่า Client จะปิด Connection; ละเมิดโปรโตคอล -> raise DTPProtocolError"""
+        await send(_frame(FRAME_HELLO, credit=str(self.credits), version=DTP_VERSION).encode())
+        writer = asyncio.create_task(self._write(send))
+        try:
+            while True:
+                message = await receive()
+                if message is None:
+                    return
+                if writer.done():  # การส่งล้มเหลว (เช่น Connection หลุด)
+                    writer.result()
+                self._dispatch(message)
+        finally:
+            tasks: Set[asyncio.Task] = set(self.in_flight.values())
+            tasks.add(writer)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _dispatch(self, message: bytes):
+        try:
+            for frame in iter_envelopes(message):
+                if frame.headers.get("dtp") != FRAME_SUBMIT:
+                    raise DTPProtocolError(CLOSE_PROTOCOL_ERROR, f"Unexpected DTP frame: {frame.headers.get('dtp')!r}")
+                request_id = frame.envelope_id
+                if request_id in self.in_flight:
+                    raise DTPProtocolError(CLOSE_PROTOCOL_ERROR, f"Duplicate in-flight request id: {request_id}")
+                if self.available <= 0:
+                    raise DTPProtocolError(CLOSE_POLICY_VIOLATION, "Flow control violation: no credit left")
+                self.available -= 1
+                self.requests += 1
+                payload = frame.payload() if frame.body.nbytes else None
+                self.in_flight[request_id] = asyncio.create_task(self._execute(request_id, frame.intent, payload))
+        except (EnvelopeDecodeError, ValueError) as e:
+            raise DTPProtocolError(CLOSE_UNSUPPORTED_DATA, f"Malformed DTP frame: {e}") from None
+
+    async def _execute(self, request_id: str, intent: str, payload: Any):
+        try:
+            body, status = {"result": await self.handler(intent, payload)}, 200
+        except DTPError as e:
+            body, status = {"detail": e.detail}, e.status
+        except Exception as e:
+            body, status = {"detail": str(e)}, 500
+        result = AkashicEnvelope.from_payload(intent, body, envelope_id=request_id,
+                                              headers={"dtp": FRAME_RESULT, "status": str(status)})
+        self._outbox.append(result)
+        self._ready.set()
+        del self.in_flight[request_id]
+
+    async def _write(self, send: Sender):
+        while True:
+            await self._ready.wait()
+            self._ready.clear()
+            batch, self._outbox = self._outbox, []
+            # ผลลัพธ์ที่เสร็จระหว่างรอส่ง Message ก่อนหน้าถูกรวมเป็น Message เดียว + คืน Credit ในคราวเดียว
+            batch.append(_frame(FRAME_CREDIT, credit=str(len(batch))))
+            await send(pack_frames(batch))
+            self.available += len(batch) - 1
+            self.messages_out += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "credits": self.credits,
+            "available": self.available,
+            "in_flight": len(self.in_flight),
+            "requests": self.requests,
+            "messages_out": self.messages_out,
+        }
+
+class DTPClient:
+    """
+    ฝั่ง Client: submit() รอ Credit ก่อนส่ง แล้วรอผลลัพธ์ของ request_id นั้นเอง
+    เรียก submit() พร้อมกันหลายตัวได้ (เช่น asyncio.gather) ผลลัพธ์ถูกจับคู่ด้วย request_id
+    """
+    def __init__(self, send: Sender, receive: Receiver):
+        self._send = send
+        self._receive = receive
+        self._credits = asyncio.Semaphore(0)
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._reader: Optional[asyncio.Task] = None
+        self.server_credits = 0
+
+    async def start(self):
+        message = await self._receive()
+        hello = next(iter_envelopes(message), None) if message else None
+        if hello is None or hello.headers.get("dtp") != FRAME_HELLO:
+            raise DTPProtocolError(CLOSE_PROTOCOL_ERROR, "DTP server did not send hello")
+        self.server_credits = int(hello.headers["credit"])
+        for _ in range(self.server_credits):
+            self._credits.release()
+        self._reader = asyncio.create_task(self._read())
+
+    async def _read(self):
+        error: BaseException = ConnectionError("DTP connection closed")
+        try:
+            while True:
+                message = await self._receive()
+                if message is None:
+                    break
+                for frame in iter_envelopes(message):
+                    kind = frame.headers.get("dtp")
+                    if kind == FRAME_CREDIT:
+                        for _ in range(int(frame.headers["credit"])):
+                            self._credits.release()
+                    elif kind == FRAME_RESULT:
+                        future = self._pending.pop(frame.envelope_id, None)
+                        if future is None or future.done():
+                            continue
+                        body = frame.payload()
+                        status = int(frame.headers.get("status", "500"))
+                        if status == 200:
+                            future.set_result(body["result"])
+                        else:
+                            future.set_exception(DTPError(status, body.get("detail", "")))
+        except Exception as e:
+            error = e
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(error)
+            self._pending.clear()
+
+    async def submit(self, intent: str, payload: Any = None, request_id: Optional[str] = None) -> Any:
+        if self._reader is None or self._reader.done():
+            raise ConnectionError("DTP client is not connected")
+        await self._credits.acquire()
+        request_id = request_id or uuid.uuid4().hex
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        frame = AkashicEnvelope.from_payload(intent, payload, envelope_id=request_id, headers={"dtp": FRAME_SUBMIT})
+        try:
+            await self._send(frame.encode())
+        except BaseException:
+            self._pending.pop(request_id, None)
+            raise
+        return await future
+
+    async def close(self):
+        if self._reader is not None:
+            self._reader.cancel()
+            await asyncio.gather(self._reader, return_exceptions=True)
@@ -1,2 +1,403 @@
 # AETHERIUM GENESIS MODULE: mcp_orchestrator.py
-# Status: Awaiting Inspira Injection
+# AetherBus: Message Bus แบบ Pub/Sub (asyncio) สำหรับการสื่อสารระหว่าง Agent
+# - Topic Routing แบบจุด (เช่น "task.video.render") รองรับ "*" (1 ช่วง) และ "#" (0 ช่วงขึ้นไป)
+# - Bounded Queue ต่อ Subscriber พร้อม Back-pressure และการส่งแบบ Batch
+# - Transport แบบเสียบเปลี่ยนได้ (เช่น Unix Socket) เพื่อเชื่อม Bus ข้ามหลาย Worker Process บนเครื่องเดียว
+
+import asyncio
+import errno
+import fcntl
+import inspect
+import json
+import logging
+import os
+import struct
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+logger = logging.getLogger("GENESIS_BUS")
+
+OVERFLOW_BLOCK = "block"          # ผู้ Publish รอจนกว่าคิวจะว่าง (Back-pressure)
+OVERFLOW_DROP_NEW = "drop_new"    # ทิ้งข้อความใหม่
+OVERFLOW_DROP_OLDEST = "drop_oldest"  # ทิ้งข้อความเก่าสุดเพื่อรับข้อความใหม่
+ROUTE_CACHE_SIZE = 4096  # จำนวน Topic สูงสุดที่ Cache เส้นทางไว้
+
+class Message:
+    __slots__ = ("id", "topic", "payload", "sender", "timestamp", "origin")
+
+    def __init__(self, topic: str, payload: Any, sender: Optional[str] = None,
+                 id: Optional[str] = None, timestamp: Optional[float] = None,
+                 origin: Optional[str] = None):
+        self.id = id or uuid.uuid4().hex
+        self.topic = topic
+        self.payload = payload
+        self.sender = sender
+        self.timestamp = time.time() if timestamp is None else timestamp
+        self.origin = origin  # Bus ต้นทาง (ใช้กันการวนซ้ำเมื่อข้าม Process)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"id": self.id, "topic": self.topic, "payload": self.payload, "sender": self.sender,
+                "timestamp": self.timestamp, "origin": self.origin}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Message":
+        return cls(data["topic"], data.get("payload"), data.get("sender"), data.get("id"),
+                   data.get("timestamp"), data.get("origin"))
+
+def topic_matches(pattern: str, topic: str) -> bool:
+    """จับคู่ Topic แบบ AMQP: '*' แทน 1 ช่วง, '#' แทน 0 ช่วงขึ้นไป"""
+    return _match(pattern.split("."), topic.split("."))
+
+def _match(pattern: List[str], topic: List[str]) -> bool:
+    if not pattern:
+        return not topic
+    head = pattern[0]
+    if head == "#":
+        return any(_match(pattern[1:], topic[i:]) for i in range(len(topic) + 1))
+    if not topic:
+        return False
+    return (head == "*" or head == topic[0]) and _match(pattern[1:], topic[1:])
+
+BatchHandler = Callable[[List[Message]], Any]
+
+class Subscription:
+    """ผู้รับข้อความ 1 ราย: มีคิวของตัวเองและ Task ที่ดึงข้อความไปส่งให้ Handler เป็นชุด"""
+    def __init__(self, pattern: str, handler: BatchHandler, maxsize: int = 1000,
+                 batch_size: int = 1, batch_window: float = 0.0, overflow: str = OVERFLOW_BLOCK,
+                 name: Optional[str] = None):
+        if overflow not in (OVERFLOW_BLOCK, OVERFLOW_DROP_NEW, OVERFLOW_DROP_OLDEST):
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        self.pattern = pattern
+        self.handler = handler
+        self.batch_size = max(1, batch_size)
+        self.batch_window = batch_window
+        self.overflow = overflow
+        self.name = name or pattern
+        self.queue: "asyncio.Queue[Message]" = asyncio.Queue(maxsize)
+        self.delivered = 0
+        self.dropped = 0
+        self.failed = 0
+        self.task: Optional[asyncio.Task] = None
+        self._pending: Optional[asyncio.Task] = None  # queue.get() ที่ค้างจากหน้าต่าง Batch ก่อนหน้า
+
+    async def offer(self, message: Message):
+        if self.overflow == OVERFLOW_BLOCK:
+            await self.queue.put(message)
+            return
+        if self.queue.full():
+            self.dropped += 1
+            if self.overflow == OVERFLOW_DROP_NEW:
+                return
+            self.queue.get_nowait()
+            self.queue.task_done()
+        self.queue.put_nowait(message)
+
+    async def _next_batch(self) -> List[Message]:
+        """
+        รวม Batch ภายใน batch_window: queue.get() ที่ยังรออยู่เมื่อหมดเวลาไม่ถูกยกเลิก
+        (การยกเลิกพร้อมกับที่ get() ได้ข้อความพอดีจะทำให้ข้อความหาย) แต่เก็บไว้เป็นรายการแรกของ Batch ถัดไป
+        """
+        pending, self._pending = self._pending, None
+        batch = [await pending if pending is not None else await self.queue.get()]
+        if self.batch_size > 1:
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.batch_size:
+                if not self.queue.empty():
+                    batch.append(self.queue.get_nowait())
+                    continue
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                getter = asyncio.ensure_future(self.queue.get())
+                try:
+                    done, _ = await asyncio.wait((getter,), timeout=remaining)
+                except asyncio.CancelledError:
+                    getter.cancel()
+                    raise
+                if not done:
+                    self._pending = getter
+                    break
+                batch.append(getter.result())
+        return batch
+
+    async def run(self):
+        try:
+            while True:
+                batch = await self._next_batch()
+                try:
+                    result = self.handler(batch)
+                    if inspect.isawaitable(result):
+                        await result
+                    self.delivered += len(batch)
+                except Exception as e:
+                    self.failed += len(batch)
+                    logger.error("❌ [AetherBus] Subscriber %s failed on %d messages: %s", self.name, len(batch), e)
+                finally:
+                    for _ in batch:
+                        self.queue.task_done()
+        finally:
+            if self._pending is not None:
+                self._pending.cancel()
+                self._pending = None
+
+class BusTransport(ABC):
+    """ช่องทางเชื่อม AetherBus ข้าม Process: ส่งข้อความออก และป้อนข้อความจากภายนอกกลับเข้า Bus"""
+
+    @abstractmethod
+    async def start(self, deliver: Callable[[Message], Awaitable[None]]):
+        ...
+
+    @abstractmethod
+    async def send(self, message: Message):
+        ...
+
+    @abstractmethod
+    async def stop(self):
+        ...
+
+class AetherBus:
+    """
+    AetherBus (CH-5): Pub/Sub In-Process สำหรับ Agent ทั้งหลาย
+    Handler ของ Subscriber จะได้รับข้อความเป็น List[Message] เสมอ (ขนาดตาม batch_size)
+    """
+    def __init__(self, name: str = "aetherbus"):
+        self.name = name
+        self.bus_id = uuid.uuid4().hex
+        self.published = 0
+        self._subscriptions: List[Subscription] = []
+        self._routes: Dict[str, List[Subscription]] = {}  # Cache: topic -> subscribers
+        self._transport: Optional[BusTransport] = None
+        self._running = False
+
+    # --- Subscription ---
+    def subscribe(self, pattern: str, handler: BatchHandler, **options) -> Subscription:
+        subscription = Subscription(pattern, handler, **options)
+        self._subscriptions.append(subscription)
+        self._routes.clear()
+        if self._running:
+            subscription.task = asyncio.create_task(subscription.run())
+        return subscription
+
+    def subscribe_agent(self, pattern: str, method: Callable[[Any], Any], **options) -> Subscription:
+        """ผูกเมธอดของ Agent ที่รับ payload ทีละรายการ (เช่น ValidatorAgent.perform_audit) เข้ากับ Topic"""
+        async def handler(batch: List[Message]):
+            for message in batch:
+                result = method(message.payload)
+                if inspect.isawaitable(result):
+                    await result
+        return self.subscribe(pattern, handler, name=getattr(method, "__qualname__", pattern), **options)
+
+    def unsubscribe(self, subscription: Subscription):
+        if subscription in self._subscriptions:
+            self._subscriptions.remove(subscription)
+            self._routes.clear()
+        if subscription.task is not None:
+            subscription.task.cancel()
+
+    def _route(self, topic: str) -> List[Subscription]:
+        route = self._routes.get(topic)
+        if route is None:
+            route = [sub for sub in self._subscriptions if topic_matches(sub.pattern, topic)]
+            if len(self._routes) >= ROUTE_CACHE_SIZE:
+                self._routes.clear()
+            self._routes[topic] = route
+        return route
+
+    # --- Publishing ---
+    async def publish(self, topic: str, payload: Any = None, sender: Optional[str] = None) -> int:
+        """ส่งข้อความไปยังทุก Subscriber ที่ตรง Topic (รวมถึง Process อื่นผ่าน Transport) คืนจำนวนผู้รับในเครื่อง"""
+        message = Message(topic, payload, sender, origin=self.bus_id)
+        self.published += 1
+        if self._transport is not None:
+            await self._transport.send(message)
+        return await self._deliver(message)
+
+    async def _deliver(self, message: Message) -> int:
+        route = self._route(message.topic)
+        for subscription in route:
+            await subscription.offer(message)
+        return len(route)
+
+    async def _deliver_remote(self, message: Message):
+        if message.origin != self.bus_id:
+            await self._deliver(message)
+
+    # --- Lifecycle ---
+    async def start(self, transport: Optional[BusTransport] = None):
+        self._running = True
+        for subscription in self._subscriptions:
+            if subscription.task is None:
+                subscription.task = asyncio.create_task(subscription.run())
+        if transport is not None:
+            self._transport = transport
+            await transport.start(self._deliver_remote)
+        logger.info(f"🌌 AetherBus {self.name} online: {len(self._subscriptions)} subscribers")
+
+    async def drain(self):
+        """รอจนทุกข้อความที่อยู่ในคิวถูกส่งให้ Handler แล้ว"""
+        await asyncio.gather(*(sub.queue.join() for sub in self._subscriptions))
+
+    async def stop(self, drain: bool = True):
+        if drain:
+            await self.drain()
+        if self._transport is not None:
+            await self._transport.stop()
+            self._transport = None
+        tasks = [sub.task for sub in self._subscriptions if sub.task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for subscription in self._subscriptions:
+            subscription.task = None
+        self._running = False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "published": self.published,
+            "subscribers": [
+                {"name": sub.name, "pattern": sub.pattern, "depth": sub.queue.qsize(),
+                 "delivered": sub.delivered, "dropped": sub.dropped, "failed": sub.failed}
+                for sub in self._subscriptions
+            ],
+        }
+
+# --- Local Socket Transport ---
+_FRAME_HEADER = struct.Struct(">I")
+
+class UnixSocketTransport(BusTransport):
+    """
+    เชื่อม AetherBus หลาย Process บนเครื่องเดียวผ่าน Unix Domain Socket
+    Process แรกที่ Bind ได้จะเป็น Hub ที่กระจายข้อความให้ Peer อื่น ส่วน Process ที่เหลือเชื่อมต่อเข้ามาเป็น Peer
+    Frame = ความยาว 4 ไบต์ (big-endian) + JSON ของ Message (payload ต้อง Serialize เป็น JSON ได้)
+    หาก Hub หายไป Peer จะพยายามเชื่อมต่อใหม่ (หรือขึ้นเป็น Hub แทน) อัตโนมัติ
+    การเลือก Hub ถูก Serialize ด้วย flock บนไฟล์ <path>.lock ที่ Hub ถือไว้ตลอดอายุ (Kernel ปล่อยให้เองเมื่อ Process ตาย)
+    จึงมีเพียงผู้ถือ Lock ที่ลบ Socket ค้างและ Bind ได้ ไม่มีทางเกิด Hub ซ้อนกันสองตัว
+    """
+    def __init__(self, path: str, reconnect_delay: float = 0.5):
+        self.path = path
+        self.lock_path = path + ".lock"
+        self.reconnect_delay = reconnect_delay
+        self.is_hub = False
+        self._deliver: Optional[Callable[[Message], Awaitable[None]]] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._lock_fd: Optional[int] = None
+        self._peers: Set[asyncio.StreamWriter] = set()
+        self._hub_writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._closing = False
+
+    async def start(self, deliver: Callable[[Message], Awaitable[None]]):
+        self._deliver = deliver
+        await self._connect_or_serve()
+
+    async def _connect_or_serve(self):
+        while True:
+            try:
+                reader, writer = await asyncio.open_unix_connection(self.path)
+                self._hub_writer = writer
+                self._reader_task = asyncio.create_task(self._peer_loop(reader))
+                logger.info(f"🔌 [AetherBus] Joined hub at {self.path}")
+                return
+            except (FileNotFoundError, ConnectionRefusedError):
+                pass
+            if self._acquire_hub_lock():
+                try:
+                    if os.path.exists(self.path):
+                        os.unlink(self.path)  # ถือ Lock อยู่ = ไม่มี Hub ที่ยังมีชีวิต: Socket นี้ค้างจาก Hub ที่ตายไปแล้ว
+                    self._server = await asyncio.start_unix_server(self._on_peer, self.path)
+                except BaseException:
+                    self._release_hub_lock()
+                    raise
+                self.is_hub = True
+                logger.info(f"🔌 [AetherBus] Hosting hub at {self.path}")
+                return
+            await asyncio.sleep(self.reconnect_delay)  # อีก Process ถือ Lock อยู่ (กำลัง Bind หรือเพิ่งขึ้นเป็น Hub) ลองเชื่อมต่อใหม่
+
+    def _acquire_hub_lock(self) -> bool:
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError as e:
+            os.close(fd)
+            if e.errno in (errno.EWOULDBLOCK, errno.EAGAIN):
+                return False
+            raise
+        self._lock_fd = fd
+        return True
+
+    def _release_hub_lock(self):
+        # ไม่ลบไฟล์ Lock: การลบแล้วสร้างใหม่จะทำให้สอง Process ถือ Lock คนละ inode ได้
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)  # close() ปล่อย flock
+            self._lock_fd = None
+
+    @staticmethod
+    async def _read_frame(reader: asyncio.StreamReader) -> Message:
+        header = await reader.readexactly(_FRAME_HEADER.size)
+        body = await reader.readexactly(_FRAME_HEADER.unpack(header)[0])
+        return Message.from_dict(json.loads(body))
+
+    @staticmethod
+    def _encode(message: Message) -> bytes:
+        body = json.dumps(message.to_dict(), ensure_ascii=False).encode("utf-8")
+        return _FRAME_HEADER.pack(len(body)) + body
+
+    async def _write(self, writer: asyncio.StreamWriter, frame: bytes):
+        try:
+            writer.write(frame)
+            await writer.drain()  # Back-pressure จาก Socket
+        except (ConnectionError, RuntimeError):
+            self._peers.discard(writer)
+
+    async def _on_peer(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._peers.add(writer)
+        try:
+            while True:
+                message = await self._read_frame(reader)
+                frame = self._encode(message)
+                # Hub: ส่งต่อให้ Peer อื่นทั้งหมด แล้วส่งเข้า Bus ในเครื่อง
+                await asyncio.gather(*(self._write(peer, frame) for peer in list(self._peers) if peer is not writer))
+                await self._deliver(message)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._peers.discard(writer)
+            writer.close()
+
+    async def _peer_loop(self, reader: asyncio.StreamReader):
+        try:
+            while True:
+                await self._deliver(await self._read_frame(reader))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            if self._closing:
+                return
+            logger.warning("⚠️ [AetherBus] Lost connection to hub; reconnecting...")
+            self._hub_writer = None
+            await asyncio.sleep(self.reconnect_delay)
+            await self._connect_or_serve()
+
+    async def send(self, message: Message):
+        frame = self._encode(message)
+        if self.is_hub:
+            await asyncio.gather(*(self._write(peer, frame) for peer in list(self._peers)))
+        elif self._hub_writer is not None:
+            await self._write(self._hub_writer, frame)
+
+    async def stop(self):
+        self._closing = True
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            await asyncio.gather(self._reader_task, return_exceptions=True)
+        if self._hub_writer is not None:
+            self._hub_writer.close()
+        for peer in list(self._peers):
+            peer.close()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            if os.path.exists(self.path):
+                os.unlink(self.path)  # ลบขณะยังถือ Lock: Hub ใหม่จะ Bind หลังจากนี้เท่านั้น
+            self._release_hub_lock()
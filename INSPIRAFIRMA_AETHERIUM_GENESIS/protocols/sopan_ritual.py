@@ -1,2 +1,377 @@
 # AETHERIUM GENESIS MODULE: sopan_ritual.py
-# Status: Awaiting Inspira Injection
+# Sopan Ritual: Pipeline แบบขั้นบันได (Staged Pipeline) ที่ประกาศขั้นตอนแบบ Declarative
+# - แต่ละ Stage มี Worker Pool ของตัวเอง และคั่นด้วยคิวขนาดจำกัด (Back-pressure ย้อนถึงผู้ส่งงาน)
+# - Micro-batching: Stage ที่เปิด batch_size > 1 รวมงานที่มาถึงภายใน batch_window เป็นชุดเดียว
+# - สถิติ Queue Time / Service Time ต่อ Stage เพื่อให้เห็น Stage ที่เป็นคอขวดและปรับขนาดแยกได้
+
+import asyncio
+import inspect
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set
+
+logger = logging.getLogger("SOPAN_RITUAL")
+
+@dataclass
+class SopanStage:
+    """
+    นิยามของ Stage 1 ขั้น
+    handler: รับค่า 1 รายการ (หรือ List เมื่อ batch_size > 1) คืนค่าที่ส่งต่อให้ Stage ถัดไป
+             เป็น coroutine function หรือ function ธรรมดาก็ได้ (แบบหลังรันบน Event Loop ทันที
+             เว้นแต่ in_thread=True ซึ่งจะรันใน Thread Pool)
+             แบบ Batch ต้องคืน List ยาวเท่า Input; รายการที่เป็น Exception จะล้มเหลวเฉพาะรายการนั้น
+    on_error: เรียก on_error(value, error) เมื่อรายการล้มเหลวที่ Stage นี้ (ไม่รวม SopanRejected; เป็น coroutine function ได้)
+              เช่น บันทึก Insight โดยความล้มเหลวยังนับเป็นของ Stage นี้ในสถิติ
+    """
+    name: str
+    handler: Callable[..., Any]
+    workers: int = 1
+    queue_size: int = 64
+    batch_size: int = 1
+    batch_window: float = 0.0  # วินาทีที่รอให้ Batch เต็มหลังได้รายการแรก (0 = เอาเท่าที่มีในคิวตอนนั้น)
+    in_thread: bool = False
+    on_error: Optional[Callable[[Any, Exception], None]] = None
+
+class SopanRejected(Exception):
+    """Stage ปฏิเสธงานโดยเจตนา (เช่น ไม่ผ่าน Governance) นับเป็น rejected ไม่ใช่ failed"""
+    def __init__(self, status: int, detail: str):
+        super().__init__(detail)
+        self.status = status
+        self.detail = detail
+
+_ABANDONED = object()  # ผลของ Handler เมื่อผู้ส่งงานยกเลิกระหว่างทำ
+
+class _Ticket:
+    __slots__ = ("value", "future", "enqueued_at", "last")
+
+    def __init__(self, value: Any, future: asyncio.Future, last: Optional["_StageRunner"] = None):
+        self.value = value
+        self.future = future
+        self.enqueued_at = 0.0
+        self.last = last  # Stage สุดท้ายของงานนี้ (None = ถึง Stage สุดท้ายของ Pipeline)
+
+class StageStats:
+    """สถิติของ Stage 1 ขั้น: Queue Time (รอในคิว) และ Service Time (เวลา Handler ต่อ Batch)"""
+    __slots__ = ("items", "batches", "rejected", "failed", "busy_time", "queue_total", "service_total",
+                 "queue_samples", "service_samples", "max_queue_time", "max_service_time")
+
+    def __init__(self, sample_size: int):
+        self.items = 0
+        self.batches = 0
+        self.rejected = 0
+        self.failed = 0
+        self.busy_time = 0.0
+        self.queue_total = 0.0
+        self.service_total = 0.0
+        self.queue_samples: deque = deque(maxlen=sample_size)
+        self.service_samples: deque = deque(maxlen=sample_size)
+        self.max_queue_time = 0.0
+        self.max_service_time = 0.0
+
+    def record(self, queue_times: List[float], service_time: float):
+        self.items += len(queue_times)
+        self.batches += 1
+        self.busy_time += service_time
+        self.service_total += service_time
+        self.service_samples.append(service_time)
+        if service_time > self.max_service_time:
+            self.max_service_time = service_time
+        for waited in queue_times:
+            self.queue_total += waited
+            self.queue_samples.append(waited)
+            if waited > self.max_queue_time:
+                self.max_queue_time = waited
+
+    @staticmethod
+    def _percentiles(samples: deque) -> Dict[str, float]:
+        ordered = sorted(samples)
+
+        def percentile(q: float) -> float:
+            if not ordered:
+                return 0.0
+            return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1e3
+
+        return {"p50_ms": percentile(0.50), "p95_ms": percentile(0.95), "p99_ms": percentile(0.99)}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "items": self.items,
+            "batches": self.batches,
+            "mean_batch": self.items / self.batches if self.batches else 0.0,
+            "rejected": self.rejected,
+            "failed": self.failed,
+            "queue_time": {
+                "mean_ms": self.queue_total / self.items * 1e3 if self.items else 0.0,
+                **self._percentiles(self.queue_samples),
+                "max_ms": self.max_queue_time * 1e3,
+            },
+            "service_time": {
+                "mean_ms": self.service_total / self.batches * 1e3 if self.batches else 0.0,
+                **self._percentiles(self.service_samples),
+                "max_ms": self.max_service_time * 1e3,
+            },
+        }
+
+class _StageRunner:
+    def __init__(self, stage: SopanStage, sample_size: int):
+        self.stage = stage
+        self.queue: asyncio.Queue = asyncio.Queue(stage.queue_size)
+        self.stats = StageStats(sample_size)
+        self.next: Optional["_StageRunner"] = None
+        self.workers: List[asyncio.Task] = []
+        self.is_async = inspect.iscoroutinefunction(stage.handler)
+        self.in_hand: Set[_Ticket] = set()  # Ticket ที่ Worker หยิบออกจากคิวแล้วแต่ยังไม่ส่งต่อ / ปิดงาน
+        self._queue_seconds = None
+        self._service_seconds = None
+
+    async def put(self, ticket: _Ticket):
+        ticket.enqueued_at = time.perf_counter()
+        await self.queue.put(ticket)
+
+    async def _call(self, value: Any) -> Any:
+        if self.is_async:
+            return await self.stage.handler(value)
+        if self.stage.in_thread:
+            return await asyncio.to_thread(self.stage.handler, value)
+        return self.stage.handler(value)
+
+    async def _call_for(self, ticket: _Ticket) -> Any:
+        """
+        เรียก Handler แบบ async ของรายการเดียวเป็น Task ที่ผูกกับ Ticket:
+        ผู้ส่งงานยกเลิก (เช่น Client ตัดการเชื่อมต่อ) -> Task ของ Handler ถูกยกเลิกด้วย (เช่น R.A.M. execute_task)
+        คืน _ABANDONED เมื่อถูกยกเลิกเพราะผู้ส่งงาน
+        """
+        task = asyncio.ensure_future(self.stage.handler(ticket.value))
+
+        def abandon(future: asyncio.Future):
+            if future.cancelled():
+                task.cancel()
+
+        ticket.future.add_done_callback(abandon)
+        try:
+            await asyncio.wait((task,))  # ไม่ raise เมื่อ task ถูกยกเลิก; raise เมื่อ Worker เองถูกยกเลิก
+        except asyncio.CancelledError:
+            task.cancel()
+            raise
+        finally:
+            ticket.future.remove_done_callback(abandon)
+        if task.cancelled():
+            return _ABANDONED
+        return task.result()
+
+    def _take(self, ticket: _Ticket) -> _Ticket:
+        self.in_hand.add(ticket)
+        return ticket
+
+    async def _collect(self, pending: Optional[asyncio.Task]):
+        """
+        รวม Batch: รายการแรกรอได้ไม่จำกัด รายการถัดไปรอไม่เกิน batch_window
+        queue.get() ที่รอค้างเมื่อหมดเวลาไม่ถูกยกเลิก แต่ส่งต่อเป็นรายการแรกของ Batch ถัดไป (ไม่มีงานหาย)
+        """
+        first = await pending if pending is not None else await self.queue.get()
+        batch = [self._take(first)]
+        deadline = time.perf_counter() + self.stage.batch_window
+        while len(batch) < self.stage.batch_size:
+            try:
+                batch.append(self._take(self.queue.get_nowait()))
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            getter = asyncio.ensure_future(self.queue.get())
+            try:
+                done, _ = await asyncio.wait((getter,), timeout=remaining)
+            except asyncio.CancelledError:
+                self._release_getter(getter)
+                raise
+            if not done:
+                return batch, getter
+            batch.append(self._take(getter.result()))
+        return batch, None
+
+    def _release_getter(self, getter: asyncio.Task):
+        """getter ที่ได้ Ticket มาแล้วแต่ยังไม่ถูกใช้ ต้องนับเป็นงานในมือ (ให้ stop() ปิดงานนั้นได้)"""
+        if getter.done() and not getter.cancelled():
+            self._take(getter.result())
+        else:
+            getter.cancel()
+
+    async def work(self):
+        pending: Optional[asyncio.Task] = None
+        try:
+            while True:
+                if self.stage.batch_size > 1:
+                    batch, pending = await self._collect(pending)
+                else:
+                    batch = [self._take(await self.queue.get())]
+                await self._process(batch)
+        finally:
+            if pending is not None:
+                self._release_getter(pending)
+
+    async def _process(self, batch: List[_Ticket]):
+        # ข้ามงานที่ผู้ส่งยกเลิกไปแล้ว ไม่ให้เสียเวลาใน Handler ของ Stage นี้และ Stage ถัดไป
+        abandoned = [ticket for ticket in batch if ticket.future.done()]
+        if abandoned:
+            self.in_hand.difference_update(abandoned)
+            batch = [ticket for ticket in batch if not ticket.future.done()]
+            if not batch:
+                return
+        started = time.perf_counter()
+        queue_times = [started - ticket.enqueued_at for ticket in batch]
+        try:
+            if self.stage.batch_size > 1:
+                outcomes = await self._call([ticket.value for ticket in batch])
+                if len(outcomes) != len(batch):
+                    raise RuntimeError(f"Stage {self.stage.name} returned {len(outcomes)} results for {len(batch)} items")
+            elif self.is_async:
+                outcomes = [await self._call_for(batch[0])]
+            else:
+                outcomes = [await self._call(batch[0].value)]
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            outcomes = [e] * len(batch)
+        elapsed = time.perf_counter() - started
+        self.stats.record(queue_times, elapsed)
+        if self._service_seconds is not None:
+            self._service_seconds.observe(elapsed)
+            for waited in queue_times:
+                self._queue_seconds.observe(waited)
+
+        for ticket, outcome in zip(batch, outcomes):
+            if ticket.future.done() or outcome is _ABANDONED:  # ผู้ส่งงานยกเลิกไปแล้ว
+                pass
+            elif isinstance(outcome, Exception):
+                if isinstance(outcome, SopanRejected):
+                    self.stats.rejected += 1
+                else:
+                    self.stats.failed += 1
+                    await self._report(ticket.value, outcome)
+                ticket.future.set_exception(outcome)
+            elif self.next is None or ticket.last is self:
+                ticket.future.set_result(outcome)
+            else:
+                ticket.value = outcome
+                await self.next.put(ticket)  # คิวของ Stage ถัดไปเต็ม -> Worker นี้รอ (Back-pressure)
+            self.in_hand.discard(ticket)
+
+    async def _report(self, value: Any, error: Exception):
+        if self.stage.on_error is None:
+            return
+        try:
+            result = self.stage.on_error(value, error)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            logger.error("❌ Sopan stage %s on_error hook failed: %s", self.stage.name, e)
+
+    def abort(self, error: BaseException):
+        """ปิดงานทั้งหมดที่ยังอยู่ในคิวหรืออยู่ในมือของ Worker (เรียกหลัง Worker ถูกยกเลิกแล้ว)"""
+        tickets = list(self.in_hand)
+        self.in_hand.clear()
+        while not self.queue.empty():
+            tickets.append(self.queue.get_nowait())
+        for ticket in tickets:
+            if not ticket.future.done():
+                ticket.future.set_exception(error)
+
+class SopanPipeline:
+    """
+    ขับเคลื่อนงานผ่าน Stage ตามลำดับ: submit(value) คืนผลลัพธ์จาก Stage สุดท้าย
+    หรือ raise Exception ที่ Stage ใดก็ตามโยนออกมา (งานนั้นไม่ไปต่อ Stage ถัดไป)
+    overrides: ปรับ workers / queue_size / batch_size / batch_window ของ Stage ตามชื่อโดยไม่ต้องแก้นิยาม
+    """
+    def __init__(self, stages: Sequence[SopanStage], overrides: Optional[Dict[str, Dict[str, Any]]] = None,
+                 sample_size: int = 1024, metrics: Any = None):
+        overrides = overrides or {}
+        unknown = set(overrides) - {stage.name for stage in stages}
+        if unknown:
+            raise ValueError(f"Unknown Sopan stage(s): {sorted(unknown)}")
+        self.stages = [replace(stage, **overrides.get(stage.name, {})) for stage in stages]
+        for stage in self.stages:
+            if stage.workers < 1 or stage.queue_size < 1 or stage.batch_size < 1 or stage.batch_window < 0:
+                raise ValueError(f"Invalid Sopan stage settings for {stage.name!r}")
+        self.sample_size = sample_size
+        self.metrics = metrics
+        self.runners: List[_StageRunner] = []
+        self.started_at: Optional[float] = None
+
+    def start(self):
+        """สร้างคิวและ Worker ของทุก Stage (ต้องเรียกภายใน Event Loop ที่จะใช้งาน)"""
+        if self.runners:
+            return
+        self.runners = [_StageRunner(stage, self.sample_size) for stage in self.stages]
+        for runner, following in zip(self.runners, self.runners[1:]):
+            runner.next = following
+        if self.metrics is not None:
+            queue_seconds = self.metrics.histogram("genesis_sopan_queue_seconds", "Time a Sopan item waits in a stage queue", ("stage",))
+            service_seconds = self.metrics.histogram("genesis_sopan_service_seconds", "Sopan stage handler time per batch", ("stage",))
+            depth = self.metrics.gauge("genesis_sopan_queue_depth", "Items waiting in a Sopan stage queue", ("stage",))
+            for runner in self.runners:
+                runner._queue_seconds = queue_seconds.labels(runner.stage.name)
+                runner._service_seconds = service_seconds.labels(runner.stage.name)
+                depth.labels(runner.stage.name).set_function(runner.queue.qsize)
+        for runner in self.runners:
+            runner.workers = [asyncio.create_task(runner.work(), name=f"sopan-{runner.stage.name}-{i}")
+                              for i in range(runner.stage.workers)]
+        self.started_at = time.perf_counter()
+        logger.info("🪜 Sopan pipeline ready: %s", " -> ".join(
+            f"{stage.name}[x{stage.workers}{f', batch {stage.batch_size}' if stage.batch_size > 1 else ''}]"
+            for stage in self.stages))
+
+    async def stop(self):
+        """หยุด Worker ทั้งหมด งานที่ยังค้างอยู่ (ในคิว / ใน Handler / รอส่งต่อ) จะล้มเหลวด้วย ConnectionAbortedError"""
+        tasks = [task for runner in self.runners for task in runner.workers]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for runner in self.runners:
+            runner.abort(ConnectionAbortedError("Sopan pipeline stopped"))
+        self.runners = []
+
+    def _runner(self, name: Optional[str], default: Optional[_StageRunner]) -> Optional[_StageRunner]:
+        if name is None:
+            return default
+        for runner in self.runners:
+            if runner.stage.name == name:
+                return runner
+        raise ValueError(f"Unknown Sopan stage: {name!r}")
+
+    async def submit(self, value: Any, first: Optional[str] = None, last: Optional[str] = None) -> Any:
+        """
+        ส่งงานเข้า Pipeline แล้วรอผลลัพธ์
+        first / last: รันเฉพาะช่วงของ Stage (เช่น ตรวจถึง "audit" ตอนรับงาน แล้วเริ่มที่ "execute" ภายหลัง)
+        """
+        if not self.runners:
+            raise RuntimeError("Sopan pipeline is not running")
+        entry = self._runner(first, self.runners[0])
+        future = asyncio.get_running_loop().create_future()
+        await entry.put(_Ticket(value, future, self._runner(last, None)))
+        return await future
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        สถิติต่อ Stage พร้อม utilization = เวลาที่ Handler ทำงาน / (เวลาที่รัน x workers)
+        Stage ที่ utilization สูงสุดคือคอขวด (เพิ่ม workers หรือเปิด Micro-batching ที่ Stage นั้น)
+        """
+        uptime = time.perf_counter() - self.started_at if self.started_at is not None else 0.0
+        stages = []
+        for runner in self.runners:
+            stage = runner.stage
+            stages.append({
+                "stage": stage.name,
+                "workers": stage.workers,
+                "queue_size": stage.queue_size,
+                "batch_size": stage.batch_size,
+                "batch_window_ms": stage.batch_window * 1e3,
+                "queue_depth": runner.queue.qsize(),
+                "utilization": runner.stats.busy_time / (uptime * stage.workers) if uptime else 0.0,
+                **runner.stats.to_dict(),
+            })
+        bottleneck = max(stages, key=lambda item: (item["utilization"], item["queue_time"]["mean_ms"]), default=None)
+        return {"uptime": uptime, "bottleneck": bottleneck["stage"] if bottleneck else None, "stages": stages}
@@ -0,0 +1,98 @@
+# FILE: benchmarks/bench_akashic_envelope.py
+# Description: เปรียบเทียบ Encode/Decode ของ AkashicEnvelope (ไบนารี) กับเส้นทาง Dict + JSON + Pydantic เดิม
+#              ทั้ง Throughput และหน่วยความจำที่จองต่อ 1 ข้อความ (tracemalloc peak)
+# Usage: python -m benchmarks.bench_akashic_envelope [--iterations N]
+
+import argparse
+import json
+import time
+import tracemalloc
+
+from INSPIRAFIRMA_AETHERIUM_GENESIS.data_structures.akashic_envelope import (
+    CONTENT_BINARY, AkashicEnvelope, EnvelopeView,
+)
+from INSPIRAFIRMA_AETHERIUM_GENESIS.interface.api_gateway import GenesisCommand
+
+PAYLOAD_SIZES = [64, 4 * 1024, 256 * 1024]
+INTENT = "analyse sensor stream"
+
+
+def build_payload(size: int) -> dict:
+    return {"node": "sensor-7", "samples": "x" * size}
+
+
+def dict_cases(payload: dict):
+    """เส้นทางเดิม: Dict -> JSON -> Pydantic GenesisCommand"""
+    wire = json.dumps({"intent": INTENT, "payload": payload}).encode("utf-8")
+    return {
+        "encode": lambda: json.dumps({"intent": INTENT, "payload": payload}).encode("utf-8"),
+        "decode intent": lambda: GenesisCommand.model_validate_json(wire).intent,
+        "decode full": lambda: GenesisCommand.model_validate_json(wire).payload,
+    }, len(wire)
+
+
+def envelope_cases(payload: dict):
+    envelope = AkashicEnvelope.from_payload(INTENT, payload, source="sensor-7")
+    wire = envelope.encode()
+    return {
+        "encode": envelope.encode,
+        "decode intent": lambda: EnvelopeView(wire).intent,
+        "decode full": lambda: EnvelopeView(wire).payload(),
+    }, len(wire)
+
+
+def binary_cases(size: int):
+    """Body ไบนารีดิบ (เช่น Frame เสียง/ภาพ): เส้นทาง Dict ต้อง base64 ส่วน Envelope ส่งไบต์ตรง"""
+    body = bytes(size)
+    envelope = AkashicEnvelope(INTENT, body, source="sensor-7", content_type=CONTENT_BINARY)
+    wire = envelope.encode()
+    return {
+        "encode": envelope.encode,
+        "decode intent": lambda: EnvelopeView(wire).intent,
+        "decode full": lambda: EnvelopeView(wire).body.nbytes,
+    }, len(wire)
+
+
+def ops_per_second(func, iterations: int) -> float:
+    for _ in range(min(100, iterations)):
+        func()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return iterations / (time.perf_counter() - start)
+
+
+def peak_bytes(func) -> int:
+    """หน่วยความจำสูงสุดที่จองระหว่างเรียก func 1 ครั้ง (ไม่นับสิ่งที่มีอยู่ก่อน)"""
+    func()
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak - baseline
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AkashicEnvelope vs dict/JSON benchmark")
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{'payload':>8} | {'path':>10} | {'operation':>13} | {'wire B':>8} | {'ops/s':>10} | {'peak alloc B':>12}")
+    print("-" * 78)
+    for size in PAYLOAD_SIZES:
+        iterations = max(200, args.iterations * 64 // max(size, 64) if size > 4096 else args.iterations)
+        for path, (cases, wire_size) in (("dict+json", dict_cases(build_payload(size))),
+                                         ("envelope", envelope_cases(build_payload(size))),
+                                         ("env/bin", binary_cases(size))):
+            for operation, func in cases.items():
+                rate = ops_per_second(func, iterations)
+                print(f"{size:>8} | {path:>10} | {operation:>13} | {wire_size:>8} | {rate:>10.0f} | {peak_bytes(func):>12}")
+        print("-" * 78)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# FILE: benchmarks/bench_batch_submit.py
+# Description: เปรียบเทียบ Throughput ระหว่าง /submit/task (ทีละรายการ) กับ /submit/batch
+# Usage: python -m benchmarks.bench_batch_submit
+
+import asyncio
+import logging
+import time
+
+import httpx
+
+from INSPIRAFIRMA_AETHERIUM_GENESIS.interface.api_gateway import create_app
+
+TOTAL_ITEMS = 2000
+CLIENT_CONCURRENCY = 32
+BATCH_SIZES = [10, 100, 500]
+WORK_SECONDS = 0.001  # งานจำลองสั้นๆ เพื่อให้วัด overhead ของเส้นทาง Request ได้ชัด
+
+
+def _intent(i: int) -> str:
+    # ทุกๆ 10 รายการมี 1 รายการที่ถูก Block เพื่อให้ครอบคลุมเส้นทาง Governance
+    return "drop table logs" if i % 10 == 0 else f"analyse sensor stream {i}"
+
+
+async def bench_single(client: httpx.AsyncClient) -> float:
+    gate = asyncio.Semaphore(CLIENT_CONCURRENCY)
+
+    async def send(i: int):
+        async with gate:
+            await client.post("/submit/task", json={"intent": _intent(i)})
+
+    start = time.perf_counter()
+    await asyncio.gather(*(send(i) for i in range(TOTAL_ITEMS)))
+    return TOTAL_ITEMS / (time.perf_counter() - start)
+
+
+async def bench_batch(client: httpx.AsyncClient, batch_size: int) -> float:
+    gate = asyncio.Semaphore(max(1, CLIENT_CONCURRENCY // batch_size))
+
+    async def send(offset: int):
+        body = [{"intent": _intent(i)} for i in range(offset, min(offset + batch_size, TOTAL_ITEMS))]
+        async with gate:
+            response = await client.post("/submit/batch", json=body)
+            assert response.json()["count"] == len(body)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(send(offset) for offset in range(0, TOTAL_ITEMS, batch_size)))
+    return TOTAL_ITEMS / (time.perf_counter() - start)
+
+
+async def main():
+    logging.disable(logging.CRITICAL)
+    app = create_app()
+    app.state.services.ram_engine.config.simulated_work_range = (WORK_SECONDS, WORK_SECONDS)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        print(f"{'path':>22} | {'items/s':>10}")
+        print("-" * 36)
+        print(f"{'/submit/task':>22} | {await bench_single(client):>10.0f}")
+        for size in BATCH_SIZES:
+            print(f"{f'/submit/batch x{size}':>22} | {await bench_batch(client, size):>10.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
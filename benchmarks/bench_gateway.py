@@ -0,0 +1,341 @@
+# FILE: benchmarks/bench_gateway.py
+# Description: Load Test ของ Gateway ผ่าน ASGI Client ใน Process เดียว (ไม่มี Network) + Microbenchmark ของ Hot Path
+#              (รวม DTP บน WebSocket เดียวเทียบกับ HTTP ทีละ Request)
+#              รายงาน Throughput และ Latency p50/p95/p99 และบันทึกผลเป็น JSON เพื่อเทียบระหว่าง Commit
+# Usage: python -m benchmarks.bench_gateway [--concurrency 1,16,64] [--requests 2000] [--output results.json]
+#        python -m benchmarks.bench_gateway --output new.json --compare old.json [--tolerance 0.15]
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+from INSPIRAFIRMA_AETHERIUM_GENESIS import __version__
+from INSPIRAFIRMA_AETHERIUM_GENESIS.core.mind_logic import ExecutionMode, RAMConfig, RobustAsyncManager
+from INSPIRAFIRMA_AETHERIUM_GENESIS.governance.gep_enforcer import GovernanceEnforcer
+from INSPIRAFIRMA_AETHERIUM_GENESIS.interface.api_gateway import GatewayConfig, create_app
+from INSPIRAFIRMA_AETHERIUM_GENESIS.protocols.dtp_digisonic import DTPClient, DTPError
+
+SCHEMA_VERSION = 1
+WARMUP_REQUESTS = 50  # ต่อ Endpoint / ต่อ Microbenchmark
+ROLES = ["SENSOR", "ACTUATOR", "VALIDATOR", "SAGE"]
+
+# Metric ที่ใช้ตัดสิน Regression: (ชื่อ, True = ยิ่งมากยิ่งดี)
+COMPARED_METRICS = [("throughput", True), ("p50_ms", False), ("p99_ms", False)]
+
+
+def summarize(latencies: List[float], elapsed: float, failures: int = 0) -> Dict[str, Any]:
+    """สรุป Latency (วินาที) เป็น ms แบบ Nearest-rank (สูตรเดียวกับ AgentRuntime)"""
+    ordered = sorted(latencies)
+
+    def percentile(q: float) -> float:
+        if not ordered:
+            return 0.0
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1e3
+
+    return {
+        "count": len(ordered),
+        "failures": failures,
+        "throughput": len(ordered) / elapsed if elapsed > 0 else 0.0,
+        "mean_ms": sum(ordered) / len(ordered) * 1e3 if ordered else 0.0,
+        "p50_ms": percentile(0.50),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+        "max_ms": ordered[-1] * 1e3 if ordered else 0.0,
+    }
+
+
+# --- HTTP Load ---
+async def drive(send: Callable[[int], Awaitable[bool]], total: int, concurrency: int) -> Dict[str, Any]:
+    """
+    ยิง total Request ด้วย Client จำนวน concurrency ตัว (Closed-loop: แต่ละตัวส่งคำขอถัดไปเมื่อได้คำตอบ)
+    send(i) คืน False เมื่อผลลัพธ์ไม่เป็นไปตามที่คาด (นับเป็น failure)
+    """
+    latencies: List[float] = []
+    failures = 0
+    counter = iter(range(total))
+
+    async def client_loop():
+        nonlocal failures
+        for i in counter:
+            start = time.perf_counter()
+            ok = await send(i)
+            latencies.append(time.perf_counter() - start)
+            if not ok:
+                failures += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+    return summarize(latencies, time.perf_counter() - start, failures)
+
+
+def _intent(i: int) -> str:
+    # ทุกๆ 10 รายการมี 1 รายการที่ถูก Block; ข้อความวนซ้ำบางส่วนเพื่อให้ Verdict Cache มีทั้ง Hit และ Miss
+    return "drop table logs" if i % 10 == 0 else f"analyse sensor stream {i % 500}"
+
+
+def http_scenarios(client: httpx.AsyncClient) -> Dict[str, Callable[[int], Awaitable[bool]]]:
+    async def submit_task(i: int) -> bool:
+        response = await client.post("/submit/task", json={"intent": _intent(i)})
+        return response.status_code == (403 if i % 10 == 0 else 200)
+
+    async def register_agent(i: int) -> bool:
+        body = {"name": f"bench-agent-{i}", "role": ROLES[i % len(ROLES)], "capabilities": [f"cap-{i % 7}"]}
+        response = await client.post("/agents/register", json=body)
+        return response.status_code == 200
+
+    async def list_agents(i: int) -> bool:
+        params = {"limit": 100}
+        if i % 2:
+            params["role"] = ROLES[i % len(ROLES)]
+        response = await client.get("/agents/list", params=params)
+        return response.status_code == 200
+
+    # ลำดับมีผล: /agents/list วัดหลังจาก Registry มี Agent จาก /agents/register แล้ว
+    return {
+        "/submit/task": submit_task,
+        "/agents/register": register_agent,
+        "/agents/list": list_agents,
+    }
+
+
+async def asgi_websocket(app: Any, path: str):
+    """
+    เปิด WebSocket เข้า ASGI App ใน Process เดียว (httpx.ASGITransport ไม่รองรับ WebSocket)
+    คืน (send, receive, close) ในรูปแบบที่ DTPClient ใช้
+    """
+    inbound: asyncio.Queue = asyncio.Queue()
+    outbound: asyncio.Queue = asyncio.Queue()
+    scope = {
+        "type": "websocket", "asgi": {"version": "3.0", "spec_version": "2.3"}, "scheme": "ws",
+        "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"", "headers": [],
+        "subprotocols": [], "server": ("bench", 80), "client": ("127.0.0.1", 0),
+    }
+    inbound.put_nowait({"type": "websocket.connect"})
+    connection = asyncio.create_task(app(scope, inbound.get, outbound.put))
+    accepted = await outbound.get()
+    if accepted["type"] != "websocket.accept":
+        raise ConnectionError(f"WebSocket rejected: {accepted}")
+
+    async def send(data: bytes):
+        await inbound.put({"type": "websocket.receive", "bytes": data})
+
+    async def receive() -> Optional[bytes]:
+        message = await outbound.get()
+        return message.get("bytes") if message["type"] == "websocket.send" else None
+
+    async def close():
+        await inbound.put({"type": "websocket.disconnect", "code": 1000})
+        await asyncio.gather(connection, return_exceptions=True)
+
+    return send, receive, close
+
+
+async def bench_dtp(app: Any, concurrency_levels: List[int], total: int) -> Dict[str, Any]:
+    """คำขอเดียวกับ /submit/task แต่ส่งทั้งหมดบน DTP Connection เดียว (Multiplex ด้วย request_id)"""
+    results = {}
+    send, receive, close = await asgi_websocket(app, "/dtp")
+    client = DTPClient(send, receive)
+    await client.start()
+    try:
+        async def submit(i: int) -> bool:
+            try:
+                await client.submit(_intent(i))
+            except DTPError as e:
+                return e.status == 403 and i % 10 == 0
+            return i % 10 != 0
+
+        await drive(submit, WARMUP_REQUESTS, 1)
+        for concurrency in concurrency_levels:
+            results[f"dtp /dtp c={concurrency}"] = await drive(submit, total, concurrency)
+    finally:
+        await client.close()
+        await close()
+    return results
+
+
+async def bench_http(concurrency_levels: List[int], total: int, work_seconds: float) -> Dict[str, Any]:
+    results = {}
+    with tempfile.TemporaryDirectory() as registry_dir:
+        config = GatewayConfig(registry_dir=registry_dir, pangenes_interval=3600, ruleset_poll_interval=0)
+        config.ram.simulated_work_range = (work_seconds, work_seconds)
+        app = create_app(config)
+        services = app.state.services
+        await services.start()  # ASGITransport ไม่รัน Lifespan เอง
+        try:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                for path, send in http_scenarios(client).items():
+                    await drive(send, WARMUP_REQUESTS, 1)
+                    for concurrency in concurrency_levels:
+                        results[f"http {path} c={concurrency}"] = await drive(send, total, concurrency)
+            results.update(await bench_dtp(app, concurrency_levels, total))
+        finally:
+            await services.stop()
+    return results
+
+
+# --- Microbenchmarks ---
+async def measure_async(func: Callable[[int], Awaitable[Any]], iterations: int) -> Dict[str, Any]:
+    for i in range(-WARMUP_REQUESTS, 0):  # เช่น สร้าง Thread Pool ครั้งแรก ไม่นับรวมในผล
+        await func(i)
+    latencies = []
+    start = time.perf_counter()
+    for i in range(iterations):
+        began = time.perf_counter()
+        await func(i)
+        latencies.append(time.perf_counter() - began)
+    return summarize(latencies, time.perf_counter() - start)
+
+
+def measure_sync(func: Callable[[int], Any], iterations: int) -> Dict[str, Any]:
+    for i in range(-WARMUP_REQUESTS, 0):
+        func(i)
+    latencies = []
+    start = time.perf_counter()
+    for i in range(iterations):
+        began = time.perf_counter()
+        func(i)
+        latencies.append(time.perf_counter() - began)
+    return summarize(latencies, time.perf_counter() - start)
+
+
+async def bench_micro(iterations: int) -> Dict[str, Any]:
+    results = {}
+    enforcer = GovernanceEnforcer()
+    enforcer.inspect_intent("analyse sensor stream")
+    results["micro inspect_intent cached"] = measure_sync(
+        lambda i: enforcer.inspect_intent("analyse sensor stream"), iterations)
+    results["micro inspect_intent miss/safe"] = measure_sync(
+        lambda i: enforcer.inspect_intent(f"analyse sensor stream {i} of node {i * 7}"), iterations)
+    results["micro inspect_intent miss/blocked"] = measure_sync(
+        lambda i: enforcer.inspect_intent(f"please drop table logs {i}"), iterations)
+
+    ram = RobustAsyncManager(RAMConfig(simulated_work_range=(0.0, 0.0)))
+    try:
+        async def noop():
+            return None
+
+        def blocking_noop():
+            return None
+
+        results["micro execute_task inline"] = await measure_async(
+            lambda i: ram.execute_task("BENCH_INLINE", noop, mode=ExecutionMode.INLINE), iterations)
+        results["micro execute_task simulated"] = await measure_async(
+            lambda i: ram.execute_task("BENCH_SIMULATED", None), iterations)
+        results["micro execute_task thread"] = await measure_async(
+            lambda i: ram.execute_task("BENCH_THREAD", blocking_noop, mode=ExecutionMode.THREAD), iterations // 5)
+    finally:
+        ram.shutdown_pools()
+    return results
+
+
+# --- Results (JSON) ---
+def _git_revision() -> Optional[str]:
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def build_report(results: Dict[str, Any], args: argparse.Namespace) -> Dict[str, Any]:
+    return {
+        "schema": SCHEMA_VERSION,
+        "meta": {
+            "revision": _git_revision(),
+            "version": __version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "params": {
+                "concurrency": args.concurrency,
+                "requests": args.requests,
+                "work_ms": args.work_ms,
+                "micro_iterations": args.micro_iterations,
+            },
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], tolerance: float) -> List[str]:
+    """พิมพ์ตารางเทียบกับ Baseline และคืนรายชื่อ Benchmark ที่แย่ลงเกิน tolerance"""
+    regressions = []
+    print(f"\n{'benchmark':>40} | {'metric':>10} | {'baseline':>10} | {'current':>10} | {'change':>8}")
+    print("-" * 90)
+    for name, now in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS:
+            old, new = before.get(metric), now.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            worse = -change if higher_is_better else change
+            flag = "  REGRESSION" if worse > tolerance else ""
+            if flag:
+                regressions.append(f"{name} {metric}")
+            print(f"{name:>40} | {metric:>10} | {old:>10.2f} | {new:>10.2f} | {change:>+7.1%}{flag}")
+    return regressions
+
+
+def print_table(results: Dict[str, Any]):
+    print(f"{'benchmark':>40} | {'ops/s':>10} | {'p50 ms':>8} | {'p95 ms':>8} | {'p99 ms':>8} | {'fail':>5}")
+    print("-" * 92)
+    for name, stats in results.items():
+        print(f"{name:>40} | {stats['throughput']:>10.0f} | {stats['p50_ms']:>8.3f} | "
+              f"{stats['p95_ms']:>8.3f} | {stats['p99_ms']:>8.3f} | {stats['failures']:>5}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genesis gateway load test and microbenchmarks")
+    parser.add_argument("--concurrency", default="1,16,64", help="ระดับ Concurrency คั่นด้วย comma")
+    parser.add_argument("--requests", type=int, default=2000, help="จำนวน Request ต่อ Endpoint ต่อระดับ Concurrency")
+    parser.add_argument("--work-ms", type=float, default=1.0, help="เวลางานจำลองของ /submit/task (ms)")
+    parser.add_argument("--micro-iterations", type=int, default=5000)
+    parser.add_argument("--skip-http", action="store_true")
+    parser.add_argument("--skip-micro", action="store_true")
+    parser.add_argument("--output", help="บันทึกผลเป็น JSON (เรียง Key คงที่ เพื่อ diff ระหว่าง Commit ได้)")
+    parser.add_argument("--compare", help="ไฟล์ JSON ผลเดิมที่ใช้เป็น Baseline")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="สัดส่วนที่แย่ลงได้ก่อนถือเป็น Regression")
+    args = parser.parse_args()
+    concurrency_levels = [int(level) for level in args.concurrency.split(",") if level.strip()]
+
+    logging.disable(logging.CRITICAL)
+    results: Dict[str, Any] = {}
+    if not args.skip_http:
+        results.update(asyncio.run(bench_http(concurrency_levels, args.requests, args.work_ms / 1e3)))
+    if not args.skip_micro:
+        results.update(asyncio.run(bench_micro(args.micro_iterations)))
+    report = build_report(results, args)
+
+    print_table(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, sort_keys=True, ensure_ascii=False)
+            f.write("\n")
+        print(f"\n📄 Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, report, args.tolerance)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+        print(f"\n✅ No regressions beyond {args.tolerance:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# FILE: benchmarks/bench_import_time.py
+# Description: วัดเวลา Startup (Import / สร้าง App) ใน Interpreter ใหม่ทุกครั้ง เพื่อให้ Cache ของ Module ไม่บิดเบือนผล
+# Usage: python -m benchmarks.bench_import_time [--repeat N] [--breakdown]
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (ชื่อ, โค้ดที่รันใน Interpreter ใหม่)
+TARGETS = [
+    ("python (baseline)", "pass"),
+    ("package", "import INSPIRAFIRMA_AETHERIUM_GENESIS"),
+    ("core.mind_logic", "import INSPIRAFIRMA_AETHERIUM_GENESIS.core.mind_logic"),
+    ("governance.gep_enforcer", "import INSPIRAFIRMA_AETHERIUM_GENESIS.governance.gep_enforcer"),
+    ("genesis_node (CLI)", "import genesis_node"),
+    ("interface.api_gateway", "import INSPIRAFIRMA_AETHERIUM_GENESIS.interface.api_gateway"),
+    ("create_app()", "from INSPIRAFIRMA_AETHERIUM_GENESIS.interface.api_gateway import create_app; create_app()"),
+]
+
+
+def measure(code: str, repeat: int) -> list:
+    env = dict(os.environ, GENESIS_REGISTRY_DIR=os.environ.get("GENESIS_REGISTRY_DIR", "/tmp/genesis_bench_registry"))
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        samples.append((time.perf_counter() - start) * 1e3)
+    return samples
+
+
+def breakdown(code: str, top: int = 10):
+    """แสดง Module ที่ใช้เวลา Import สะสมสูงสุดจาก python -X importtime"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, self_us, cumulative_us, name = [part.strip() for part in line.replace("import time:", "").split("|")]
+        if cumulative_us.isdigit():
+            rows.append((int(cumulative_us), int(self_us), name))
+    for cumulative_us, self_us, name in sorted(rows, reverse=True)[:top]:
+        print(f"    {cumulative_us / 1e3:>8.1f} ms  (self {self_us / 1e3:>6.1f} ms)  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genesis import-time benchmark")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--breakdown", action="store_true", help="แสดง Module ที่ช้าที่สุดของแต่ละเป้าหมาย")
+    args = parser.parse_args()
+
+    print(f"{'target':>26} | {'median ms':>10} | {'min ms':>8}")
+    print("-" * 52)
+    for name, code in TARGETS:
+        samples = measure(code, args.repeat)
+        print(f"{name:>26} | {statistics.median(samples):>10.1f} | {min(samples):>8.1f}")
+        if args.breakdown and code != "pass":
+            breakdown(code)
+
+
+if __name__ == "__main__":
+    main()
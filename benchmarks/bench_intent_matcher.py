@@ -0,0 +1,86 @@
+# FILE: benchmarks/bench_intent_matcher.py
+# Description: เปรียบเทียบ Latency ของ inspect_intent ระหว่าง Keyword Loop เดิมกับ Aho-Corasick Automaton
+# Usage: python -m benchmarks.bench_intent_matcher
+
+import json
+import logging
+import os
+import random
+import string
+import tempfile
+import time
+
+from INSPIRAFIRMA_AETHERIUM_GENESIS.governance.gep_enforcer import GovernanceEnforcer
+
+KEYWORD_SIZES = [10, 100, 1_000, 10_000, 50_000]
+RULES = 50
+INTENTS = 200
+
+
+def _word(rng: random.Random) -> str:
+    return "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 9)))
+
+
+def build_ruleset(keyword_count: int, rng: random.Random) -> dict:
+    directives = []
+    per_rule = max(1, keyword_count // RULES)
+    for i in range(min(RULES, keyword_count)):
+        keywords = [f"{_word(rng)} {_word(rng)}" for _ in range(per_rule)]
+        directives.append({"id": f"BENCH_{i:03d}", "name": f"Bench Rule {i}", "keywords": keywords})
+    return {"meta": {"project": "BENCH"}, "prime_directives": directives}
+
+
+def build_intents(ruleset: dict, rng: random.Random) -> list:
+    keywords = [k for rule in ruleset["prime_directives"] for k in rule["keywords"]]
+    intents = []
+    for i in range(INTENTS):
+        words = [_word(rng) for _ in range(12)]
+        if i % 4 == 0:
+            words.insert(rng.randrange(len(words)), rng.choice(keywords))
+        intents.append(" ".join(words))
+    return intents
+
+
+def naive_inspect(rules: dict, intent: str):
+    """Reference: อัลกอริทึมเดิม (rules × keywords × len(intent))"""
+    for rule in rules.get("prime_directives", []):
+        for keyword in rule.get("keywords", []):
+            if keyword in intent.lower():
+                return False, rule["id"]
+    return True, None
+
+
+def _time_per_call(func, intents) -> float:
+    start = time.perf_counter()
+    for intent in intents:
+        func(intent)
+    return (time.perf_counter() - start) / len(intents) * 1e6
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    rng = random.Random(42)
+    print(f"{'keywords':>10} | {'naive µs/intent':>16} | {'automaton µs/intent':>20} | {'compile ms':>10}")
+    print("-" * 66)
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in KEYWORD_SIZES:
+            ruleset = build_ruleset(size, rng)
+            path = os.path.join(tmp, f"ruleset_{size}.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(ruleset, f)
+
+            start = time.perf_counter()
+            enforcer = GovernanceEnforcer(path)
+            compile_ms = (time.perf_counter() - start) * 1e3
+
+            intents = build_intents(ruleset, rng)
+            for intent in intents:
+                assert enforcer.inspect_intent(intent) == naive_inspect(ruleset, intent)
+
+            naive_us = _time_per_call(lambda i: naive_inspect(ruleset, i), intents)
+            automaton_us = _time_per_call(enforcer.inspect_intent, intents)
+            print(f"{size:>10} | {naive_us:>16.1f} | {automaton_us:>20.1f} | {compile_ms:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,17 +5,22 @@ import argparse
 import sys
 import logging
 import asyncio
-import uvicorn
 
 # --- Imports ---
+# Gateway (FastAPI/uvicorn) ถูก Import เฉพาะเมื่อสั่ง --serve เพื่อให้ --test เริ่มได้เร็ว
 from INSPIRAFIRMA_AETHERIUM_GENESIS.core.mind_logic import RobustAsyncManager, RAMConfig
 from INSPIRAFIRMA_AETHERIUM_GENESIS.governance.gep_enforcer import GovernanceEnforcer
-from INSPIRAFIRMA_AETHERIUM_GENESIS.interface.api_gateway import app
 
 # Setup System Logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [GENESIS-NODE] %(message)s")
 logger = logging.getLogger("GENESIS_NODE")
 
+# Intent ปกติที่ชั้น Semantic ต้องไม่ Block
+SEMANTIC_BENIGN_INTENTS = [
+    "data", "system", "records", "delete", "upload", "public",
+    "user data", "customer records", "private data",
+]
+
 class GenesisNode:
     def __init__(self):
         self.name = "AETHERIUM_GENESIS_CORE"
@@ -46,18 +51,30 @@ class GenesisNode:
         forbidden_intent = "delete database"
         is_safe, violation = self.governance.inspect_intent(forbidden_intent)
 
-        if not is_safe:
-            logger.warning(f"Security Shield Active: Violation '{violation}' intercepted successfully.")
-            return True
+        if is_safe:
+            logger.error("Security Check Failed: Violation was not intercepted.")
+            return False
+        logger.warning(f"Security Shield Active: Violation '{violation}' intercepted successfully.")
 
-        logger.error("Security Check Failed: Violation was not intercepted.")
-        return False
+        # Regression: คำนามล้วน / คำเดี่ยวเคยถูกชั้น Semantic Block (False Positive)
+        false_positives = [intent for intent in SEMANTIC_BENIGN_INTENTS if not self.governance.inspect_intent(intent)[0]]
+        if false_positives:
+            logger.error(f"Security Check Failed: Benign intents blocked: {false_positives}")
+            return False
+        is_safe, violation = self.governance.inspect_intent("wipe the db")
+        if is_safe:
+            logger.error("Security Check Failed: Paraphrased violation was not intercepted.")
+            return False
+        logger.info(f"Semantic Screen Verified: paraphrase blocked by '{violation}', {len(SEMANTIC_BENIGN_INTENTS)} benign intents passed.")
+        return True
 
 # --- Main Execution ---
 def main():
     parser = argparse.ArgumentParser(description="Aetherium Genesis Node Orchestrator")
     parser.add_argument("--test", action="store_true", help="Run system integration test")
     parser.add_argument("--serve", action="store_true", help="Start API Gateway")
+    parser.add_argument("--workers", type=int, default=1, help="Number of pre-forked gateway workers (with --serve)")
+    parser.add_argument("--port", type=int, default=8000, help="Gateway port (with --serve)")
     args = parser.parse_args()
 
     node = GenesisNode()
@@ -74,8 +91,22 @@ def main():
 
     if args.serve:
         # Start API Gateway
+        if args.workers > 1:
+            # หลาย Worker บน Socket เดียว: Registry / ตัวนับ / สถานะ Job แชร์ผ่าน StateHub + Shared Memory
+            from INSPIRAFIRMA_AETHERIUM_GENESIS.interface.prefork import PreforkArbiter
+
+            logger.info(f"Launching API Gateway with {args.workers} workers...")
+            sys.exit(PreforkArbiter(args.workers, port=args.port).run())
+
+        import uvicorn
+        from INSPIRAFIRMA_AETHERIUM_GENESIS.core.log_pipeline import configure_logging
+        from INSPIRAFIRMA_AETHERIUM_GENESIS.interface.api_gateway import create_app
+
+        # Logging Pipeline แบบ Non-blocking (QueueHandler -> Listener Thread) แทน basicConfig ของ Node
+        # เลือกรูปแบบ/Sampling/Rate Limit ผ่าน GENESIS_LOG_FORMAT, GENESIS_LOG_SAMPLING, GENESIS_LOG_RATE_LIMIT
+        configure_logging()
         logger.info("Launching API Gateway...")
-        uvicorn.run(app, host="0.0.0.0", port=8000)
+        uvicorn.run(create_app(), host="0.0.0.0", port=args.port)
 
 if __name__ == "__main__":
     main()